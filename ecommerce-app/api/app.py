@@ -7,35 +7,38 @@ sys.path.insert(0, str(project_root))
 
 from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 import logging
 import structlog
 from typing import List, Optional
 
-from database.connection import get_db, create_tables
+from database.connection import get_db, create_tables, engine
+from database.executor import db_executor, DatabaseOverloadedError
+from database.writer import db_writer
+from database.pool_metrics import get_pool_stats
 from api.config import settings
-from api.routes import products, departments
+from api.routes import products, departments, internal
+from api.utils.health import HealthMonitor
+from api.utils.logging_pipeline import setup_logging, shutdown_logging
+from api.utils.jobs import job_executor
 from api.middleware.cors import setup_cors
+from api.middleware.read_after_write import setup_read_after_write
+from api.middleware.metrics import setup_metrics
+from api.middleware.query_profiling import setup_query_profiling
+from api.middleware.tracing import setup_tracing
+from api.middleware.profiling import setup_profiling
+from api.middleware.loop_monitor import setup_loop_monitor
+from api.middleware.memory import setup_memory_profiling
+from api.utils.tracing import TracedJSONResponse, span_processor
+from api.utils.metrics import render_metrics, latency_summary, mark_process_dead
+from api.utils.profiler import continuous_profiler, run_profiled
+from api.utils.loop_monitor import loop_monitor
+from api.utils.memory import memory_diagnostics
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+# Structured logging through a background queue listener
+setup_logging()
 
 logger = structlog.get_logger()
 
@@ -46,30 +49,77 @@ app = FastAPI(
     description="A complete e-commerce API with product catalog and department management",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=TracedJSONResponse
 )
 
 # Setup CORS
 setup_cors(app)
 
+# Admin-triggered profiling of single API requests
+setup_profiling(app)
+
+# Name the request being served when the event loop stalls
+setup_loop_monitor(app)
+
+# Peak allocation of sampled requests while tracemalloc is tracing
+setup_memory_profiling(app)
+
+# Pin recent writers to the primary when read replicas are configured
+setup_read_after_write(app)
+
+# Sampled request tracing
+setup_tracing(app)
+
+# Per-request SQL statement counts, Server-Timing header and query budget
+setup_query_profiling(app)
+
+# Per-route request metrics (outermost, so it times the whole stack)
+setup_metrics(app)
+
+# Background database check served by /health/ready
+health_monitor = HealthMonitor(engine, interval=settings.health_check_interval)
+
 # Include routers directly
 app.include_router(products.router, prefix="/api/v1/products", tags=["products"])
 app.include_router(departments.router, prefix="/api/v1/departments", tags=["departments"])
+app.include_router(internal.router, prefix="/internal", tags=["internal"])
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
+    setup_logging()
     try:
         create_tables()
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
         raise
+    
+    # Let an active request profile sample the executor threads doing its work
+    db_executor.wrap_call = run_profiled
+    health_monitor.start()
+    if settings.continuous_profiling:
+        continuous_profiler.start()
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+    if settings.memory_tracemalloc_enabled:
+        memory_diagnostics.start(settings.memory_tracemalloc_frames)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    health_monitor.stop()
+    continuous_profiler.stop()
+    loop_monitor.stop()
+    db_writer.stop()
+    db_executor.shutdown(wait=False)
+    job_executor.shutdown(wait=False)
+    mark_process_dead()
+    if span_processor is not None:
+        span_processor.stop()
     logger.info("Application shutting down")
+    shutdown_logging()
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -80,6 +130,16 @@ async def http_exception_handler(request, exc):
         content={"error": exc.detail, "status_code": exc.status_code}
     )
 
+@app.exception_handler(DatabaseOverloadedError)
+async def database_overloaded_handler(request, exc):
+    """Fail fast when the database executor is saturated"""
+    logger.warning("Database executor saturated, rejecting request", request_url=str(request.url))
+    return JSONResponse(
+        status_code=503,
+        content={"error": "Service temporarily overloaded", "status_code": 503},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """General exception handler"""
@@ -100,11 +160,16 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
-    """Health check endpoint"""
+def health_check(db: Session = Depends(get_db)):
+    """
+    Health check endpoint
+    
+    A plain def so FastAPI runs the blocking SELECT 1 in its threadpool
+    instead of on the event loop.
+    """
     try:
         # Test database connection
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         return {
             "status": "healthy",
             "database": "connected",
@@ -114,6 +179,51 @@ async def health_check(db: Session = Depends(get_db)):
         logger.error(f"Health check failed: {e}")
         raise HTTPException(status_code=503, detail="Service unavailable")
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe; answers as long as the event loop is serving requests"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness probe
+    
+    Reports the latest background database check plus pool saturation,
+    cache warmth and search-index readiness without touching the database.
+    """
+    database = health_monitor.status()
+    pool = get_pool_stats().get("primary_async", {})
+    ready = database['database'] and not database['stale']
+    
+    content = {
+        "status": "ready" if ready else "not_ready",
+        "database": database,
+        "pool": {
+            "checked_out": pool.get("checked_out"),
+            "saturation": pool.get("saturation"),
+            "timeouts": pool.get("timeouts")
+        },
+        "caches": {
+            "department_stats_warm": departments.stats_cache.is_warm(departments.DEPARTMENT_STATS_CACHE_KEY),
+            "product_statements": products.product_statement_cache.stats()['size']
+        },
+        "search_index_ready": database['search_index'],
+        "version": settings.app_version
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.get("/metrics")
+async def metrics():
+    """Request metrics in Prometheus text format"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/metrics/summary")
+async def metrics_summary():
+    """Per-route request counts with p50/p95/p99 latency estimated from the histograms"""
+    return {"routes": latency_summary()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -14,11 +14,39 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./ecommerce.db"
     test_database_url: str = "sqlite:///./test.db"
+
+    # Connection pool for server databases (PostgreSQL, MySQL)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+
+    # Read replicas. GET routes read from these (round-robin, skipping
+    # replicas that recently failed); a client that just wrote is pinned to
+    # the primary for read_after_write_window seconds.
+    read_replica_urls: List[str] = []
+    read_after_write_window: int = 5
+    replica_retry_interval: int = 30  # seconds a failed replica is skipped
+    
+    # SQLite tuning. The "production" profile uses a queue pool of up to
+    # sqlite_pool_size connections and applies the pragmas below on connect;
+    # "development" keeps a single shared connection with SQLite defaults.
+    sqlite_profile: str = "production"
+    sqlite_pool_size: int = 10
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_cache_size: int = -64000  # negative values are KiB (64 MiB)
+    sqlite_mmap_size: int = 268435456  # 256 MiB
+    sqlite_temp_store: str = "MEMORY"
+    sqlite_busy_timeout: int = 5000  # milliseconds
     
     # Security
     secret_key: str = "your-secret-key-change-this"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Token for admin-only diagnostics (X-Admin-Token); unset disables them
+    admin_token: Optional[str] = None
     
     # CORS
     allowed_origins: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -31,6 +59,11 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
     log_file: str = "logs/app.log"
+    log_max_bytes: int = 10 * 1024 * 1024  # rotate the log file at 10MB
+    log_backup_count: int = 5
+    log_queue_size: int = 10000  # records buffered for the writer thread
+    # Fraction of INFO/DEBUG records kept per logger (children inherit)
+    log_sample_rates: Dict[str, float] = {"api.routes.products": 0.1}
     
     # External services
     redis_url: Optional[str] = "redis://localhost:6379"
@@ -39,6 +72,67 @@ class Settings(BaseSettings):
     default_page_size: int = 20
     max_page_size: int = 100
     
+    # Database executor (blocking DB work run off the event loop)
+    db_executor_workers: Optional[int] = None  # defaults to the engine pool capacity
+    db_executor_queue_depth: int = 50
+    db_executor_retry_after: int = 1  # seconds, sent as Retry-After when saturated
+    
+    # Single-writer queue with group commit (file-backed SQLite only)
+    db_write_queue_enabled: bool = True
+    db_write_queue_size: int = 1000
+    db_write_batch_size: int = 100
+    db_write_batch_wait_ms: float = 2.0  # how long a batch waits for more writes
+    
+    # SQL profiling. Requests running more than sql_query_budget statements
+    # log a warning ("warn") or fail ("raise", used by the test suite).
+    sql_slow_query_ms: float = 100.0
+    sql_explain_slow_queries: bool = True
+    sql_query_budget: int = 25  # 0 disables the budget
+    sql_query_budget_mode: str = "warn"
+    
+    # Request tracing. trace_exporter is "jsonl" (spans appended to
+    # trace_file), "otlp" (OTLP/HTTP JSON to trace_otlp_endpoint) or "none".
+    trace_sample_rate: float = 0.01
+    trace_exporter: str = "jsonl"
+    trace_file: str = "logs/traces.jsonl"
+    trace_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    
+    # On-demand profiling. Admins profile one /api/v1 request by sending
+    # X-Profile (or ?profile=) set to "sampling" or "cprofile"; the
+    # continuous profiler samples every thread at a low rate when enabled.
+    profile_sample_interval_ms: float = 5.0
+    profile_max_reports: int = 20
+    continuous_profiling: bool = False
+    continuous_profile_interval_ms: float = 100.0
+    
+    # Event loop monitor. A heartbeat measures loop lag every
+    # loop_lag_interval_ms; a loop blocked past loop_stall_threshold_ms has
+    # its stack and the request being served logged.
+    loop_monitor_enabled: bool = True
+    loop_lag_interval_ms: float = 100.0
+    loop_stall_threshold_ms: float = 250.0
+    
+    # Memory diagnostics (admin API under /internal/memory). Tracing with
+    # tracemalloc slows allocation, so it only starts at boot when enabled.
+    memory_tracemalloc_enabled: bool = False
+    memory_tracemalloc_frames: int = 10
+    memory_max_snapshots: int = 10
+    memory_request_sample_rate: float = 0.01  # requests whose peak allocation is measured
+    
+    # Health checks
+    health_check_interval: int = 5  # seconds between background database checks
+    
+    # Background maintenance
+    department_reassign_chunk_size: int = 1000
+    job_workers: int = 2  # threads running background jobs, apart from the db executor
+    
+    # Caching
+    stats_cache_ttl: int = 60  # seconds before cached stats are refreshed
+    statement_cache_size: int = 256  # prebuilt listing statements kept (LRU)
+    
+    # Read-only listings select plain columns instead of hydrating ORM objects
+    listing_row_mode: bool = True
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,25 @@
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.utils.loop_monitor import loop_monitor
+
+class LoopMonitorMiddleware:
+    """Record which request each task serves, so loop stalls name the route"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        task = loop_monitor.track(f"{scope['method']} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            loop_monitor.untrack(task)
+
+def setup_loop_monitor(app: FastAPI):
+    """Setup request attribution for event loop stalls"""
+    app.add_middleware(LoopMonitorMiddleware)
@@ -0,0 +1,31 @@
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.middleware.metrics import route_template
+from api.utils.memory import memory_diagnostics
+
+class MemoryProfilingMiddleware:
+    """
+    Record peak allocation of sampled requests while tracemalloc is tracing
+
+    Every request is counted as in flight, so a sampled request is only
+    measured while it runs alone.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        baseline = memory_diagnostics.begin_request()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            memory_diagnostics.end_request(f"{scope['method']} {route_template(scope)}", baseline)
+
+def setup_memory_profiling(app: FastAPI):
+    """Setup per-request peak allocation sampling"""
+    app.add_middleware(MemoryProfilingMiddleware)
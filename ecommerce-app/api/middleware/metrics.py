@@ -0,0 +1,105 @@
+import time
+from typing import Dict, Iterator, Tuple
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.utils.metrics import IN_PROGRESS, LATENCY, REQUESTS, RESPONSE_SIZE
+
+try:
+    # FastAPI 0.140+ keeps included routers as nested objects; this yields
+    # their routes with the include prefix applied
+    from fastapi.routing import iter_route_contexts
+except ImportError:
+    iter_route_contexts = None
+
+# Label for requests that matched no route, so unknown paths can't blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Full path template of each route, keyed by id(route). Newer FastAPI puts
+# the included router's own route in scope["route"], whose path lacks the
+# include prefix, so the prefixed templates are looked up from the app.
+# Entries hold the route itself so an id is never reused while it is cached.
+_route_templates: Dict[int, Tuple[BaseRoute, str]] = {}
+
+def _walk_routes(routes, prefix: str = "") -> Iterator[Tuple[BaseRoute, str]]:
+    """Routes with their full path templates, recursing into mounts"""
+    for route in routes:
+        path_format = getattr(route, "path_format", None)
+        if path_format is None:
+            continue
+        yield route, prefix + path_format
+        if isinstance(route, Mount):
+            yield from _walk_routes(route.routes, prefix + route.path)
+
+def _load_route_templates(app: ASGIApp):
+    routes = getattr(app, "routes", [])
+    if iter_route_contexts is None:
+        # Older FastAPI copies included routes with the prefix already applied
+        templates = _walk_routes(routes)
+    else:
+        templates = (
+            (context.original_route, context.path_format)
+            for context in iter_route_contexts(routes)
+            if context.path_format is not None
+        )
+    _route_templates.update((id(route), (route, template)) for route, template in templates)
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled the request (``/api/v1/products/{product_id}``)"""
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    entry = _route_templates.get(id(route))
+    if entry is None:
+        # First request to this route, or routes were added since the last load
+        _load_route_templates(scope.get("app"))
+        entry = _route_templates.get(id(route), (route, getattr(route, "path_format", UNMATCHED_ROUTE)))
+    return entry[1]
+
+class MetricsMiddleware:
+    """
+    Record request count, latency, in-flight gauge and response size per route
+
+    Requests are labelled with the route template (``/api/v1/products/{product_id}``),
+    not the raw path. The template is only known once routing has run, so
+    the in-flight gauge is per method.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_size = 0
+
+        async def send_with_metrics(message: Message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+
+            route = route_template(scope)
+            REQUESTS.labels(method=method, route=route, status=str(status_code)).inc()
+            LATENCY.labels(method=method, route=route).observe(elapsed)
+            RESPONSE_SIZE.labels(method=method, route=route).observe(response_size)
+
+def setup_metrics(app: FastAPI):
+    """Setup per-route request metrics"""
+    app.add_middleware(MetricsMiddleware)
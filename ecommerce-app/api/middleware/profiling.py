@@ -0,0 +1,67 @@
+import threading
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.config import settings
+from api.utils.admin import ADMIN_TOKEN_HEADER, is_admin_token
+from api.utils.profiler import PROFILE_MODES, RequestProfile, profile_store
+
+# Only API routes can be profiled on demand
+PROFILED_PREFIX = "/api/v1"
+
+class ProfilingMiddleware:
+    """
+    Profile a single API request on demand
+
+    An admin asks for a profile with ``X-Profile: sampling|cprofile`` (or
+    ``?profile=``) plus ``X-Admin-Token``. The report is kept in the profile
+    store and its id returned in ``X-Profile-Id``; fetch it from
+    ``/internal/profiles/{id}``. One request is profiled at a time, others
+    asking meanwhile are served normally with ``X-Profile-Skipped``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._active = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(PROFILED_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        mode = headers.get("X-Profile")
+        if mode is None and b"profile=" in scope.get("query_string", b""):
+            mode = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [None])[0]
+        if mode not in PROFILE_MODES or not is_admin_token(headers.get(ADMIN_TOKEN_HEADER)):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._active.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, "X-Profile-Skipped", "profile in progress"))
+            return
+
+        profile = RequestProfile(mode, settings.profile_sample_interval_ms / 1000)
+        profile.start()
+        try:
+            await profile.run(self.app(scope, receive, self._with_header(send, "X-Profile-Id", profile.profile_id)))
+        finally:
+            try:
+                profile_store.add(profile.stop(f"{scope['method']} {scope['path']}"))
+            finally:
+                self._active.release()
+
+    @staticmethod
+    def _with_header(send: Send, name: str, value: str) -> Send:
+        async def send_with_header(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(name, value)
+            await send(message)
+        return send_with_header
+
+def setup_profiling(app: FastAPI):
+    """Setup admin-triggered per-request profiling"""
+    app.add_middleware(ProfilingMiddleware)
@@ -0,0 +1,42 @@
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from database.profiling import current_query_stats, finish_query_profile, start_query_profile
+
+class QueryProfilingMiddleware:
+    """
+    Count SQL statements and database time per request
+
+    The totals are reported in a ``Server-Timing`` header (visible in
+    browser dev tools) and checked against the per-request query budget
+    once the request completes normally.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = start_query_profile(f"{scope['method']} {scope['path']}")
+        stats = current_query_stats.get()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except BaseException:
+            # Let the original error propagate rather than a budget violation
+            finish_query_profile(token, check_budget=False)
+            raise
+        finish_query_profile(token)
+
+def setup_query_profiling(app: FastAPI):
+    """Setup per-request SQL statement counting and the query budget"""
+    app.add_middleware(QueryProfilingMiddleware)
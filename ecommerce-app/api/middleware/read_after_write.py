@@ -0,0 +1,45 @@
+import time
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.config import settings
+from database.replicas import PRIMARY_PIN_COOKIE
+
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+class ReadAfterWriteMiddleware:
+    """
+    Pin clients to the primary database right after they write
+
+    Successful non-read requests set a short-lived cookie; while it is
+    valid, read sessions skip the replicas so the client sees its own
+    writes despite replication lag.
+    """
+
+    def __init__(self, app: ASGIApp, window: int):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in READ_ONLY_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                pinned_until = time.time() + self.window
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PRIMARY_PIN_COOKIE}={pinned_until:.3f}; Max-Age={self.window}; "
+                    f"Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+def setup_read_after_write(app: FastAPI):
+    """Setup read-after-write pinning (only needed when read replicas are configured)"""
+    if settings.read_replica_urls:
+        app.add_middleware(ReadAfterWriteMiddleware, window=settings.read_after_write_window)
@@ -0,0 +1,65 @@
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.utils.tracing import (
+    Span,
+    Trace,
+    current_span,
+    current_trace,
+    should_sample,
+    span_processor,
+    trace_id_from_traceparent
+)
+
+class TracingMiddleware:
+    """
+    Start a trace for sampled requests
+
+    The request becomes the root span; spans opened while it is served
+    (helpers, DB statements, response encoding) nest under it. The trace id
+    is returned in ``X-Trace-Id`` and the finished spans go to the exporter.
+    Unsampled requests pay only for the sampling decision.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = Headers(scope=scope).get("traceparent")
+        if not should_sample(traceparent):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(trace_id_from_traceparent(traceparent))
+        parent_id = traceparent.split("-")[2] if trace_id_from_traceparent(traceparent) else None
+        root = Span(trace.trace_id, f"{scope['method']} {scope['path']}", parent_id, {
+            'http.method': scope["method"],
+            'http.target': scope["path"]
+        })
+        trace.spans.append(root)
+
+        async def send_with_trace_id(message: Message):
+            if message["type"] == "http.response.start":
+                root.attributes['http.status_code'] = message["status"]
+                MutableHeaders(scope=message).append("X-Trace-Id", trace.trace_id)
+            await send(message)
+
+        trace_token = current_trace.set(trace)
+        span_token = current_span.set(root)
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            root.end()
+            current_span.reset(span_token)
+            current_trace.reset(trace_token)
+            if span_processor is not None:
+                span_processor.submit(trace.spans)
+
+def setup_tracing(app: FastAPI):
+    """Setup sampled request tracing"""
+    app.add_middleware(TracingMiddleware)
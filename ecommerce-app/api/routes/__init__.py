@@ -2,7 +2,7 @@
 API routes package
 """
 
-from . import products, departments
+from . import products, departments, internal
 
 # Create a main API router that includes all sub-routers
 from fastapi import APIRouter
@@ -13,4 +13,4 @@ api_router = APIRouter()
 api_router.include_router(products.router, prefix="/products", tags=["products"])
 api_router.include_router(departments.router, prefix="/departments", tags=["departments"])
 
-__all__ = ["products", "departments", "api_router"]
+__all__ = ["products", "departments", "internal", "api_router"]
@@ -1,15 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
+import logging
 
-from database.connection import get_db
-from database.models import Department, Product
+from database.connection import SessionLocal
+from database.replicas import get_async_read_db
+from database.models import Department, Product, product_discount_percentage
+from api.config import settings
+from api.utils.jobs import job_registry, job_executor, JobRegistryFullError
+from api.utils.cache import StaleWhileRevalidateCache
+from database.executor import db_executor
+from database.writer import DatabaseWriter, get_db_writer
+from api.utils.helpers import calculate_department_stats
+from api.utils.tracing import span
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+stats_cache = StaleWhileRevalidateCache(ttl=settings.stats_cache_ttl, refresh_executor=db_executor)
+DEPARTMENT_STATS_CACHE_KEY = "department_stats"
+
 # Pydantic models
 class DepartmentBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
@@ -41,41 +57,118 @@ class DepartmentListResponse(BaseModel):
 class DepartmentWithProducts(DepartmentResponse):
     products: List[dict] = []
 
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    total: int
+    processed: int
+    progress: float
+    error: Optional[str] = None
+    details: dict = {}
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+async def count_department_products(db: AsyncSession, department_id: int) -> int:
+    """Count the products assigned to a department"""
+    query = select(func.count(Product.id)).where(Product.department_id == department_id)
+    return (await db.execute(query)).scalar_one()
+
+async def count_products_by_department(db: AsyncSession, department_ids: List[int]) -> Dict[int, int]:
+    """Count the products of several departments in one grouped query"""
+    if not department_ids:
+        return {}
+    query = select(Product.department_id, func.count(Product.id))\
+        .where(Product.department_id.in_(department_ids))\
+        .group_by(Product.department_id)
+    return {department_id: count for department_id, count in (await db.execute(query)).all()}
+
+def load_department_stats():
+    """Load detailed department statistics with a dedicated session"""
+    db = SessionLocal()
+    try:
+        return calculate_department_stats(db)
+    finally:
+        db.close()
+
+def force_delete_department_in_chunks(writer: DatabaseWriter, department_id: int, job_id: str, chunk_size: int):
+    """
+    Detach a department's products in bounded chunks, then delete it
+    
+    Each chunk is a separate write unit, so the write lock is only held
+    for one small UPDATE at a time instead of for the whole department.
+    """
+    def detach_chunk(session: Session) -> int:
+        chunk_ids = [
+            row.id for row in session.query(Product.id)
+            .filter(Product.department_id == department_id)
+            .order_by(Product.id)
+            .limit(chunk_size)
+            .all()
+        ]
+        if chunk_ids:
+            session.query(Product).filter(Product.id.in_(chunk_ids))\
+                   .update({"department_id": None}, synchronize_session=False)
+        return len(chunk_ids)
+    
+    def delete_unit(session: Session):
+        session.query(Department).filter(Department.id == department_id)\
+               .delete(synchronize_session=False)
+    
+    try:
+        job_registry.start(job_id)
+        
+        while True:
+            detached = writer.execute(detach_chunk)
+            if not detached:
+                break
+            job_registry.advance(job_id, detached)
+        
+        writer.execute(delete_unit)
+        
+        job_registry.complete(job_id)
+        logger.info(f"Force delete of department {department_id} completed (job {job_id})")
+        
+    except Exception as e:
+        logger.error(f"Force delete of department {department_id} failed (job {job_id}): {e}")
+        job_registry.fail(job_id, str(e))
+
 @router.get("/", response_model=DepartmentListResponse)
 async def get_departments(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search in department name"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all departments with pagination"""
     
     # Build query
-    query = db.query(Department)
+    query = select(Department)
     
     # Apply search filter
     if search:
-        query = query.filter(Department.name.ilike(f"%{search}%"))
+        query = query.where(Department.name.ilike(f"%{search}%"))
     
     # Get total count
-    total = query.count()
+    total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
     
     # Apply pagination
     offset = (page - 1) * per_page
-    departments = query.offset(offset).limit(per_page).all()
+    departments = (await db.execute(query.offset(offset).limit(per_page))).scalars().all()
     
     # Calculate total pages
     total_pages = (total + per_page - 1) // per_page
     
-    # Get product counts for each department
+    # Product counts for the whole page in one query
+    product_counts = await count_products_by_department(db, [dept.id for dept in departments])
     department_responses = []
     for dept in departments:
-        product_count = db.query(Product).filter(Product.department_id == dept.id).count()
         dept_dict = {
             "id": dept.id,
             "name": dept.name,
             "description": dept.description,
-            "product_count": product_count,
+            "product_count": product_counts.get(dept.id, 0),
             "created_at": dept.created_at,
             "updated_at": dept.updated_at
         }
@@ -89,19 +182,29 @@ async def get_departments(
         total_pages=total_pages
     )
 
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_department_job(job_id: str = Path(..., description="Job ID")):
+    """Get progress of a background department job"""
+    job = job_registry.get(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job
+
 @router.get("/{department_id}", response_model=DepartmentResponse)
 async def get_department(
     department_id: int = Path(..., description="Department ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get a specific department by ID"""
-    department = db.query(Department).filter(Department.id == department_id).first()
+    department = await db.get(Department, department_id)
     
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
     
     # Get product count
-    product_count = db.query(Product).filter(Product.department_id == department.id).count()
+    product_count = await count_department_products(db, department.id)
     
     dept_dict = {
         "id": department.id,
@@ -119,40 +222,54 @@ async def get_department_products(
     department_id: int = Path(..., description="Department ID"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all products in a department"""
     
     # Check if department exists
-    department = db.query(Department).filter(Department.id == department_id).first()
+    department = await db.get(Department, department_id)
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
     
-    # Get products in this department
-    query = db.query(Product).filter(Product.department_id == department_id)
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * per_page
-    products = query.offset(offset).limit(per_page).all()
+    total = await count_department_products(db, department_id)
     
     # Calculate total pages
     total_pages = (total + per_page - 1) // per_page
+    offset = (page - 1) * per_page
+    
+    # Get products in this department
+    if settings.listing_row_mode:
+        # Plain column rows; no Product instances are hydrated
+        query = select(
+            Product.id,
+            Product.product_id,
+            Product.product_name,
+            Product.category,
+            Product.brand,
+            Product.sale_price,
+            Product.market_price,
+            Product.rating
+        ).where(Product.department_id == department_id)
+        products = (await db.execute(query.offset(offset).limit(per_page))).all()
+    else:
+        query = select(Product).where(Product.department_id == department_id)
+        products = (await db.execute(query.offset(offset).limit(per_page))).scalars().all()
     
     # Format products
-    product_list = []
-    for product in products:
-        product_dict = {
-            "id": product.id,
-            "product_id": product.product_id,
-            "product_name": product.product_name,
-            "category": product.category,
-            "brand": product.brand,
-            "sale_price": float(product.sale_price) if product.sale_price else 0,
-            "rating": product.rating,
-            "discount_percentage": product.discount_percentage
-        }
-        product_list.append(product_dict)
+    with span("build_product_responses", rows=len(products)):
+        product_list = []
+        for product in products:
+            product_dict = {
+                "id": product.id,
+                "product_id": product.product_id,
+                "product_name": product.product_name,
+                "category": product.category,
+                "brand": product.brand,
+                "sale_price": float(product.sale_price) if product.sale_price else 0,
+                "rating": product.rating,
+                "discount_percentage": product_discount_percentage(product.market_price, product.sale_price)
+            }
+            product_list.append(product_dict)
     
     return {
         "department": {
@@ -170,29 +287,32 @@ async def get_department_products(
 @router.post("/", response_model=DepartmentResponse, status_code=201)
 async def create_department(
     department: DepartmentCreate,
-    db: Session = Depends(get_db)
+    writer: DatabaseWriter = Depends(get_db_writer)
 ):
     """Create a new department"""
     
-    # Check if department name already exists
-    existing_dept = db.query(Department).filter(Department.name == department.name).first()
-    if existing_dept:
-        raise HTTPException(status_code=400, detail="Department with this name already exists")
-    
-    # Create new department
-    db_department = Department(**department.model_dump())
-    db.add(db_department)
-    db.commit()
-    db.refresh(db_department)
+    def create(session: Session):
+        # Check if department name already exists
+        existing_dept = session.query(Department).filter(Department.name == department.name).first()
+        if existing_dept:
+            raise HTTPException(status_code=400, detail="Department with this name already exists")
+        
+        # Create new department
+        db_department = Department(**department.model_dump())
+        session.add(db_department)
+        session.flush()
+        session.refresh(db_department)
+        
+        return {
+            "id": db_department.id,
+            "name": db_department.name,
+            "description": db_department.description,
+            "product_count": 0,
+            "created_at": db_department.created_at,
+            "updated_at": db_department.updated_at
+        }
     
-    dept_dict = {
-        "id": db_department.id,
-        "name": db_department.name,
-        "description": db_department.description,
-        "product_count": 0,
-        "created_at": db_department.created_at,
-        "updated_at": db_department.updated_at
-    }
+    dept_dict = await writer.run(create)
     
     return DepartmentResponse(**dept_dict)
 
@@ -200,39 +320,43 @@ async def create_department(
 async def update_department(
     department_id: int = Path(..., description="Department ID"),
     department_update: DepartmentUpdate = None,
-    db: Session = Depends(get_db)
+    writer: DatabaseWriter = Depends(get_db_writer)
 ):
     """Update a department"""
-    db_department = db.query(Department).filter(Department.id == department_id).first()
-    
-    if not db_department:
-        raise HTTPException(status_code=404, detail="Department not found")
-    
-    # Check if new name already exists (if name is being updated)
-    if department_update.name and department_update.name != db_department.name:
-        existing_dept = db.query(Department).filter(Department.name == department_update.name).first()
-        if existing_dept:
-            raise HTTPException(status_code=400, detail="Department with this name already exists")
     
-    # Update department fields
-    update_data = department_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_department, field, value)
-    
-    db.commit()
-    db.refresh(db_department)
+    def update_unit(session: Session):
+        db_department = session.query(Department).filter(Department.id == department_id).first()
+        
+        if not db_department:
+            raise HTTPException(status_code=404, detail="Department not found")
+        
+        # Check if new name already exists (if name is being updated)
+        if department_update.name and department_update.name != db_department.name:
+            existing_dept = session.query(Department).filter(Department.name == department_update.name).first()
+            if existing_dept:
+                raise HTTPException(status_code=400, detail="Department with this name already exists")
+        
+        # Update department fields
+        update_data = department_update.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_department, field, value)
+        
+        session.flush()
+        session.refresh(db_department)
+        
+        # Get product count
+        product_count = session.query(Product).filter(Product.department_id == db_department.id).count()
+        
+        return {
+            "id": db_department.id,
+            "name": db_department.name,
+            "description": db_department.description,
+            "product_count": product_count,
+            "created_at": db_department.created_at,
+            "updated_at": db_department.updated_at
+        }
     
-    # Get product count
-    product_count = db.query(Product).filter(Product.department_id == db_department.id).count()
-    
-    dept_dict = {
-        "id": db_department.id,
-        "name": db_department.name,
-        "description": db_department.description,
-        "product_count": product_count,
-        "created_at": db_department.created_at,
-        "updated_at": db_department.updated_at
-    }
+    dept_dict = await writer.run(update_unit)
     
     return DepartmentResponse(**dept_dict)
 
@@ -240,42 +364,84 @@ async def update_department(
 async def delete_department(
     department_id: int = Path(..., description="Department ID"),
     force: bool = Query(False, description="Force delete even if department has products"),
-    db: Session = Depends(get_db)
+    background: bool = Query(False, description="Detach products in a background job (with force=true)"),
+    writer: DatabaseWriter = Depends(get_db_writer)
 ):
     """Delete a department"""
-    db_department = db.query(Department).filter(Department.id == department_id).first()
-    
-    if not db_department:
-        raise HTTPException(status_code=404, detail="Department not found")
-    
-    # Check if department has products
-    product_count = db.query(Product).filter(Product.department_id == department_id).count()
-    
-    if product_count > 0 and not force:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Cannot delete department with {product_count} products. Use force=true to delete anyway."
-        )
-    
-    # If force delete, set department_id to null for all products
-    if force and product_count > 0:
-        db.query(Product).filter(Product.department_id == department_id).update({"department_id": None})
     
-    db.delete(db_department)
-    db.commit()
+    def check_unit(session: Session) -> int:
+        # Runs in the same write unit as the delete, so no write can land
+        # between the checks and the delete
+        db_department = session.query(Department).filter(Department.id == department_id).first()
+        
+        if not db_department:
+            raise HTTPException(status_code=404, detail="Department not found")
+        
+        # Check if department has products
+        product_count = session.query(Product).filter(Product.department_id == department_id).count()
+        
+        if product_count > 0 and not force:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Cannot delete department with {product_count} products. Use force=true to delete anyway."
+            )
+        return product_count
+    
+    # Large departments are detached in chunks by a background job
+    if force and background:
+        product_count = await writer.run(check_unit)
+        if product_count > 0:
+            try:
+                job = job_registry.create(
+                    "department_force_delete",
+                    total=product_count,
+                    department_id=department_id
+                )
+            except JobRegistryFullError:
+                raise HTTPException(status_code=503, detail="Too many background jobs in progress, try again later")
+            job_executor.submit(
+                force_delete_department_in_chunks,
+                writer,
+                department_id,
+                job['id'],
+                settings.department_reassign_chunk_size
+            )
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "message": "Department deletion scheduled",
+                    "job_id": job['id'],
+                    "status_url": f"/api/v1/departments/jobs/{job['id']}"
+                }
+            )
+    
+    def delete_unit(session: Session):
+        check_unit(session)
+        
+        # If force delete, set department_id to null for all products
+        if force:
+            session.query(Product).filter(Product.department_id == department_id)\
+                   .update({"department_id": None}, synchronize_session=False)
+        
+        session.query(Department).filter(Department.id == department_id)\
+               .delete(synchronize_session=False)
+    
+    await writer.run(delete_unit)
     
     return {"message": "Department deleted successfully"}
 
 @router.get("/stats/summary")
-async def get_department_stats(db: Session = Depends(get_db)):
+async def get_department_stats(db: AsyncSession = Depends(get_async_read_db)):
     """Get department statistics"""
-    total_departments = db.query(Department).count()
+    total_departments = (await db.execute(select(func.count(Department.id)))).scalar_one()
     
     # Departments with product counts
-    dept_stats = db.query(
-        Department.name,
-        func.count(Product.id).label('product_count')
-    ).outerjoin(Product).group_by(Department.id, Department.name).all()
+    dept_stats = (await db.execute(
+        select(
+            Department.name,
+            func.count(Product.id).label('product_count')
+        ).outerjoin(Product).group_by(Department.id, Department.name)
+    )).all()
     
     # Average products per department
     avg_products = sum(stat[1] for stat in dept_stats) / len(dept_stats) if dept_stats else 0
@@ -288,3 +454,24 @@ async def get_department_stats(db: Session = Depends(get_db)):
             for stat in sorted(dept_stats, key=lambda x: x[1], reverse=True)
         ]
     }
+
+@router.get("/stats/detailed")
+async def get_department_stats_detailed():
+    """
+    Get detailed department statistics (cached)
+    
+    Served from a stale-while-revalidate cache: once warm, responses never
+    wait on the database and expired results are refreshed in the background.
+    """
+    if stats_cache.is_warm(DEPARTMENT_STATS_CACHE_KEY):
+        stats, cache_status, age = stats_cache.get(DEPARTMENT_STATS_CACHE_KEY, load_department_stats)
+    else:
+        # Cold cache: load on a database worker rather than the event loop
+        stats, cache_status, age = await db_executor.run(
+            stats_cache.get, DEPARTMENT_STATS_CACHE_KEY, load_department_stats
+        )
+    
+    return JSONResponse(
+        content=stats,
+        headers={"X-Cache": cache_status, "Age": str(int(age))}
+    )
@@ -0,0 +1,147 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from database.executor import db_executor
+from database.writer import db_writer
+from database.replicas import replica_router
+from database.pool_metrics import get_pool_stats
+from api.routes.products import product_statement_cache
+from api.utils.admin import require_admin
+from api.utils.loop_monitor import loop_monitor
+from api.utils.memory import memory_diagnostics, object_counts
+from api.utils.profiler import continuous_profiler, profile_store
+
+# Diagnostics expose stacks, heap contents and query shapes; every route needs the admin token
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/db-executor")
+async def get_db_executor_stats():
+    """Get queue and worker gauges for the database executor"""
+    return db_executor.stats()
+
+@router.get("/db-writer")
+async def get_db_writer_stats():
+    """Get batching statistics for the single-writer queue"""
+    return db_writer.stats()
+
+@router.get("/replicas")
+async def get_replica_stats():
+    """Get health and usage of the configured read replicas"""
+    return {"replicas": replica_router.stats()}
+
+@router.get("/pool")
+async def get_pool_stats_route():
+    """Get connection pool usage, churn and checkout wait times per engine"""
+    return {"pools": get_pool_stats()}
+
+@router.get("/statement-cache")
+async def get_statement_cache_stats():
+    """Get hit rate and lookup/build time of the product listing statement cache"""
+    return product_statement_cache.stats()
+
+@router.get("/event-loop")
+async def get_event_loop_stats():
+    """Get event loop lag and recent stalls with the blocking stack"""
+    return loop_monitor.stats()
+
+@router.get("/profiles")
+async def list_profiles():
+    """List stored on-demand request profiles, newest first"""
+    return {"profiles": profile_store.list(), "continuous": continuous_profiler.running}
+
+@router.get("/profiles/continuous")
+async def get_continuous_profile(reset: bool = False):
+    """Get stacks aggregated by the continuous profiler in collapsed format"""
+    result = continuous_profiler.report(reset=reset)
+    if not result['running']:
+        raise HTTPException(status_code=404, detail="Continuous profiling is not running")
+    return PlainTextResponse(result['report'], headers={"X-Profile-Samples": str(result['samples'])})
+
+@router.post("/profiles/continuous/start")
+async def start_continuous_profile():
+    """Start low-rate sampling of every thread"""
+    continuous_profiler.start()
+    return {"running": True, "interval_ms": continuous_profiler.interval * 1000}
+
+@router.post("/profiles/continuous/stop")
+async def stop_continuous_profile():
+    """Stop the continuous profiler and discard its stacks"""
+    continuous_profiler.stop()
+    return {"running": False}
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """Get a stored request profile (collapsed stacks or cProfile statistics)"""
+    report = profile_store.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(report['report'], media_type=report['content_type'], headers={
+        "X-Profile-Mode": report['mode'],
+        "X-Profile-Duration-Ms": str(report['duration_ms'])
+    })
+
+@router.get("/memory")
+async def get_memory_status():
+    """Get RSS, tracemalloc state and stored snapshots"""
+    return memory_diagnostics.status()
+
+@router.post("/memory/tracemalloc/start")
+async def start_tracemalloc(frames: int = Query(10, ge=1, le=100)):
+    """Start tracing allocations, keeping ``frames`` frames per allocation"""
+    memory_diagnostics.start(frames)
+    return {"tracing": True}
+
+@router.post("/memory/tracemalloc/stop")
+async def stop_tracemalloc():
+    """Stop tracing allocations"""
+    memory_diagnostics.stop()
+    return {"tracing": False}
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(label: Optional[str] = None):
+    """Take a tracemalloc snapshot"""
+    try:
+        return memory_diagnostics.take_snapshot(label)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/memory/snapshots/{snapshot_id}")
+async def get_memory_top(
+    snapshot_id: str,
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    limit: int = Query(20, ge=1, le=500)
+):
+    """Get the top allocation sites of a snapshot"""
+    try:
+        return {"snapshot": snapshot_id, "top": memory_diagnostics.top(snapshot_id, group_by, limit)}
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+@router.get("/memory/diff")
+async def get_memory_diff(
+    base: str,
+    target: str,
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    limit: int = Query(20, ge=1, le=500)
+):
+    """Get allocation sites that changed most between two snapshots"""
+    try:
+        return {"base": base, "target": target, "diff": memory_diagnostics.diff(base, target, group_by, limit)}
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+@router.get("/memory/objects")
+async def get_object_counts(limit: int = Query(20, ge=1, le=500)):
+    """Get live object counts by type"""
+    return {"objects": object_counts(limit)}
+
+@router.get("/memory/requests")
+async def get_request_peaks():
+    """Get peak allocation per route for sampled requests that ran alone"""
+    return {
+        "tracing": memory_diagnostics.tracing,
+        "overlapped_requests": memory_diagnostics.overlapped_requests,
+        "routes": memory_diagnostics.request_peaks()
+    }
@@ -1,21 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 from typing import Optional, List
-from database.connection import get_db
+from database.replicas import get_async_read_db
 from database.models import Product, Department
+from api.config import settings
 from api.utils.helpers import (
-    paginate_query, 
-    build_product_filters, 
-    apply_product_sorting,
+    paginate_query_async, 
+    normalize_product_filters,
+    product_filter_bind_values,
+    resolve_product_sort,
+    build_product_list_statements,
     build_product_response,
+    build_product_row_response,
     calculate_product_stats
 )
+from api.utils.statement_cache import StatementCache
+from api.utils.tracing import span
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Prebuilt listing statements keyed on (filters applied, sort field, sort order)
+product_statement_cache = StatementCache(max_size=settings.statement_cache_size)
+
 # Pydantic models for request/response
 from pydantic import BaseModel, Field
 from decimal import Decimal
@@ -48,6 +59,7 @@ class ProductListResponse(BaseModel):
 
 @router.get("/", response_model=ProductListResponse)
 async def get_products(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search term"),
@@ -59,7 +71,7 @@ async def get_products(
     min_rating: Optional[float] = Query(None, ge=0, le=5, description="Minimum rating"),
     sort_by: str = Query("created_at", description="Sort field"),
     sort_order: str = Query("desc", regex="^(asc|desc)$", description="Sort order"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get paginated list of products with optional filtering and sorting
@@ -72,7 +84,7 @@ async def get_products(
         
         # Validate department_id if provided
         if department_id:
-            dept_exists = db.query(Department).filter(Department.id == department_id).first()
+            dept_exists = await db.get(Department, department_id)
             if not dept_exists:
                 raise HTTPException(status_code=400, detail=f"Department with ID {department_id} not found")
         
@@ -93,27 +105,46 @@ async def get_products(
         if min_rating is not None:
             filters['min_rating'] = min_rating
         
-        logger.info(f"Products query - Filters: {filters}, Page: {page}, Per page: {per_page}")
-        
-        # Build query with joins
-        query = db.query(Product).outerjoin(Department, Product.department_id == Department.id)
-        
-        # Apply filters
-        query = build_product_filters(query, filters)
-        
-        # Apply sorting
-        query = apply_product_sorting(query, sort_by, sort_order)
+        logger.info("Products query - Filters: %s, Page: %s, Per page: %s", filters, page, per_page)
+        
+        # Reuse the statements built for this filter/sort shape; only the
+        # filter values change between requests
+        params = normalize_product_filters(filters)
+        sort_field, _, sort_direction = resolve_product_sort(sort_by, sort_order)
+        row_mode = settings.listing_row_mode
+        shape = (tuple(sorted(params)), sort_field, sort_direction, row_mode)
+        with span("product_statement_cache") as cache_span:
+            (query, count_query), cached, build_time = product_statement_cache.get(
+                shape,
+                lambda: build_product_list_statements(shape[0], sort_field, sort_direction, row_mode=row_mode)
+            )
+            if cache_span is not None:
+                cache_span.attributes['cache'] = "HIT" if cached else "MISS"
+        response.headers["X-Statement-Cache"] = "HIT" if cached else "MISS"
+        # Time to look up or build the statements; SQL compilation happens at
+        # execution and is reported in the Server-Timing header
+        response.headers["X-Statement-Build-Ms"] = f"{build_time * 1000:.3f}"
         
         # Paginate
-        result = paginate_query(query, page, per_page)
-        
-        # Build response with department names
-        products_response = []
-        for product in result['items']:
-            product_data = build_product_response(product, include_department=True)
-            products_response.append(product_data)
-        
-        response = {
+        result = await paginate_query_async(
+            db, query, page, per_page,
+            count_statement=count_query,
+            params=product_filter_bind_values(params),
+            scalars=not row_mode
+        )
+        
+        # Build response with department names; one span for the whole page,
+        # since a span per row would cost more than the rows themselves
+        with span("build_product_responses", rows=len(result['items'])):
+            if row_mode:
+                products_response = [build_product_row_response(row) for row in result['items']]
+            else:
+                products_response = [
+                    build_product_response(product, include_department=True)
+                    for product in result['items']
+                ]
+        
+        listing = {
             "products": products_response,
             "total": result['total'],
             "page": result['page'],
@@ -121,8 +152,8 @@ async def get_products(
             "total_pages": result['total_pages']
         }
         
-        logger.info(f"Products query successful - Returned {len(products_response)} products")
-        return response
+        logger.info("Products query successful - Returned %d products", len(products_response))
+        return listing
         
     except HTTPException:
         raise
@@ -131,10 +162,14 @@ async def get_products(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: int, db: Session = Depends(get_db)):
+async def get_product(product_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific product by ID"""
     try:
-        product = db.query(Product).outerjoin(Department).filter(Product.id == product_id).first()
+        query = select(Product)\
+            .outerjoin(Department)\
+            .options(contains_eager(Product.department))\
+            .where(Product.id == product_id)
+        product = (await db.execute(query)).scalars().first()
         
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
@@ -148,44 +183,44 @@ async def get_product(product_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/categories/list")
-async def get_categories(db: Session = Depends(get_db)):
+async def get_categories(db: AsyncSession = Depends(get_async_read_db)):
     """Get list of all unique categories"""
     try:
-        categories = db.query(Product.category)\
-                      .filter(Product.category.isnot(None))\
-                      .filter(Product.category != '')\
+        query = select(Product.category)\
+                      .where(Product.category.isnot(None))\
+                      .where(Product.category != '')\
                       .distinct()\
-                      .order_by(Product.category)\
-                      .all()
+                      .order_by(Product.category)
+        categories = (await db.execute(query)).scalars().all()
         
-        return [cat.category for cat in categories if cat.category]
+        return [category for category in categories if category]
         
     except Exception as e:
         logger.error(f"Error getting categories: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/brands/list")
-async def get_brands(db: Session = Depends(get_db)):
+async def get_brands(db: AsyncSession = Depends(get_async_read_db)):
     """Get list of all unique brands"""
     try:
-        brands = db.query(Product.brand)\
-                  .filter(Product.brand.isnot(None))\
-                  .filter(Product.brand != '')\
+        query = select(Product.brand)\
+                  .where(Product.brand.isnot(None))\
+                  .where(Product.brand != '')\
                   .distinct()\
-                  .order_by(Product.brand)\
-                  .all()
+                  .order_by(Product.brand)
+        brands = (await db.execute(query)).scalars().all()
         
-        return [brand.brand for brand in brands if brand.brand]
+        return [brand for brand in brands if brand]
         
     except Exception as e:
         logger.error(f"Error getting brands: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/stats/summary")
-async def get_product_stats(db: Session = Depends(get_db)):
+async def get_product_stats(db: AsyncSession = Depends(get_async_read_db)):
     """Get comprehensive product statistics"""
     try:
-        stats = calculate_product_stats(db)
+        stats = await db.run_sync(calculate_product_stats)
         return stats
         
     except Exception as e:
@@ -0,0 +1,20 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from api.config import settings
+
+# Header carrying the admin token for diagnostics endpoints and flags
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Whether ``token`` matches the configured admin token (never true when unset)"""
+    if not settings.admin_token or not token:
+        return False
+    return secrets.compare_digest(token, settings.admin_token)
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Dependency restricting a route to callers presenting the admin token"""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin access required")
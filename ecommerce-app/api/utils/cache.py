@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_HIT = "HIT"
+CACHE_STALE = "STALE"
+CACHE_MISS = "MISS"
+
+class StaleWhileRevalidateCache:
+    """
+    Small in-process cache with stale-while-revalidate semantics
+
+    A fresh entry is returned as-is. An expired entry is still returned
+    immediately while a single background thread reloads it, so callers
+    never wait on the loader once the cache is warm. Only a cold key is
+    loaded on the caller's thread; concurrent callers for the same cold
+    key wait for that one load instead of each running the loader.
+
+    Background reloads are submitted to ``refresh_executor`` (any object
+    with a ``submit`` method) when one is given, otherwise they run on a
+    short-lived thread.
+    """
+
+    def __init__(self, ttl: float = 60.0, refresh_executor=None):
+        self.ttl = ttl
+        self.refresh_executor = refresh_executor
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._refreshing = set()
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Tuple[Any, str, float]:
+        """
+        Get a cached value, loading or refreshing it as needed
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the value
+
+        Returns:
+            tuple: (value, cache status, age in seconds)
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                load = self._loading.get(key)
+                owner = load is None
+                if owner:
+                    load = self._loading[key] = Future()
+
+        if entry is None:
+            if not owner:
+                return load.result(), CACHE_MISS, 0.0
+            return self._load(key, loader, load), CACHE_MISS, 0.0
+
+        value, loaded_at = entry
+        age = now - loaded_at
+
+        if age < self.ttl:
+            return value, CACHE_HIT, age
+
+        self._schedule_refresh(key, loader)
+        return value, CACHE_STALE, age
+
+    def set(self, key: str, value: Any):
+        """Store a value for ``key``"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+
+    def invalidate(self, key: str):
+        """Drop a cached value so the next read reloads it"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def is_warm(self, key: str) -> bool:
+        """Whether ``key`` currently has a cached value (fresh or stale)"""
+        with self._lock:
+            return key in self._entries
+
+    def _load(self, key: str, loader: Callable[[], Any], future: Future) -> Any:
+        """Load a cold key and hand the result (or error) to callers waiting on ``future``"""
+        try:
+            value = loader()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _schedule_refresh(self, key: str, loader: Callable[[], Any]):
+        """Start a background reload of ``key`` unless one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        if self.refresh_executor is not None:
+            try:
+                self.refresh_executor.submit(self._refresh, key, loader)
+            except Exception as e:
+                # Executor saturated; keep serving stale and retry on a later read
+                logger.warning(f"Could not schedule refresh of cache key '{key}': {e}")
+                with self._lock:
+                    self._refreshing.discard(key)
+            return
+
+        thread = threading.Thread(
+            target=self._refresh,
+            args=(key, loader),
+            name=f"cache-refresh-{key}",
+            daemon=True
+        )
+        thread.start()
+
+    def _refresh(self, key: str, loader: Callable[[], Any]):
+        try:
+            self.set(key, loader())
+        except Exception as e:
+            # Keep serving the stale value; the next read retries
+            logger.error(f"Error refreshing cache key '{key}': {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
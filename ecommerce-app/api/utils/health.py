@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+import logging
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+# Index backing the catalog search filters
+SEARCH_INDEX_NAME = "idx_product_search"
+
+class HealthMonitor:
+    """
+    Background database health check for readiness probes
+
+    A daemon thread runs ``SELECT 1`` and checks for the search index every
+    ``interval`` seconds, keeping the latest result in memory. Probes read
+    that result instead of touching the database, so probe frequency never
+    translates into pool checkouts on the request path.
+    """
+
+    def __init__(self, engine, interval: float = 5.0, max_age: Optional[float] = None):
+        self.engine = engine
+        self.interval = interval
+        # A result older than this means the checker itself is stuck
+        self.max_age = max_age if max_age is not None else interval * 3
+        self._result: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Run one check immediately, then keep refreshing in the background"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self.check()
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background checker"""
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join(timeout)
+
+    def check(self) -> Dict[str, Any]:
+        """Run the database check now and store the result"""
+        start = time.perf_counter()
+        result = {'database': False, 'search_index': False, 'error': None}
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                result['database'] = True
+                indexes = inspect(connection).get_indexes("products")
+                result['search_index'] = any(index['name'] == SEARCH_INDEX_NAME for index in indexes)
+        except Exception as e:
+            result['error'] = str(e)
+            logger.warning(f"Database health check failed: {e}")
+
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        result['checked_at'] = time.time()
+        with self._lock:
+            self._result = result
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        """Latest check result, marked stale if the checker has fallen behind"""
+        with self._lock:
+            result = dict(self._result) if self._result is not None else None
+
+        if result is None:
+            return {'database': False, 'search_index': False, 'error': "No health check has run yet",
+                    'latency_ms': None, 'age_s': None, 'stale': True}
+
+        result['age_s'] = round(time.time() - result.pop('checked_at'), 3)
+        result['stale'] = result['age_s'] > self.max_age
+        return result
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -1,7 +1,9 @@
 from typing import Dict, Any, Optional, List, Union
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
-from database.models import Product, Department
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_, and_, select, bindparam, case
+from database.models import Product, Department, product_discount_percentage
+from api.utils.tracing import traced
 import logging
 from decimal import Decimal
 import re
@@ -9,6 +11,7 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+@traced()
 def paginate_query(query, page: int = 1, per_page: int = 20, max_per_page: int = 100):
     """
     Paginate a SQLAlchemy query
@@ -51,112 +54,202 @@ def paginate_query(query, page: int = 1, per_page: int = 20, max_per_page: int =
         'next_page': page + 1 if page < total_pages else None
     }
 
-def build_product_filters(query, filters: Dict[str, Any]):
+@traced()
+async def paginate_query_async(db: AsyncSession, statement, page: int = 1, per_page: int = 20,
+                               max_per_page: int = 100, scalars: bool = True,
+                               count_statement=None, params: Optional[Dict[str, Any]] = None):
     """
-    Build product filters for SQLAlchemy query
+    Paginate a SQLAlchemy select() statement on an async session
+    
+    Args:
+        db: Async database session
+        statement: SQLAlchemy select() statement
+        page: Page number (1-based)
+        per_page: Items per page
+        max_per_page: Maximum items per page
+        scalars: Return the first entity/column of each row instead of rows
+        count_statement: Prebuilt count statement (derived from statement if omitted)
+        params: Bind parameter values for both statements
+    
+    Returns:
+        dict: Pagination information and items
+    """
+    # Validate and limit per_page
+    per_page = min(per_page, max_per_page)
+    per_page = max(per_page, 1)
+    
+    # Validate page
+    page = max(page, 1)
+    
+    # Get total count (ordering is irrelevant for counting)
+    if count_statement is None:
+        count_statement = select(func.count()).select_from(statement.order_by(None).subquery())
+    total = (await db.execute(count_statement, params)).scalar_one()
+    
+    # Calculate pagination info
+    total_pages = (total + per_page - 1) // per_page
+    offset = (page - 1) * per_page
+    
+    # Get items for current page
+    result = await db.execute(statement.offset(offset).limit(per_page), params)
+    items = result.scalars().all() if scalars else result.all()
+    
+    return {
+        'items': items,
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': total_pages,
+        'has_prev': page > 1,
+        'has_next': page < total_pages,
+        'prev_page': page - 1 if page > 1 else None,
+        'next_page': page + 1 if page < total_pages else None
+    }
+
+def normalize_product_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate product filters and convert them to bind parameter values
+    
+    Only filters that actually apply are returned, so the keys describe the
+    shape of the WHERE clause and the values are what gets bound to it.
     
     Args:
-        query: SQLAlchemy query object
         filters: Dictionary of filter parameters
     
     Returns:
-        SQLAlchemy query with applied filters
+        dict: Bind values keyed by filter name
+    """
+    params = {}
+    
+    # Substring filters match with ILIKE
+    for key in ('search', 'category', 'sub_category', 'brand', 'type'):
+        if filters.get(key):
+            params[key] = f"%{filters[key]}%"
+    
+    # Department filter
+    if filters.get('department_id'):
+        try:
+            params['department_id'] = int(filters['department_id'])
+        except (ValueError, TypeError):
+            logger.warning(f"Invalid department_id: {filters['department_id']}")
+    
+    # Price range and rating filters
+    for key in ('min_price', 'max_price', 'min_rating'):
+        if filters.get(key):
+            try:
+                params[key] = float(filters[key])
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid {key}: {filters[key]}")
+    
+    # In stock (sale_price > 0) and on sale (market_price > sale_price) flags
+    for key in ('in_stock', 'on_sale'):
+        if filters.get(key) and str(filters[key]).lower() in ['true', '1', 'yes']:
+            params[key] = True
+    
+    return params
+
+@traced()
+def build_product_filter_conditions(params: Dict[str, Any]) -> List[Any]:
+    """
+    Build WHERE conditions for normalized product filters
+    
+    Each value is attached as a named bind parameter (``filter_<name>``), so
+    a statement built once for a filter shape can be re-executed with new
+    values.
+    
+    Args:
+        params: Output of normalize_product_filters
+    
+    Returns:
+        list: SQLAlchemy conditions
     """
+    conditions = []
+    
     # Search filter - searches across multiple fields
-    if filters.get('search'):
-        search_term = f"%{filters['search']}%"
-        search_conditions = [
+    if 'search' in params:
+        search_term = bindparam('filter_search', params['search'])
+        conditions.append(or_(
             Product.product_name.ilike(search_term),
             Product.brand.ilike(search_term),
             Product.category.ilike(search_term),
             Product.sub_category.ilike(search_term),
             Product.description.ilike(search_term)
-        ]
-        query = query.filter(or_(*search_conditions))
+        ))
     
-    # Category filter
-    if filters.get('category'):
-        query = query.filter(Product.category.ilike(f"%{filters['category']}%"))
+    if 'category' in params:
+        conditions.append(Product.category.ilike(bindparam('filter_category', params['category'])))
     
-    # Sub-category filter
-    if filters.get('sub_category'):
-        query = query.filter(Product.sub_category.ilike(f"%{filters['sub_category']}%"))
+    if 'sub_category' in params:
+        conditions.append(Product.sub_category.ilike(bindparam('filter_sub_category', params['sub_category'])))
     
-    # Brand filter
-    if filters.get('brand'):
-        query = query.filter(Product.brand.ilike(f"%{filters['brand']}%"))
+    if 'brand' in params:
+        conditions.append(Product.brand.ilike(bindparam('filter_brand', params['brand'])))
     
-    # Type filter
-    if filters.get('type'):
-        query = query.filter(Product.type.ilike(f"%{filters['type']}%"))
+    if 'type' in params:
+        conditions.append(Product.type.ilike(bindparam('filter_type', params['type'])))
     
-    # Department filter
-    if filters.get('department_id'):
-        try:
-            dept_id = int(filters['department_id'])
-            query = query.filter(Product.department_id == dept_id)
-        except (ValueError, TypeError):
-            logger.warning(f"Invalid department_id: {filters['department_id']}")
+    if 'department_id' in params:
+        conditions.append(Product.department_id == bindparam('filter_department_id', params['department_id']))
     
-    # Price range filters
-    if filters.get('min_price'):
-        try:
-            min_price = float(filters['min_price'])
-            query = query.filter(Product.sale_price >= min_price)
-        except (ValueError, TypeError):
-            logger.warning(f"Invalid min_price: {filters['min_price']}")
+    if 'min_price' in params:
+        conditions.append(Product.sale_price >= bindparam('filter_min_price', params['min_price']))
     
-    if filters.get('max_price'):
-        try:
-            max_price = float(filters['max_price'])
-            query = query.filter(Product.sale_price <= max_price)
-        except (ValueError, TypeError):
-            logger.warning(f"Invalid max_price: {filters['max_price']}")
+    if 'max_price' in params:
+        conditions.append(Product.sale_price <= bindparam('filter_max_price', params['max_price']))
     
-    # Rating filter
-    if filters.get('min_rating'):
-        try:
-            min_rating = float(filters['min_rating'])
-            query = query.filter(Product.rating >= min_rating)
-        except (ValueError, TypeError):
-            logger.warning(f"Invalid min_rating: {filters['min_rating']}")
-    
-    # In stock filter (sale_price > 0)
-    if filters.get('in_stock'):
-        if str(filters['in_stock']).lower() in ['true', '1', 'yes']:
-            query = query.filter(Product.sale_price > 0)
-    
-    # On sale filter (has market_price > sale_price)
-    if filters.get('on_sale'):
-        if str(filters['on_sale']).lower() in ['true', '1', 'yes']:
-            query = query.filter(
-                and_(
-                    Product.market_price.isnot(None),
-                    Product.sale_price.isnot(None),
-                    Product.market_price > Product.sale_price
-                )
-            )
+    if 'min_rating' in params:
+        conditions.append(Product.rating >= bindparam('filter_min_rating', params['min_rating']))
+    
+    if 'in_stock' in params:
+        conditions.append(Product.sale_price > 0)
+    
+    if 'on_sale' in params:
+        conditions.append(and_(
+            Product.market_price.isnot(None),
+            Product.sale_price.isnot(None),
+            Product.market_price > Product.sale_price
+        ))
+    
+    return conditions
+
+def product_filter_bind_values(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Execution parameters for a statement built by build_product_filter_conditions"""
+    return {
+        f"filter_{key}": value
+        for key, value in params.items()
+        if key not in ('in_stock', 'on_sale')
+    }
+
+@traced()
+def build_product_filters(query, filters: Dict[str, Any]):
+    """
+    Build product filters for SQLAlchemy query
+    
+    Args:
+        query: SQLAlchemy query object or select() statement
+        filters: Dictionary of filter parameters
     
+    Returns:
+        SQLAlchemy query with applied filters
+    """
+    conditions = build_product_filter_conditions(normalize_product_filters(filters))
+    if conditions:
+        query = query.filter(*conditions)
     return query
 
-def apply_product_sorting(query, sort_by: str = 'created_at', sort_order: str = 'desc'):
+def resolve_product_sort(sort_by: str = 'created_at', sort_order: str = 'desc') -> tuple:
     """
-    Apply sorting to product query
+    Resolve a requested sort onto a Product column
     
     Args:
-        query: SQLAlchemy query object
         sort_by: Field to sort by
         sort_order: Sort order ('asc' or 'desc')
     
     Returns:
-        SQLAlchemy query with applied sorting
+        tuple: (sort field name, sort column, 'asc' or 'desc')
     """
     # Validate sort_order
-    if sort_order.lower() not in ['asc', 'desc']:
-        sort_order = 'desc'
-    
-    # Get the column to sort by
-    sort_column = None
+    sort_order = sort_order.lower() if sort_order.lower() in ['asc', 'desc'] else 'desc'
     
     # Map sort fields to actual columns
     sort_mapping = {
@@ -177,16 +270,85 @@ def apply_product_sorting(query, sort_by: str = 'created_at', sort_order: str =
     
     if sort_column is None:
         # Default to created_at if invalid sort field
-        sort_column = Product.created_at
         logger.warning(f"Invalid sort field '{sort_by}', using 'created_at'")
+        return 'created_at', Product.created_at, sort_order
+    
+    return sort_column.key, sort_column, sort_order
+
+def apply_product_sorting(query, sort_by: str = 'created_at', sort_order: str = 'desc'):
+    """
+    Apply sorting to product query
+    
+    Args:
+        query: SQLAlchemy query object or select() statement
+        sort_by: Field to sort by
+        sort_order: Sort order ('asc' or 'desc')
+    
+    Returns:
+        SQLAlchemy query with applied sorting
+    """
+    _, sort_column, sort_order = resolve_product_sort(sort_by, sort_order)
     
     # Apply sorting
-    if sort_order.lower() == 'desc':
-        query = query.order_by(sort_column.desc())
+    if sort_order == 'desc':
+        return query.order_by(sort_column.desc())
+    return query.order_by(sort_column.asc())
+
+# Columns read by the product listings when bypassing ORM hydration
+PRODUCT_LIST_COLUMNS = (
+    Product.id,
+    Product.product_id,
+    Product.product_name,
+    Product.category,
+    Product.sub_category,
+    Product.brand,
+    Product.sale_price,
+    Product.market_price,
+    Product.type,
+    Product.rating,
+    Product.description,
+    Product.department_id,
+    Product.created_at,
+    Product.updated_at
+)
+
+@traced()
+def build_product_list_statements(filter_keys: tuple, sort_by: str, sort_order: str,
+                                  row_mode: bool = False) -> tuple:
+    """
+    Build the page and count statements for a product listing shape
+    
+    The statements carry bind parameters for every filter value, so they
+    can be cached per (filter keys, sort) shape and re-executed with
+    product_filter_bind_values().
+    
+    Args:
+        filter_keys: Names of the filters that apply
+        sort_by: Field to sort by
+        sort_order: Sort order ('asc' or 'desc')
+        row_mode: Select plain columns (for build_product_row_response)
+            instead of Product entities
+    
+    Returns:
+        tuple: (page statement, count statement)
+    """
+    conditions = build_product_filter_conditions({key: None for key in filter_keys})
+    
+    if row_mode:
+        page_statement = select(*PRODUCT_LIST_COLUMNS, Department.name.label('department_name'))\
+            .outerjoin(Department, Product.department_id == Department.id)\
+            .where(*conditions)
     else:
-        query = query.order_by(sort_column.asc())
+        # The joined department is loaded eagerly
+        page_statement = select(Product)\
+            .outerjoin(Department, Product.department_id == Department.id)\
+            .options(contains_eager(Product.department))\
+            .where(*conditions)
+    page_statement = apply_product_sorting(page_statement, sort_by, sort_order)
     
-    return query
+    count_statement = select(func.count(Product.id)).where(*conditions)
+    
+    return page_statement, count_statement
 
 def calculate_product_stats(db: Session) -> Dict[str, Any]:
     """
@@ -254,7 +416,7 @@ def calculate_product_stats(db: Session) -> Dict[str, Any]:
         # Price ranges
         price_ranges = db.query(
             func.count(Product.id).label('count'),
-            func.case(
+            case(
                 (Product.sale_price < 25, 'Under $25'),
                 (Product.sale_price < 50, '$25-$50'),
                 (Product.sale_price < 100, '$50-$100'),
@@ -326,60 +488,52 @@ def calculate_department_stats(db: Session) -> Dict[str, Any]:
     
     Returns:
         dict: Department statistics
-    """
-    try:
-        # Total departments
-        total_departments = db.query(Department).count()
-        
-        # Department breakdown with product counts
-        dept_breakdown = db.query(
-            Department.id,
-            Department.name,
-            Department.description,
-            func.count(Product.id).label('product_count'),
-            func.avg(Product.sale_price).label('avg_price'),
-            func.avg(Product.rating).label('avg_rating')
-        ).outerjoin(Product)\
-         .group_by(Department.id, Department.name, Department.description)\
-         .order_by(func.count(Product.id).desc()).all()
-        
-        # Calculate statistics
-        total_products = sum(dept.product_count for dept in dept_breakdown)
-        avg_products = total_products / total_departments if total_departments > 0 else 0
-        
-        # Departments with/without products
-        departments_with_products = sum(1 for dept in dept_breakdown if dept.product_count > 0)
-        departments_without_products = total_departments - departments_with_products
-        
-        return {
-            'total_departments': total_departments,
-            'departments_with_products': departments_with_products,
-            'departments_without_products': departments_without_products,
-            'total_products_across_departments': total_products,
-            'average_products_per_department': round(avg_products, 2),
-            'department_breakdown': [
-                {
-                    'id': dept.id,
-                    'name': dept.name,
-                    'description': dept.description,
-                    'product_count': dept.product_count,
-                    'average_price': float(dept.avg_price or 0),
-                    'average_rating': float(dept.avg_rating or 0)
-                }
-                for dept in dept_breakdown
-            ]
-        }
     
-    except Exception as e:
-        logger.error(f"Error calculating department stats: {e}")
-        return {
-            'total_departments': 0,
-            'departments_with_products': 0,
-            'departments_without_products': 0,
-            'total_products_across_departments': 0,
-            'average_products_per_department': 0,
-            'department_breakdown': []
-        }
+    Raises:
+        SQLAlchemyError: If the query fails; callers caching the result keep
+            their previous value instead of replacing it with empty stats
+    """
+    # Department breakdown with product counts. The outer join keeps
+    # empty departments, so this single grouped query also yields the
+    # department total.
+    dept_breakdown = db.query(
+        Department.id,
+        Department.name,
+        Department.description,
+        func.count(Product.id).label('product_count'),
+        func.avg(Product.sale_price).label('avg_price'),
+        func.avg(Product.rating).label('avg_rating')
+    ).outerjoin(Product)\
+     .group_by(Department.id, Department.name, Department.description)\
+     .order_by(func.count(Product.id).desc()).all()
+    
+    # Calculate statistics
+    total_departments = len(dept_breakdown)
+    total_products = sum(dept.product_count for dept in dept_breakdown)
+    avg_products = total_products / total_departments if total_departments > 0 else 0
+    
+    # Departments with/without products
+    departments_with_products = sum(1 for dept in dept_breakdown if dept.product_count > 0)
+    departments_without_products = total_departments - departments_with_products
+    
+    return {
+        'total_departments': total_departments,
+        'departments_with_products': departments_with_products,
+        'departments_without_products': departments_without_products,
+        'total_products_across_departments': total_products,
+        'average_products_per_department': round(avg_products, 2),
+        'department_breakdown': [
+            {
+                'id': dept.id,
+                'name': dept.name,
+                'description': dept.description,
+                'product_count': dept.product_count,
+                'average_price': float(dept.avg_price or 0),
+                'average_rating': float(dept.avg_rating or 0)
+            }
+            for dept in dept_breakdown
+        ]
+    }
 
 def validate_pagination_params(page: Optional[int], per_page: Optional[int]) -> tuple:
     """
@@ -625,6 +779,39 @@ def build_product_response(product: Product, include_department: bool = True) ->
     
     return response
 
+def build_product_row_response(row) -> Dict[str, Any]:
+    """
+    Build standardized product response from a plain result row
+    
+    Counterpart of build_product_response for statements selecting
+    PRODUCT_LIST_COLUMNS plus a ``department_name`` label, so read-only
+    listings skip ORM instance hydration.
+    
+    Args:
+        row: Result row with product columns and department_name
+    
+    Returns:
+        dict: Formatted product response
+    """
+    return {
+        'id': row.id,
+        'product_id': row.product_id,
+        'product_name': row.product_name,
+        'category': row.category,
+        'sub_category': row.sub_category,
+        'brand': row.brand,
+        'sale_price': float(row.sale_price) if row.sale_price else None,
+        'market_price': float(row.market_price) if row.market_price else None,
+        'type': row.type,
+        'rating': row.rating,
+        'description': row.description,
+        'department_id': row.department_id,
+        'discount_percentage': product_discount_percentage(row.market_price, row.sale_price),
+        'created_at': row.created_at.isoformat() if row.created_at else None,
+        'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+        'department_name': row.department_name
+    }
+
 def get_unique_values(db: Session, model_class, field_name: str, limit: int = 100) -> List[str]:
     """
     Get unique values for a specific field
@@ -0,0 +1,137 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional
+import logging
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+class JobRegistryFullError(Exception):
+    """Raised when the registry already holds ``max_jobs`` unfinished jobs"""
+
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        super().__init__(f"Job registry is full ({max_jobs} jobs pending or running)")
+
+class JobRegistry:
+    """
+    In-process registry for long-running maintenance jobs
+
+    Jobs are tracked as plain dicts so they can be returned directly
+    from the API. The registry never holds more than ``max_jobs``: the
+    oldest finished jobs are evicted to make room, and new jobs are
+    rejected while every slot holds a pending or running job.
+    """
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, kind: str, total: int = 0, **details) -> Dict[str, Any]:
+        """
+        Register a new pending job
+
+        Args:
+            kind: Job type (e.g. 'department_force_delete')
+            total: Number of units of work the job is expected to process
+            **details: Extra job-specific fields to expose
+
+        Returns:
+            dict: Snapshot of the created job
+
+        Raises:
+            JobRegistryFullError: If ``max_jobs`` jobs are still unfinished
+        """
+        job = {
+            'id': uuid.uuid4().hex,
+            'kind': kind,
+            'status': JOB_PENDING,
+            'total': total,
+            'processed': 0,
+            'progress': 0.0,
+            'error': None,
+            'details': details,
+            'created_at': datetime.utcnow().isoformat(),
+            'started_at': None,
+            'finished_at': None
+        }
+
+        with self._lock:
+            self._evict_finished()
+            if len(self._jobs) >= self.max_jobs:
+                raise JobRegistryFullError(self.max_jobs)
+            self._jobs[job['id']] = job
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a snapshot of a job, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def start(self, job_id: str):
+        """Mark a job as running"""
+        self._update(job_id, status=JOB_RUNNING, started_at=datetime.utcnow().isoformat())
+
+    def advance(self, job_id: str, count: int):
+        """Record ``count`` more processed units for a job"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            job['processed'] += count
+            if job['total'] > 0:
+                job['progress'] = round(min(job['processed'] / job['total'], 1.0) * 100, 2)
+
+    def complete(self, job_id: str):
+        """Mark a job as successfully finished"""
+        self._update(
+            job_id,
+            status=JOB_COMPLETED,
+            progress=100.0,
+            finished_at=datetime.utcnow().isoformat()
+        )
+
+    def fail(self, job_id: str, error: str):
+        """Mark a job as failed"""
+        self._update(
+            job_id,
+            status=JOB_FAILED,
+            error=error,
+            finished_at=datetime.utcnow().isoformat()
+        )
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                job.update(fields)
+
+    def _evict_finished(self):
+        """Drop the oldest finished jobs once the registry is full (lock held)"""
+        if len(self._jobs) < self.max_jobs:
+            return
+
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job['status'] in (JOB_COMPLETED, JOB_FAILED)
+        ]
+        for job_id in finished[:len(self._jobs) - self.max_jobs + 1]:
+            del self._jobs[job_id]
+
+job_registry = JobRegistry()
+
+# Jobs run here rather than on the database executor: a job lasts minutes
+# and would hold one of its pool-sized workers throughout, while only its
+# individual write units need database capacity. The registry's cap bounds
+# how many jobs can queue.
+job_executor = ThreadPoolExecutor(max_workers=max(settings.job_workers, 1), thread_name_prefix="job-worker")
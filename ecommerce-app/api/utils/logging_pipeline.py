@@ -0,0 +1,150 @@
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from typing import Dict, Optional
+
+import structlog
+
+from api.config import settings
+
+# Processors shared by structlog loggers and plain stdlib loggers; they only
+# enrich the event dict, rendering happens on the listener thread
+SHARED_PROCESSORS = [
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.processors.StackInfoRenderer(),
+]
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of low-severity records from selected loggers
+
+    ``rates`` maps logger names to the fraction of records kept (child
+    loggers inherit their parent's rate). Records at WARNING and above are
+    always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float], max_level: int = logging.INFO):
+        super().__init__()
+        self.rates = rates
+        self.max_level = max_level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or not self.rates:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+    def _rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves all formatting to the listener thread
+
+    The stock QueueHandler merges the message and its arguments on the
+    calling thread (and would flatten structlog's event dict); here the
+    record is only copied, so the request thread pays for an enqueue.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+    def enqueue(self, record: logging.LogRecord):
+        # Never block a request on logging; shed records if the writer falls behind
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def build_handlers() -> list:
+    """Console and rotating file handlers, rendering JSON through structlog"""
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer()
+        ],
+        foreign_pre_chain=SHARED_PROCESSORS
+    )
+
+    handlers = [logging.StreamHandler()]
+    if settings.log_file:
+        log_dir = os.path.dirname(settings.log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        handlers.append(logging.handlers.RotatingFileHandler(
+            settings.log_file,
+            maxBytes=settings.log_max_bytes,
+            backupCount=settings.log_backup_count,
+            encoding="utf-8"
+        ))
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+def setup_logging():
+    """
+    Route all logging through a queue to a background listener
+
+    Loggers below ``settings.log_level`` are rejected before any work is
+    done, sampled loggers drop records before they are queued, and JSON
+    rendering plus file/console I/O run on the listener thread.
+    """
+    global _listener
+
+    if _listener is not None:
+        return
+
+    level = logging.getLevelName(settings.log_level.upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
+    structlog.configure(
+        processors=[structlog.stdlib.filter_by_level] + SHARED_PROCESSORS + [
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=settings.log_queue_size)
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings.log_sample_rates))
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [queue_handler]
+    root_logger.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *build_handlers(), respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
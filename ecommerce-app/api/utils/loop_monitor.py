@@ -0,0 +1,137 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from typing import Any, Dict, Optional
+import logging
+
+from api.config import settings
+from api.utils.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+# Innermost frames kept from a blocked loop's stack
+STALL_STACK_DEPTH = 30
+
+# Stalls kept for /internal/event-loop
+RECENT_STALLS = 20
+
+class LoopMonitor:
+    """
+    Measure event loop lag and catch the code blocking it
+
+    A heartbeat task on the loop sleeps for ``interval`` and records how
+    late it woke up. A watchdog thread notices when the heartbeat has not
+    run for ``threshold`` and, while the loop is still stuck, captures the
+    loop thread's stack and the request whose task is running. Blocking
+    calls made from ``async def`` routes show up there by handler and line.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25):
+        self.interval = interval
+        self.threshold = threshold
+        # Request label ("METHOD /path") per task currently serving a request
+        self.requests: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self.stalls: deque = deque(maxlen=RECENT_STALLS)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._last_beat = 0.0
+        self._beats = 0
+        self._reported_beat = -1
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None
+
+    def start(self):
+        """Start monitoring the running loop (call from inside it)"""
+        if self._heartbeat is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat = self._loop.create_task(self._beat(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.threshold * 2)
+            self._watchdog = None
+
+    def track(self, label: str) -> Optional[asyncio.Task]:
+        """Attribute the current task to a request until untrack()"""
+        task = asyncio.current_task()
+        if task is not None:
+            self.requests[task] = label
+        return task
+
+    def untrack(self, task: Optional[asyncio.Task]):
+        if task is not None:
+            self.requests.pop(task, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'running': self.running,
+            'interval_ms': self.interval * 1000,
+            'threshold_ms': self.threshold * 1000,
+            'last_lag_ms': round(self.last_lag * 1000, 3),
+            'max_lag_ms': round(self.max_lag * 1000, 3),
+            'stalls': list(self.stalls)
+        }
+
+    async def _beat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - due, 0.0)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            EVENT_LOOP_LAG.observe(lag)
+            self._beats += 1
+            self._last_beat = time.monotonic()
+
+    def _watch(self):
+        while not self._stop.wait(self.threshold / 2):
+            blocked = time.monotonic() - self._last_beat - self.interval
+            # Report each stall once, while the loop is still inside it
+            if blocked >= self.threshold and self._reported_beat != self._beats:
+                self._reported_beat = self._beats
+                self._report_stall(blocked)
+
+    def _report_stall(self, blocked: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame)[-STALL_STACK_DEPTH:] if frame is not None else []
+        task = asyncio.current_task(self._loop)
+        request = self.requests.get(task) if task is not None else None
+
+        EVENT_LOOP_STALLS.inc()
+        self.stalls.append({
+            'at': time.time(),
+            'blocked_ms': round(blocked * 1000, 3),
+            'request': request,
+            'stack': [line.rstrip() for line in stack]
+        })
+        logger.warning(
+            "Event loop blocked for %.0f ms by %s\n%s",
+            blocked * 1000, request or "<no request>", "".join(stack)
+        )
+
+loop_monitor = LoopMonitor(
+    interval=settings.loop_lag_interval_ms / 1000,
+    threshold=settings.loop_stall_threshold_ms / 1000
+)
@@ -0,0 +1,230 @@
+import gc
+import os
+import random
+import secrets
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+import logging
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Allocation noise from the tracer itself and the import system
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>")
+)
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux only)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def format_stat(stat) -> Dict[str, Any]:
+    """Render a tracemalloc Statistic or StatisticDiff as a dict"""
+    entry = {
+        'site': [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        'size_kb': round(stat.size / 1024, 3),
+        'count': stat.count
+    }
+    if isinstance(stat, tracemalloc.StatisticDiff):
+        entry['size_diff_kb'] = round(stat.size_diff / 1024, 3)
+        entry['count_diff'] = stat.count_diff
+    return entry
+
+def object_counts(limit: int = 20) -> List[Dict[str, Any]]:
+    """Live objects tracked by the garbage collector, by type, most common first"""
+    counts = Counter(type(obj).__qualname__ for obj in gc.get_objects())
+    return [{'type': name, 'count': count} for name, count in counts.most_common(limit)]
+
+class MemoryDiagnostics:
+    """
+    tracemalloc snapshots, diffs and per-request peak allocation
+
+    Tracing slows allocation down noticeably, so it is off until started
+    (at startup with ``memory_tracemalloc_enabled`` or from the admin API).
+    Snapshots are kept in memory, oldest evicted first. tracemalloc's peak
+    counter is process-wide, so a sampled request's peak is only measured
+    when it starts with no other request in flight, and only recorded if
+    none started before it finished.
+    """
+
+    def __init__(self, max_snapshots: int = 10, sample_rate: float = 0.01):
+        self.max_snapshots = max(max_snapshots, 1)
+        self.sample_rate = sample_rate
+        self._snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._request_peaks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._measuring = False
+        self._overlapped = False
+        self._overlapped_count = 0
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info(f"tracemalloc started ({frames} frames)")
+
+    def stop(self):
+        """Stop tracing; stored snapshots are kept"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def status(self) -> Dict[str, Any]:
+        status = {
+            'tracing': self.tracing,
+            'rss_bytes': current_rss(),
+            'snapshots': self.list_snapshots(),
+            'request_sample_rate': self.sample_rate
+        }
+        if self.tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            status.update({
+                'traced_current_bytes': current,
+                'traced_peak_bytes': peak,
+                'tracemalloc_overhead_bytes': tracemalloc.get_tracemalloc_memory()
+            })
+        return status
+
+    def take_snapshot(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Snapshot traced allocations
+
+        Returns:
+            dict: Snapshot metadata (id, label, time, totals)
+
+        Raises:
+            RuntimeError: If tracemalloc is not tracing
+        """
+        if not self.tracing:
+            raise RuntimeError("tracemalloc is not tracing")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        stats = snapshot.statistics("filename")
+        meta = {
+            'id': secrets.token_hex(6),
+            'label': label,
+            'taken_at': time.time(),
+            'rss_bytes': current_rss(),
+            'traced_bytes': sum(stat.size for stat in stats),
+            'blocks': sum(stat.count for stat in stats)
+        }
+        with self._lock:
+            self._snapshots[meta['id']] = {'meta': meta, 'snapshot': snapshot}
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return meta
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [entry['meta'] for entry in self._snapshots.values()]
+
+    def _snapshot(self, snapshot_id: str):
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+        if entry is None:
+            raise KeyError(snapshot_id)
+        return entry['snapshot']
+
+    def top(self, snapshot_id: str, group_by: str = "lineno", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Largest allocation sites in a snapshot
+
+        Raises:
+            KeyError: If the snapshot is unknown
+        """
+        stats = self._snapshot(snapshot_id).statistics(group_by)
+        return [format_stat(stat) for stat in stats[:limit]]
+
+    def diff(self, base_id: str, target_id: str, group_by: str = "lineno", limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Allocation sites that grew (or shrank) most between two snapshots
+
+        Raises:
+            KeyError: If either snapshot is unknown
+        """
+        stats = self._snapshot(target_id).compare_to(self._snapshot(base_id), group_by)
+        return [format_stat(stat) for stat in stats[:limit]]
+
+    def begin_request(self) -> Optional[int]:
+        """
+        Count a request as in flight and start measuring it if it is sampled
+
+        Must be paired with ``end_request`` for every request, measured or not.
+
+        Returns:
+            int: Traced bytes at the start, or None if this request is not measured
+        """
+        with self._lock:
+            self._in_flight += 1
+            if self._measuring:
+                # Its allocations land in the measured request's peak
+                self._overlapped = True
+                return None
+            if self._in_flight > 1 or not self.tracing:
+                return None
+            if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+                return None
+            self._measuring = True
+            self._overlapped = False
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+    def end_request(self, route: str, baseline: Optional[int]):
+        """Finish a request, recording the peak allocated above ``baseline`` if it was measured"""
+        peak = 0
+        if baseline is not None and self.tracing:
+            peak = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+
+        with self._lock:
+            self._in_flight -= 1
+            if baseline is None:
+                return
+            self._measuring = False
+            if self._overlapped:
+                self._overlapped_count += 1
+                return
+
+            entry = self._request_peaks.setdefault(route, {'count': 0, 'max_peak_kb': 0.0, 'total_peak_kb': 0.0})
+            peak_kb = peak / 1024
+            entry['count'] += 1
+            entry['last_peak_kb'] = round(peak_kb, 3)
+            entry['max_peak_kb'] = round(max(entry['max_peak_kb'], peak_kb), 3)
+            entry['total_peak_kb'] += peak_kb
+
+    @property
+    def overlapped_requests(self) -> int:
+        """Sampled requests discarded because another request ran alongside them"""
+        with self._lock:
+            return self._overlapped_count
+
+    def request_peaks(self) -> Dict[str, Dict[str, Any]]:
+        """Peak allocation per route over the measured requests"""
+        with self._lock:
+            return {
+                route: {
+                    'count': entry['count'],
+                    'mean_peak_kb': round(entry['total_peak_kb'] / entry['count'], 3),
+                    'max_peak_kb': entry['max_peak_kb'],
+                    'last_peak_kb': entry['last_peak_kb']
+                }
+                for route, entry in sorted(self._request_peaks.items())
+            }
+
+memory_diagnostics = MemoryDiagnostics(
+    max_snapshots=settings.memory_max_snapshots,
+    sample_rate=settings.memory_request_sample_rate
+)
@@ -0,0 +1,163 @@
+import os
+from typing import Any, Dict, List, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+# Fixed latency buckets (seconds), dense around typical API response times
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+# Response size buckets (bytes)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Event loop lag buckets (seconds), from scheduling jitter up to multi-second stalls
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Metric objects register here in single-process mode; with several uvicorn
+# workers (PROMETHEUS_MULTIPROC_DIR set) they write to shared mmap files
+# instead and are aggregated at scrape time.
+registry = CollectorRegistry(auto_describe=True)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route, method and status code",
+    ["method", "route", "status"],
+    registry=registry
+)
+
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and method",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+    registry=registry
+)
+
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+    registry=registry
+)
+
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size by route and method",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+    registry=registry
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the loop monitor's heartbeat was due and when it ran",
+    buckets=LOOP_LAG_BUCKETS,
+    registry=registry
+)
+
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Times the event loop stayed blocked past the stall threshold",
+    registry=registry
+)
+
+def is_multiprocess() -> bool:
+    """Whether metrics are shared across worker processes"""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+def collection_registry() -> CollectorRegistry:
+    """Registry to scrape: every worker's files in multiprocess mode, else this process"""
+    if is_multiprocess():
+        scrape_registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(scrape_registry)
+        return scrape_registry
+    return registry
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in Prometheus text exposition format
+
+    Returns:
+        tuple: (body, content type)
+    """
+    return generate_latest(collection_registry()), CONTENT_TYPE_LATEST
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the shared store on shutdown"""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
+
+def bucket_quantile(quantile: float, buckets: List[Tuple[float, float]]) -> float:
+    """
+    Estimate a quantile from cumulative histogram buckets
+
+    Interpolates linearly inside the bucket holding the target rank, as
+    PromQL's histogram_quantile() does.
+
+    Args:
+        quantile: Quantile between 0 and 1
+        buckets: (upper bound, cumulative count) pairs sorted by bound, ending with +Inf
+
+    Returns:
+        float: Estimated value (the largest finite bound if it falls in +Inf)
+    """
+    total = buckets[-1][1] if buckets else 0
+    if total == 0:
+        return 0.0
+
+    rank = quantile * total
+    lower_bound, lower_count = 0.0, 0.0
+    for upper_bound, count in buckets:
+        if count >= rank:
+            if upper_bound == float("inf"):
+                return lower_bound
+            if count == lower_count:
+                return upper_bound
+            return lower_bound + (upper_bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = upper_bound, count
+    return lower_bound
+
+def latency_summary() -> Dict[str, Any]:
+    """
+    Per-route request counts and latency quantiles derived from the histograms
+
+    Returns:
+        dict: Keyed by "METHOD route", with count, mean and p50/p95/p99 in ms
+    """
+    buckets: Dict[Tuple[str, str], Dict[float, float]] = {}
+    sums: Dict[Tuple[str, str], float] = {}
+
+    for metric in collection_registry().collect():
+        if metric.name != "http_request_duration_seconds":
+            continue
+        for sample in metric.samples:
+            key = (sample.labels.get("method"), sample.labels.get("route"))
+            if sample.name.endswith("_bucket"):
+                bound = float(sample.labels["le"])
+                series = buckets.setdefault(key, {})
+                series[bound] = series.get(bound, 0.0) + sample.value
+            elif sample.name.endswith("_sum"):
+                sums[key] = sums.get(key, 0.0) + sample.value
+
+    summary = {}
+    for (method, route), series in sorted(buckets.items()):
+        cumulative = sorted(series.items())
+        count = cumulative[-1][1]
+        entry = {
+            'count': int(count),
+            'mean_ms': round(sums.get((method, route), 0.0) / count * 1000, 3) if count else 0.0
+        }
+        for quantile in QUANTILES:
+            entry[f"p{int(quantile * 100)}_ms"] = round(bucket_quantile(quantile, cumulative) * 1000, 3)
+        summary[f"{method} {route}"] = entry
+    return summary
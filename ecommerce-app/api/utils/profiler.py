@@ -0,0 +1,299 @@
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import secrets
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+import logging
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sampling", "cprofile")
+
+def collapse_stack(frame) -> str:
+    """Render a frame's stack root-first in collapsed ("folded") format"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+def format_collapsed(stacks: Counter) -> str:
+    """One ``stack count`` line per distinct stack, as flamegraph.pl and speedscope read"""
+    return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+
+class StackSampler:
+    """
+    Sample thread stacks from a background thread via sys._current_frames()
+
+    Sampling costs the profiled code nothing between samples, so it is safe
+    to leave running at a low rate. ``thread_ids`` limits sampling to
+    specific threads (add_thread/remove_thread change the set while
+    running); by default every thread except the sampler is sampled. One
+    sample is taken as soon as sampling starts and a final one in stop(),
+    so even work shorter than the interval shows up.
+    """
+
+    def __init__(self, interval: float, thread_ids: Optional[Iterable[int]] = None):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Take a final sample, stop sampling and return the aggregated stacks"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._sample()
+        return self.snapshot()
+
+    def add_thread(self, thread_id: int):
+        """Start sampling a thread (no-op when every thread is sampled)"""
+        with self._lock:
+            if self.thread_ids is not None:
+                self.thread_ids.add(thread_id)
+
+    def remove_thread(self, thread_id: int):
+        with self._lock:
+            if self.thread_ids is not None:
+                self.thread_ids.discard(thread_id)
+
+    def snapshot(self) -> Counter:
+        with self._lock:
+            return Counter(self.stacks)
+
+    def reset(self):
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+            self.started_at = time.time()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            self._sample(exclude=own_id)
+            if self._stop.wait(self.interval):
+                return
+
+    def _sample(self, exclude: Optional[int] = None):
+        frames = sys._current_frames()
+        with self._lock:
+            self.samples += 1
+            for thread_id, frame in frames.items():
+                if thread_id == exclude or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                self.stacks[collapse_stack(frame)] += 1
+
+# Profile of the request being handled in this context, if any
+active_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+class _SteppedCoroutine:
+    """Drive a coroutine, calling ``resume``/``suspend`` around each step it runs"""
+
+    def __init__(self, coro, resume: Callable[[], None], suspend: Callable[[], None]):
+        self._coro = coro
+        self._resume = resume
+        self._suspend = suspend
+
+    def __await__(self):
+        value, error = None, None
+        while True:
+            self._resume()
+            try:
+                yielded = self._coro.throw(error) if error is not None else self._coro.send(value)
+            except StopIteration as result:
+                return result.value
+            finally:
+                self._suspend()
+            try:
+                value, error = (yield yielded), None
+            except BaseException as exc:
+                value, error = None, exc
+
+class RequestProfile:
+    """
+    Profile of one request, in collapsed-stack (sampling) or pstats text (cProfile) form
+
+    Only the request's own work is recorded: cProfile is enabled, and the
+    event loop thread sampled, just while the request's coroutine is
+    running, not while other requests run on the loop during its awaits.
+    Sampling also covers database executor threads while they run units
+    for the request (see ``run_profiled``).
+    """
+
+    def __init__(self, mode: str, interval: float):
+        self.mode = mode
+        self.interval = interval
+        self.profile_id = secrets.token_hex(8)
+        self._sampler: Optional[StackSampler] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._start = 0.0
+
+    def start(self):
+        self._start = time.perf_counter()
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+        else:
+            self._sampler = StackSampler(self.interval, thread_ids=())
+            self._sampler.start()
+
+    async def run(self, coro: Awaitable) -> Any:
+        """Await the request's coroutine with profiling active only while it runs"""
+        token = active_profile.set(self)
+        try:
+            return await _SteppedCoroutine(coro, self._resume, self._suspend)
+        finally:
+            active_profile.reset(token)
+
+    def add_thread(self):
+        """Sample the calling thread until remove_thread (sampling mode only)"""
+        if self._sampler is not None:
+            self._sampler.add_thread(threading.get_ident())
+
+    def remove_thread(self):
+        if self._sampler is not None:
+            self._sampler.remove_thread(threading.get_ident())
+
+    def _resume(self):
+        if self._profiler is not None:
+            self._profiler.enable()
+        else:
+            self.add_thread()
+
+    def _suspend(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+        else:
+            self.remove_thread()
+
+    def stop(self, label: str) -> Dict[str, Any]:
+        """Stop profiling and build the stored report"""
+        duration = time.perf_counter() - self._start
+        if self._profiler is not None:
+            output = io.StringIO()
+            pstats.Stats(self._profiler, stream=output).sort_stats("cumulative").print_stats(50)
+            report, content_type = output.getvalue(), "text/plain"
+        else:
+            # The final sample includes the request's own thread as it finishes
+            self.add_thread()
+            report, content_type = format_collapsed(self._sampler.stop()), "text/plain"
+
+        return {
+            'id': self.profile_id,
+            'label': label,
+            'mode': self.mode,
+            'duration_ms': round(duration * 1000, 3),
+            'created_at': time.time(),
+            'content_type': content_type,
+            'report': report
+        }
+
+def run_profiled(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Call ``fn``, sampling the calling thread for the active request profile
+
+    Registered as the database executor's ``wrap_call`` at startup, so it
+    runs inside the submitting request's context and a request profile
+    covers the executor threads doing its work.
+    """
+    profile = active_profile.get()
+    if profile is None:
+        return fn(*args, **kwargs)
+    profile.add_thread()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.remove_thread()
+
+class ProfileStore:
+    """Keep the most recent request profiles in memory"""
+
+    def __init__(self, max_reports: int = 20):
+        self.max_reports = max(max_reports, 1)
+        self._reports: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, report: Dict[str, Any]):
+        with self._lock:
+            self._reports[report['id']] = report
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._reports.get(profile_id)
+
+    def list(self) -> list:
+        """Report metadata, newest first"""
+        with self._lock:
+            return [
+                {key: value for key, value in report.items() if key != 'report'}
+                for report in reversed(self._reports.values())
+            ]
+
+class ContinuousProfiler:
+    """Low-rate sampling of every thread, aggregated until reset"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._sampler: Optional[StackSampler] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None
+
+    def start(self):
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = StackSampler(self.interval)
+                self._sampler.start()
+                logger.info(f"Continuous profiling started ({self.interval * 1000:.0f} ms interval)")
+
+    def stop(self):
+        with self._lock:
+            sampler, self._sampler = self._sampler, None
+        if sampler is not None:
+            sampler.stop()
+
+    def report(self, reset: bool = False) -> Dict[str, Any]:
+        """Aggregated collapsed stacks since start (or the last reset)"""
+        sampler = self._sampler
+        if sampler is None:
+            return {'running': False, 'samples': 0, 'since': None, 'report': ""}
+
+        stacks = sampler.snapshot()
+        result = {
+            'running': True,
+            'samples': sampler.samples,
+            'since': sampler.started_at,
+            'report': format_collapsed(stacks)
+        }
+        if reset:
+            sampler.reset()
+        return result
+
+profile_store = ProfileStore(settings.profile_max_reports)
+continuous_profiler = ContinuousProfiler(settings.continuous_profile_interval_ms / 1000)
@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class StatementCache:
+    """
+    LRU cache of prebuilt SQLAlchemy statements keyed on query shape
+
+    A shape is whatever determines the statement's structure (which
+    filters apply, the sort column and direction); the filter values are
+    bind parameters supplied at execution. Reusing the same statement
+    object skips Python-side query construction, and SQLAlchemy's compiled
+    cache then resolves it without recompiling.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max(max_size, 1)
+        self._statements: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._hit_time = 0.0
+        self._miss_time = 0.0
+
+    def get(self, key: Hashable, builder: Callable[[], Any]) -> Tuple[Any, bool, float]:
+        """
+        Get the statement for a shape, building it on first use
+
+        Args:
+            key: Hashable query shape
+            builder: Zero-argument callable producing the statement(s)
+
+        Returns:
+            tuple: (statement, whether it was cached, seconds spent looking it up or building it)
+        """
+        start = time.perf_counter()
+
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is not None:
+                self._statements.move_to_end(key)
+
+        if statement is not None:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._hits += 1
+                self._hit_time += elapsed
+            return statement, True, elapsed
+
+        statement = builder()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._misses += 1
+            self._miss_time += elapsed
+            self._statements[key] = statement
+            self._statements.move_to_end(key)
+            while len(self._statements) > self.max_size:
+                self._statements.popitem(last=False)
+                self._evictions += 1
+
+        logger.debug(f"Built statement for shape {key} in {elapsed * 1000:.3f} ms")
+        return statement, False, elapsed
+
+    def clear(self):
+        """Drop all cached statements"""
+        with self._lock:
+            self._statements.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and average lookup/build time for hits and misses"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._statements),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'build_ms': {
+                    'hit_avg': round(self._hit_time / self._hits * 1000, 4) if self._hits else 0.0,
+                    'miss_avg': round(self._miss_time / self._misses * 1000, 4) if self._misses else 0.0
+                }
+            }
@@ -0,0 +1,287 @@
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import logging
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Longest SQL statement text kept on a db span
+MAX_STATEMENT_LENGTH = 500
+
+class Span:
+    """One timed operation inside a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, trace_id: str, name: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+
+    def end(self):
+        self.end_ns = time.time_ns()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            'attributes': self.attributes
+        }
+
+class Trace:
+    """Spans collected for one sampled request"""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.spans: List[Span] = []
+
+# Trace of the request being served (None when the request is not sampled)
+# and the innermost open span, used as the parent of new spans
+current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+def start_span(name: str, **attributes) -> Optional[Span]:
+    """Open a span under the current one; returns None outside a sampled trace"""
+    trace = current_trace.get()
+    if trace is None:
+        return None
+    parent = current_span.get()
+    new_span = Span(trace.trace_id, name, parent.span_id if parent else None, attributes)
+    trace.spans.append(new_span)
+    return new_span
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Time a block as a child span of the current span (no-op when not sampled)"""
+    new_span = start_span(name, **attributes)
+    if new_span is None:
+        yield None
+        return
+
+    token = current_span.set(new_span)
+    try:
+        yield new_span
+    finally:
+        new_span.end()
+        current_span.reset(token)
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call of a sync or async function as a span"""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__name__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if current_trace.get() is None:
+                    return await fn(*args, **kwargs)
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_trace.get() is None:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def should_sample(traceparent: Optional[str]) -> bool:
+    """Head sampling: honour an upstream W3C sampled flag, else sample at the configured rate"""
+    if traceparent:
+        parts = traceparent.split("-")
+        if len(parts) == 4:
+            # Only bit 0 of trace-flags is "sampled"; other bits may be set
+            try:
+                return bool(int(parts[3], 16) & 0x01)
+            except ValueError:
+                pass
+    return settings.trace_sample_rate > 0 and random.random() < settings.trace_sample_rate
+
+def trace_id_from_traceparent(traceparent: Optional[str]) -> Optional[str]:
+    """Trace id carried by a W3C traceparent header, if valid"""
+    if traceparent:
+        parts = traceparent.split("-")
+        if len(parts) == 4 and len(parts[1]) == 32:
+            return parts[1]
+    return None
+
+class TracedJSONResponse(JSONResponse):
+    """JSONResponse whose body encoding shows up as a span"""
+
+    def render(self, content: Any) -> bytes:
+        if current_trace.get() is None:
+            return super().render(content)
+        with span("response.encode"):
+            return super().render(content)
+
+class JsonlSpanExporter:
+    """Append finished spans to a local JSONL file, one span per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a", encoding="utf-8") as trace_file:
+            for finished in spans:
+                trace_file.write(json.dumps(finished.to_dict(), default=str) + "\n")
+
+class OTLPHttpSpanExporter:
+    """
+    Send spans to an OTLP/HTTP collector using the JSON encoding
+
+    Only the fields a collector needs to build a trace view are sent
+    (ids, name, timestamps, string attributes).
+    """
+
+    def __init__(self, endpoint: str, service_name: str):
+        self.endpoint = endpoint
+        self.service_name = service_name
+
+    def export(self, spans: List[Span]):
+        import httpx
+
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.service_name}}
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "ecommerce-api"},
+                    "spans": [self._encode(finished) for finished in spans]
+                }]
+            }]
+        }
+        httpx.post(self.endpoint, json=payload, timeout=5.0).raise_for_status()
+
+    @staticmethod
+    def _encode(finished: Span) -> Dict[str, Any]:
+        encoded = {
+            "traceId": finished.trace_id,
+            "spanId": finished.span_id,
+            "name": finished.name,
+            "kind": 1,
+            "startTimeUnixNano": str(finished.start_ns),
+            "endTimeUnixNano": str(finished.end_ns or finished.start_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in finished.attributes.items()
+            ]
+        }
+        if finished.parent_id:
+            encoded["parentSpanId"] = finished.parent_id
+        return encoded
+
+class SpanProcessor:
+    """
+    Hand finished traces to an exporter on a background thread
+
+    The request path only enqueues; if the exporter falls behind, traces
+    are dropped rather than buffered without bound.
+    """
+
+    def __init__(self, exporter, max_queue_size: int = 1000):
+        self.exporter = exporter
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(self, spans: List[Span]):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until queued traces have been exported"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stop(self, timeout: float = 5.0):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            spans = self._queue.get()
+            try:
+                if spans is None:
+                    return
+                self.exporter.export(spans)
+            except Exception as e:
+                logger.warning(f"Failed to export trace spans: {e}")
+            finally:
+                self._queue.task_done()
+
+def create_span_processor() -> Optional[SpanProcessor]:
+    """Build the configured exporter pipeline (None when tracing export is off)"""
+    if settings.trace_exporter == "jsonl":
+        return SpanProcessor(JsonlSpanExporter(settings.trace_file))
+    if settings.trace_exporter == "otlp":
+        return SpanProcessor(OTLPHttpSpanExporter(settings.trace_otlp_endpoint, settings.app_name))
+    return None
+
+span_processor = create_span_processor()
+
+@event.listens_for(Engine, "before_cursor_execute")
+def trace_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    db_span = start_span("db.query", statement=statement[:MAX_STATEMENT_LENGTH], executemany=executemany)
+    conn.info.setdefault("trace_spans", []).append(db_span)
+
+@event.listens_for(Engine, "after_cursor_execute")
+def trace_cursor_executed(conn, cursor, statement, parameters, context, executemany):
+    db_span = conn.info["trace_spans"].pop()
+    if db_span is not None:
+        db_span.end()
+
+@event.listens_for(Engine, "handle_error")
+def trace_cursor_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("trace_spans"):
+        db_span = conn.info["trace_spans"].pop()
+        if db_span is not None:
+            db_span.attributes["error"] = str(exception_context.original_exception)
+            db_span.end()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the database session layer
+
+Runs a mix of slow and fast requests concurrently against two copies of the
+same endpoints: one using the synchronous Session inside ``async def``
+routes (the old pattern) and one using the AsyncSession from
+``get_async_db``. With the sync session every slow query blocks the event
+loop, so fast requests queue up behind it; with the async session they
+keep flowing.
+
+Usage:
+    python benchmarks/async_concurrency.py --duration 5 --slow-clients 4 --fast-clients 16
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.results import percentile
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Recursive CTE that keeps SQLite busy for a tunable amount of time
+SLOW_SQL = (
+    "WITH RECURSIVE counter(x) AS ("
+    "SELECT 1 UNION ALL SELECT x + 1 FROM counter WHERE x < :n"
+    ") SELECT count(*) FROM counter"
+)
+FAST_SQL = "SELECT 1"
+
+def build_app(slow_rows: int):
+    """Build a FastAPI app exposing sync- and async-session variants of each endpoint"""
+    from fastapi import FastAPI, Depends
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from database.connection import get_db, get_async_db
+
+    app = FastAPI()
+    slow_statement = text(SLOW_SQL)
+    fast_statement = text(FAST_SQL)
+
+    @app.get("/sync/slow")
+    async def sync_slow(db: Session = Depends(get_db)):
+        return {"count": db.execute(slow_statement, {"n": slow_rows}).scalar()}
+
+    @app.get("/sync/fast")
+    async def sync_fast(db: Session = Depends(get_db)):
+        return {"value": db.execute(fast_statement).scalar()}
+
+    @app.get("/async/slow")
+    async def async_slow(db: AsyncSession = Depends(get_async_db)):
+        return {"count": (await db.execute(slow_statement, {"n": slow_rows})).scalar()}
+
+    @app.get("/async/fast")
+    async def async_fast(db: AsyncSession = Depends(get_async_db)):
+        return {"value": (await db.execute(fast_statement)).scalar()}
+
+    return app
+
+async def run_mode(app, mode: str, duration: float, slow_clients: int, fast_clients: int) -> dict:
+    """Drive one session mode with closed-loop slow and fast clients"""
+    import httpx
+
+    latencies = {"slow": [], "fast": []}
+    errors = {"slow": 0, "fast": 0}
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client, kind: str):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(f"/{mode}/{kind}")
+            if response.status_code == 200:
+                latencies[kind].append(time.perf_counter() - start)
+            else:
+                errors[kind] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[client_loop(client, "slow") for _ in range(slow_clients)],
+            *[client_loop(client, "fast") for _ in range(fast_clients)]
+        )
+        elapsed = time.perf_counter() - started
+
+    result = {"mode": mode, "elapsed_s": round(elapsed, 3)}
+    for kind in ("slow", "fast"):
+        result[kind] = {
+            "requests": len(latencies[kind]),
+            "errors": errors[kind],
+            "throughput_rps": round(len(latencies[kind]) / elapsed, 2),
+            "p50_ms": round(percentile(latencies[kind], 50) * 1000, 2),
+            "p99_ms": round(percentile(latencies[kind], 99) * 1000, 2)
+        }
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database sessions under mixed load")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to run each mode")
+    parser.add_argument("--slow-clients", type=int, default=4, help="Concurrent clients issuing slow queries")
+    parser.add_argument("--fast-clients", type=int, default=16, help="Concurrent clients issuing fast queries")
+    parser.add_argument("--slow-rows", type=int, default=200000, help="Rows generated by each slow query")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Point both engines at a scratch database before they are created
+    scratch_dir = tempfile.mkdtemp(prefix="ecommerce-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch_dir}/bench.db"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+
+    app = build_app(args.slow_rows)
+
+    results = []
+    for mode in ("sync", "async"):
+        logger.info(f"Running {mode} session mode for {args.duration}s...")
+        results.append(asyncio.run(
+            run_mode(app, mode, args.duration, args.slow_clients, args.fast_clients)
+        ))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{'mode':<6} {'kind':<5} {'requests':>9} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for result in results:
+        for kind in ("slow", "fast"):
+            stats = result[kind]
+            print(
+                f"{result['mode']:<6} {kind:<5} {stats['requests']:>9} {stats['throughput_rps']:>9} "
+                f"{stats['p50_ms']:>9} {stats['p99_ms']:>9} {stats['errors']:>7}"
+            )
+
+if __name__ == "__main__":
+    main()
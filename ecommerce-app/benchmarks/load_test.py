@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Load test against a live uvicorn server
+
+Seeds a scratch database with the synthetic catalogue, starts the app under
+uvicorn with N workers and replays a weighted request mix from a scenario
+file (``benchmarks/scenarios/default.json``) with an asyncio httpx client.
+
+Two ways to drive load:
+
+* ``--concurrency C``: closed loop, C clients each sending their next
+  request as soon as the previous one completes.
+* ``--rate R [R ...]``: open loop at a fixed arrival rate. Latency is
+  measured from each request's scheduled start, so a server that falls
+  behind shows queueing delay instead of quietly lowering the offered load.
+  Passing several rates runs a sweep, which is how to find the knee of the
+  latency curve.
+
+Scenario entries have a name, a weight, a path template and optional
+params, each either ``{"range": [lo, hi]}`` (inclusive integers) or
+``{"choices": [...]}``; ``"$rows"`` stands for the seeded row count.
+
+Usage:
+    python benchmarks/load_test.py --rows 100000 --workers 4 --concurrency 64 --duration 30
+    python benchmarks/load_test.py --workers 4 --rate 100 200 400 800 --duration 20 --json
+    python benchmarks/load_test.py --url http://localhost:8000 --concurrency 16
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.results import percentile
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# One INFO line per request would load the client more than the server
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+APP_DIR = Path(__file__).parent.parent
+DEFAULT_SCENARIO = Path(__file__).parent / "scenarios" / "default.json"
+
+class Scenario:
+    """Weighted request mix loaded from a scenario file"""
+
+    def __init__(self, spec: Dict, rows: int, seed: int = 42):
+        self.name = spec.get('name', "scenario")
+        self.requests = spec['requests']
+        self.weights = [entry.get('weight', 1) for entry in self.requests]
+        self.rows = rows
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def load(cls, path: str, rows: int, seed: int = 42) -> "Scenario":
+        with open(path) as scenario_file:
+            return cls(json.load(scenario_file), rows, seed)
+
+    def _value(self, param: Dict):
+        if 'choices' in param:
+            return self.rng.choice(param['choices'])
+        low, high = (self.rows if bound == "$rows" else bound for bound in param['range'])
+        return self.rng.randint(low, high)
+
+    def next_request(self) -> tuple:
+        """Pick a request by weight and fill its path template
+
+        Returns:
+            tuple: (request name, method, path)
+        """
+        entry = self.rng.choices(self.requests, weights=self.weights)[0]
+        values = {
+            name: quote(str(self._value(param)), safe="")
+            for name, param in entry.get('params', {}).items()
+        }
+        return entry['name'], entry.get('method', "GET"), entry['path'].format(**values)
+
+class Recorder:
+    """Latencies and outcomes per request name"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Counter] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, name: str, latency: float, error: Optional[str]):
+        self.latencies.setdefault(name, []).append(latency)
+        if error is not None:
+            self.errors.setdefault(name, Counter())[error] += 1
+
+    def report(self) -> Dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        all_latencies = [latency for values in self.latencies.values() for latency in values]
+        all_errors = sum((errors for errors in self.errors.values()), Counter())
+
+        def summary(latencies: List[float], errors: Counter) -> Dict:
+            count = len(latencies)
+            error_count = sum(errors.values())
+            return {
+                'requests': count,
+                'errors': error_count,
+                'error_rate': round(error_count / count, 5) if count else 0.0,
+                'error_kinds': dict(errors),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+                'p999_ms': round(percentile(latencies, 99.9) * 1000, 3),
+                'max_ms': round(max(latencies) * 1000, 3) if latencies else 0.0
+            }
+
+        overall = summary(all_latencies, all_errors)
+        overall['duration_s'] = round(elapsed, 3)
+        overall['throughput_rps'] = round(len(all_latencies) / elapsed, 2) if elapsed else 0.0
+        overall['by_request'] = {
+            name: summary(latencies, self.errors.get(name, Counter()))
+            for name, latencies in sorted(self.latencies.items())
+        }
+        return overall
+
+async def send(client, scenario: Scenario, recorder: Recorder, scheduled: Optional[float] = None):
+    """Send one scenario request; open-loop latency counts from the scheduled time"""
+    name, method, path = scenario.next_request()
+    start = scheduled if scheduled is not None else time.perf_counter()
+    error = None
+    try:
+        response = await client.request(method, path)
+        if response.status_code >= 400:
+            error = f"HTTP {response.status_code}"
+    except Exception as e:
+        error = type(e).__name__
+    recorder.record(name, time.perf_counter() - start, error)
+
+async def run_closed_loop(client, scenario: Scenario, concurrency: int, duration: float) -> Dict:
+    """``concurrency`` clients each looping request after request"""
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    async def client_loop():
+        while time.perf_counter() < deadline:
+            await send(client, scenario, recorder)
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    recorder.finished = time.perf_counter()
+    result = recorder.report()
+    result.update({'mode': "closed", 'concurrency': concurrency})
+    return result
+
+async def run_open_loop(client, scenario: Scenario, rate: float, duration: float, max_in_flight: int) -> Dict:
+    """Requests started at a fixed arrival rate regardless of how fast the server answers"""
+    recorder = Recorder()
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    in_flight = set()
+    dropped = 0
+    arrivals = 0
+
+    while True:
+        scheduled = start + arrivals * interval
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        arrivals += 1
+
+        if len(in_flight) >= max_in_flight:
+            # Client-side limit reached: count it rather than queueing without bound
+            dropped += 1
+            recorder.record("<client>", time.perf_counter() - scheduled, "client overloaded")
+            continue
+        task = asyncio.create_task(send(client, scenario, recorder, scheduled))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    recorder.finished = time.perf_counter()
+    result = recorder.report()
+    result.update({'mode': "open", 'target_rps': rate, 'client_dropped': dropped})
+    return result
+
+def seed_database(rows: int, seed: int, scratch_dir: str) -> str:
+    """Generate and load a catalogue into a scratch SQLite file; returns its URL"""
+    database_url = f"sqlite:///{scratch_dir}/load.db"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+
+    from database.connection import create_tables
+    from database.seeds.load_csv_data import DataLoader
+    from scripts.generate_products_csv import ProductCSVGenerator
+
+    csv_path = os.path.join(scratch_dir, "products.csv")
+    with open(csv_path, "w", encoding="utf-8", newline="") as output:
+        ProductCSVGenerator(rows=rows, seed=seed).write(output)
+    create_tables()
+    if not DataLoader(csv_path).load_products():
+        raise RuntimeError("Failed to seed the load-test database")
+    os.remove(csv_path)
+    return database_url
+
+def start_server(database_url: str, workers: int, port: int, scratch_dir: str) -> subprocess.Popen:
+    """Start uvicorn serving the app against the seeded database"""
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"),
+        LOG_FILE=f"{scratch_dir}/app.log",
+        TRACE_EXPORTER=os.environ.get("TRACE_EXPORTER", "none")
+    )
+    if workers > 1:
+        # Aggregate /metrics across workers
+        metrics_dir = os.path.join(scratch_dir, "prometheus")
+        os.makedirs(metrics_dir, exist_ok=True)
+        env["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+    command = [
+        sys.executable, "-m", "uvicorn", "api.app:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--no-access-log", "--log-level", "warning"
+    ]
+    return subprocess.Popen(command, cwd=APP_DIR, env=env)
+
+async def wait_until_ready(base_url: str, timeout: float = 60.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health/ready")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout:.0f}s")
+
+async def drive(args, base_url: str) -> List[Dict]:
+    import httpx
+
+    await wait_until_ready(base_url)
+    scenario = Scenario.load(args.scenario, args.rows, args.seed)
+    connections = args.concurrency if args.rate is None else args.max_in_flight
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        if args.warmup > 0:
+            logger.info(f"Warming up for {args.warmup}s...")
+            await run_closed_loop(client, scenario, min(args.concurrency, 8), args.warmup)
+
+        results = []
+        if args.rate is None:
+            logger.info(f"Closed loop: {args.concurrency} clients for {args.duration}s")
+            results.append(await run_closed_loop(client, scenario, args.concurrency, args.duration))
+        else:
+            for rate in args.rate:
+                logger.info(f"Open loop: {rate} req/s for {args.duration}s")
+                results.append(await run_open_loop(client, scenario, rate, args.duration, args.max_in_flight))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API under uvicorn with a weighted scenario")
+    parser.add_argument("--scenario", default=str(DEFAULT_SCENARIO), help="Scenario JSON file")
+    parser.add_argument("--rows", type=int, default=50000, help="Products to seed")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the catalogue and request mix")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="Drive an already running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=32, help="Clients in closed-loop mode")
+    parser.add_argument("--rate", type=float, nargs="+", help="Arrival rate(s) in req/s (open loop; several = sweep)")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open-loop cap on outstanding requests")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Warm-up seconds before measuring")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--save", action="store_true", help="Store the run (with environment metadata) under benchmarks/results/")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        base_url = args.url
+    else:
+        scratch_dir = tempfile.mkdtemp(prefix="ecommerce-load-")
+        logger.info(f"Seeding {args.rows} products...")
+        database_url = seed_database(args.rows, args.seed, scratch_dir)
+        logger.info(f"Starting uvicorn with {args.workers} workers...")
+        server = start_server(database_url, args.workers, args.port, scratch_dir)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        results = asyncio.run(drive(args, base_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    for result in results:
+        result.update({'scenario': Path(args.scenario).stem, 'workers': args.workers, 'rows': args.rows})
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+        logger.info(f"Wrote {len(results)} results to {args.output}")
+
+    if args.save:
+        from benchmarks.results import save_run
+        run_path = save_run("load", results, vars(args))
+        logger.info(f"Stored run as {run_path}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{'load':<14} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'p999 ms':>9} {'errors':>8}")
+    for result in results:
+        load = f"{result['target_rps']} req/s" if result['mode'] == "open" else f"{result['concurrency']} clients"
+        print(
+            f"{load:<14} {result['throughput_rps']:>9} {result['p50_ms']:>9} {result['p99_ms']:>9} "
+            f"{result['p999_ms']:>9} {result['error_rate']:>8.2%}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Benchmark results store and regression comparison
+
+Runs are saved as JSON files under ``benchmarks/results/<suite>/``, each
+wrapping the suite's results with environment metadata (Python, SQLite and
+SQLAlchemy versions, CPU count, platform, git commit). One run per suite
+can be marked as the baseline; ``compare`` diffs a run against it.
+
+For benchmarks with raw samples (``benchmarks/suite.py``) a change is
+flagged only when it is both statistically significant (two-sided
+Mann-Whitney U test, ``--alpha``) and larger than ``--threshold`` relative
+change of the median. Results without samples (``benchmarks/load_test.py``)
+are compared on p99 latency against the threshold alone.
+
+Usage:
+    python benchmarks/suite.py --sizes 10000 --save
+    python benchmarks/results.py baseline suite            # latest run becomes the baseline
+    python benchmarks/suite.py --sizes 10000 --save
+    python benchmarks/results.py compare suite             # latest run vs baseline; exits 1 on regressions
+    python benchmarks/results.py list suite
+"""
+
+import sys
+import os
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import shutil
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RESULTS_DIR = Path(__file__).parent / "results"
+BASELINE_FILE = "baseline.json"
+
+def git_commit() -> Optional[str]:
+    """Current git commit of the checkout, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment_metadata() -> Dict:
+    """Facts about the machine and stack that affect benchmark numbers"""
+    # Only the dialect/driver is recorded: the URL itself can carry credentials
+    database_url = os.environ.get("DATABASE_URL")
+    database_driver = database_url.split("://", 1)[0] if database_url else None
+
+    try:
+        import sqlalchemy
+        sqlalchemy_version = sqlalchemy.__version__
+    except ImportError:
+        sqlalchemy_version = None
+
+    return {
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'sqlite_version': sqlite3.sqlite_version,
+        'sqlalchemy_version': sqlalchemy_version,
+        'cpu_count': multiprocessing.cpu_count(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'database_driver': database_driver,
+        'git_commit': git_commit()
+    }
+
+def suite_dir(suite: str) -> Path:
+    return RESULTS_DIR / suite
+
+def save_run(suite: str, results: List[Dict], args: Optional[Dict] = None) -> Path:
+    """
+    Store one run of a suite with environment metadata
+
+    Args:
+        suite: Suite name (the results subdirectory)
+        results: The suite's result entries
+        args: Command-line arguments used for the run
+
+    Returns:
+        Path: The stored run file
+    """
+    directory = suite_dir(suite)
+    directory.mkdir(parents=True, exist_ok=True)
+    created = time.time()
+    commit = git_commit()
+    run_id = time.strftime("%Y%m%dT%H%M%S", time.gmtime(created)) + (f"-{commit}" if commit else "")
+    run = {
+        'id': run_id,
+        'suite': suite,
+        'created_at': created,
+        'environment': environment_metadata(),
+        'args': args or {},
+        'results': results
+    }
+    path = directory / f"{run_id}.json"
+    with open(path, "w") as run_file:
+        json.dump(run, run_file, indent=2)
+    return path
+
+def list_runs(suite: str) -> List[Path]:
+    """Stored runs of a suite, oldest first"""
+    directory = suite_dir(suite)
+    if not directory.exists():
+        return []
+    return sorted(path for path in directory.glob("*.json") if path.name != BASELINE_FILE)
+
+def load_run(path: Path) -> Dict:
+    with open(path) as run_file:
+        return json.load(run_file)
+
+def resolve_run(suite: str, ref: Optional[str]) -> Path:
+    """A run file from a path, a run id, or None for the latest run"""
+    if ref is None:
+        runs = list_runs(suite)
+        if not runs:
+            raise FileNotFoundError(f"No stored runs for suite '{suite}'")
+        return runs[-1]
+    path = Path(ref)
+    if path.exists():
+        return path
+    path = suite_dir(suite) / f"{ref}.json"
+    if path.exists():
+        return path
+    raise FileNotFoundError(f"No run '{ref}' for suite '{suite}'")
+
+def set_baseline(suite: str, ref: Optional[str] = None) -> Path:
+    """Copy a run (the latest by default) to the suite's baseline"""
+    source = resolve_run(suite, ref)
+    target = suite_dir(suite) / BASELINE_FILE
+    shutil.copyfile(source, target)
+    return target
+
+def mann_whitney_u(baseline: List[float], current: List[float]) -> float:
+    """
+    Two-sided p-value of the Mann-Whitney U test (normal approximation)
+
+    Makes no assumption about the shape of the latency distribution, only
+    that samples are independent. Ties get average ranks and the variance
+    is tie-corrected.
+    """
+    n1, n2 = len(baseline), len(current)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    combined = sorted([(value, 0) for value in baseline] + [(value, 1) for value in current])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = average_rank
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+def median(values: List[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+def result_key(result: Dict) -> Tuple:
+    """Identity of a result across runs"""
+    if 'name' in result:
+        return (result['name'], result.get('size'))
+    # Load-test runs: one entry per load level
+    load = result.get('concurrency') if result.get('mode') == "closed" else result.get('target_rps')
+    return (f"load.{result.get('scenario', 'scenario')}.{result.get('mode')}.{load}", result.get('rows'))
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10, alpha: float = 0.01) -> List[Dict]:
+    """
+    Compare each benchmark of a run against the baseline
+
+    Args:
+        baseline: Baseline run
+        current: Run to check
+        threshold: Minimum relative change of the median (or p99) to report
+        alpha: Significance level for sampled benchmarks
+
+    Returns:
+        list: One entry per benchmark with values, change and verdict
+            ("regression", "improvement", "unchanged", "new" or "missing")
+    """
+    baseline_results = {result_key(result): result for result in baseline['results']}
+    current_results = {result_key(result): result for result in current['results']}
+    comparisons = []
+
+    for key in list(baseline_results) + [key for key in current_results if key not in baseline_results]:
+        before, after = baseline_results.get(key), current_results.get(key)
+        entry = {'benchmark': key[0], 'size': key[1], 'p_value': None}
+        if before is None or after is None:
+            entry['verdict'] = "new" if before is None else "missing"
+            comparisons.append(entry)
+            continue
+
+        if before.get('samples_ms') and after.get('samples_ms'):
+            entry['metric'] = "median_ms"
+            entry['baseline'] = median(before['samples_ms'])
+            entry['current'] = median(after['samples_ms'])
+            entry['p_value'] = mann_whitney_u(before['samples_ms'], after['samples_ms'])
+            significant = entry['p_value'] < alpha
+        else:
+            entry['metric'] = "p99_ms"
+            entry['baseline'] = before.get('p99_ms', 0.0)
+            entry['current'] = after.get('p99_ms', 0.0)
+            significant = True
+
+        change = (entry['current'] - entry['baseline']) / entry['baseline'] if entry['baseline'] else 0.0
+        entry['change'] = change
+        if significant and change > threshold:
+            entry['verdict'] = "regression"
+        elif significant and change < -threshold:
+            entry['verdict'] = "improvement"
+        else:
+            entry['verdict'] = "unchanged"
+        comparisons.append(entry)
+    return comparisons
+
+def environment_differences(baseline: Dict, current: Dict) -> List[str]:
+    """Environment fields that differ between two runs (numbers may not be comparable)"""
+    fields = ('python_version', 'sqlite_version', 'sqlalchemy_version', 'cpu_count', 'machine')
+    before, after = baseline.get('environment', {}), current.get('environment', {})
+    return [
+        f"{field}: {before.get(field)} -> {after.get(field)}"
+        for field in fields if before.get(field) != after.get(field)
+    ]
+
+def print_comparison(comparisons: List[Dict]):
+    print(f"\n{'benchmark':<44} {'size':>8} {'metric':>10} {'baseline':>10} {'current':>10} {'change':>8} {'p':>8}  verdict")
+    for entry in comparisons:
+        if entry['verdict'] in ("new", "missing"):
+            print(f"{entry['benchmark']:<44} {str(entry['size']):>8} {'':>10} {'':>10} {'':>10} {'':>8} {'':>8}  {entry['verdict']}")
+            continue
+        p_value = f"{entry['p_value']:.4f}" if entry['p_value'] is not None else "-"
+        print(
+            f"{entry['benchmark']:<44} {str(entry['size']):>8} {entry['metric']:>10} "
+            f"{entry['baseline']:>10.3f} {entry['current']:>10.3f} {entry['change']:>+8.1%} {p_value:>8}  {entry['verdict']}"
+        )
+
+    verdicts = [entry['verdict'] for entry in comparisons]
+    print(
+        f"\n{verdicts.count('regression')} regressions, {verdicts.count('improvement')} improvements, "
+        f"{verdicts.count('unchanged')} unchanged, {verdicts.count('new')} new, {verdicts.count('missing')} missing"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage stored benchmark runs and detect regressions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List stored runs of a suite")
+    list_parser.add_argument("suite")
+
+    save_parser = commands.add_parser("save", help="Store a results JSON file as a run")
+    save_parser.add_argument("suite")
+    save_parser.add_argument("results", help="JSON list of results written with --output")
+
+    baseline_parser = commands.add_parser("baseline", help="Mark a run as the suite's baseline")
+    baseline_parser.add_argument("suite")
+    baseline_parser.add_argument("run", nargs="?", help="Run id or file (default: latest)")
+
+    compare_parser = commands.add_parser("compare", help="Compare a run against the baseline")
+    compare_parser.add_argument("suite")
+    compare_parser.add_argument("run", nargs="?", help="Run id or file (default: latest)")
+    compare_parser.add_argument("--baseline", help="Baseline run id or file (default: the stored baseline)")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Relative change to flag (0.10 = 10%%)")
+    compare_parser.add_argument("--alpha", type=float, default=0.01, help="Significance level for sampled benchmarks")
+    compare_parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "list":
+        baseline_path = suite_dir(args.suite) / BASELINE_FILE
+        baseline_id = load_run(baseline_path)['id'] if baseline_path.exists() else None
+        for path in list_runs(args.suite):
+            run = load_run(path)
+            environment = run['environment']
+            marker = "*" if run['id'] == baseline_id else " "
+            print(
+                f"{marker} {run['id']:<28} {len(run['results']):>4} results  "
+                f"python {environment['python_version']}  sqlite {environment['sqlite_version']}  "
+                f"{environment['cpu_count']} CPUs"
+            )
+        return
+
+    if args.command == "save":
+        with open(args.results) as results_file:
+            print(save_run(args.suite, json.load(results_file)))
+        return
+
+    if args.command == "baseline":
+        print(set_baseline(args.suite, args.run))
+        return
+
+    baseline_path = resolve_run(args.suite, args.baseline) if args.baseline else suite_dir(args.suite) / BASELINE_FILE
+    if not baseline_path.exists():
+        parser.error(f"No baseline for suite '{args.suite}'; set one with: baseline {args.suite}")
+    baseline = load_run(baseline_path)
+    current = load_run(resolve_run(args.suite, args.run))
+    comparisons = compare_results(baseline, current, args.threshold, args.alpha)
+
+    if args.json:
+        print(json.dumps({'baseline': baseline['id'], 'current': current['id'], 'comparisons': comparisons}, indent=2))
+    else:
+        print(f"Baseline {baseline['id']} vs {current['id']}")
+        for difference in environment_differences(baseline, current):
+            print(f"  warning: environment differs, {difference}")
+        print_comparison(comparisons)
+
+    if any(entry['verdict'] == "regression" for entry in comparisons):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
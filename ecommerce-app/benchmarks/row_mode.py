@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+ORM hydration vs plain-row benchmark for the product listing
+
+Fetches the same listing page through the two paths the products endpoint
+supports: ``select(Product)`` with the department eagerly joined and
+``build_product_response`` (ORM mode), and the column select mapped by
+``build_product_row_response`` (row mode). Both time query execution plus
+building the response dicts, on a scratch SQLite database.
+
+Usage:
+    python benchmarks/row_mode.py --products 5000 --page-sizes 100 1000 --iterations 50
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.results import percentile
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def seed_products(count: int, departments: int = 10):
+    """Insert departments and products into the scratch database"""
+    from database.connection import SessionLocal, create_tables
+    from database.models import Department, Product
+
+    create_tables()
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        department_ids = []
+        for index in range(departments):
+            department = Department(name=f"Department {index}", description="Benchmark department")
+            db.add(department)
+            db.flush()
+            department_ids.append(department.id)
+
+        now = datetime.utcnow()
+        db.bulk_insert_mappings(Product, [
+            {
+                'product_id': f"BENCH{index:08d}",
+                'product_name': f"Benchmark product {index}",
+                'category': f"Category {index % 25}",
+                'sub_category': f"Sub category {index % 100}",
+                'brand': f"Brand {index % 200}",
+                'sale_price': Decimal(rng.randint(100, 50000)) / 100,
+                'market_price': Decimal(rng.randint(50000, 80000)) / 100,
+                'type': "Benchmark",
+                'rating': round(rng.uniform(1, 5), 1),
+                'description': "Benchmark product description " * 4,
+                'department_id': rng.choice(department_ids),
+                'created_at': now,
+                'updated_at': now
+            }
+            for index in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+async def run_mode(row_mode: bool, page_size: int, iterations: int) -> dict:
+    """Time fetching and formatting one listing page repeatedly"""
+    from database.connection import AsyncSessionLocal
+    from api.utils.helpers import (
+        build_product_list_statements,
+        build_product_response,
+        build_product_row_response
+    )
+
+    statement, _ = build_product_list_statements((), 'created_at', 'desc', row_mode=row_mode)
+    statement = statement.limit(page_size)
+    timings = []
+
+    async with AsyncSessionLocal() as db:
+        for iteration in range(iterations + 1):
+            start = time.perf_counter()
+            result = await db.execute(statement)
+            if row_mode:
+                products = [build_product_row_response(row) for row in result.all()]
+            else:
+                products = [build_product_response(product) for product in result.scalars().all()]
+            elapsed = time.perf_counter() - start
+
+            # Fresh identity map each round, as with a per-request session
+            db.expunge_all()
+            if iteration:  # first round warms the statement cache
+                timings.append(elapsed)
+
+    return {
+        'mode': "row" if row_mode else "orm",
+        'page_size': page_size,
+        'rows': len(products),
+        'iterations': iterations,
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'p50_ms': round(percentile(timings, 50) * 1000, 3),
+        'p99_ms': round(percentile(timings, 99) * 1000, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ORM vs row mode for product listing pages")
+    parser.add_argument("--products", type=int, default=5000, help="Products to seed")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000], help="Page sizes to fetch")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed fetches per mode and page size")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Point the engines at a scratch database before they are created
+    scratch_dir = tempfile.mkdtemp(prefix="ecommerce-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch_dir}/bench.db"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+
+    logger.info(f"Seeding {args.products} products...")
+    seed_products(args.products)
+
+    results = []
+    for page_size in args.page_sizes:
+        for row_mode in (False, True):
+            results.append(asyncio.run(run_mode(row_mode, page_size, args.iterations)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{'mode':<5} {'page':>6} {'rows':>6} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for result in results:
+        print(
+            f"{result['mode']:<5} {result['page_size']:>6} {result['rows']:>6} "
+            f"{result['mean_ms']:>9} {result['p50_ms']:>9} {result['p99_ms']:>9}"
+        )
+
+if __name__ == "__main__":
+    main()
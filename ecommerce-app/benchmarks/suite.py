@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the API endpoints and helper hot paths
+
+For each database size, a synthetic catalogue is generated with
+``scripts/generate_products_csv.py`` and loaded through
+``DataLoader.load_products`` (itself the first benchmark). The endpoints are
+then driven in-process through the ASGI app, so routing, validation,
+middleware and serialization are all included; the helpers are timed
+directly. Each benchmark reports ops/s and latency percentiles.
+
+Usage:
+    python benchmarks/suite.py --sizes 1000 10000 --iterations 100 --output results.json
+    python benchmarks/suite.py --sizes 5000 --filter products.search --json
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.results import percentile
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+# The app lowers the root level to LOG_LEVEL on import; keep progress visible
+logger.setLevel(logging.INFO)
+
+def summarize(name: str, size: int, timings: List[float], **extra) -> Dict:
+    """Ops/s and latency percentiles for one benchmark; raw samples kept for comparisons"""
+    total = sum(timings)
+    result = {
+        'name': name,
+        'size': size,
+        'iterations': len(timings),
+        'ops_per_sec': round(len(timings) / total, 3) if total else 0.0,
+        'mean_ms': round(total / len(timings) * 1000, 3),
+        'p50_ms': round(percentile(timings, 50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 99) * 1000, 3),
+        'samples_ms': [round(timing * 1000, 4) for timing in timings]
+    }
+    result.update(extra)
+    return result
+
+def product_cases(size: int, per_page: int, top_brand: str) -> Dict[str, str]:
+    """Listing URLs covering filters, search, sort and page depth"""
+    last_page = max(1, math.ceil(size / per_page))
+    base = "/api/v1/products/"
+    cases = {
+        'products.default': f"{base}?per_page={per_page}",
+        'products.search': f"{base}?per_page={per_page}&search=Rice",
+        'products.category': f"{base}?per_page={per_page}&category=Beverages",
+        'products.brand_price': f"{base}?per_page={per_page}&brand={top_brand}&min_price=50&max_price=500",
+        'products.rating': f"{base}?per_page={per_page}&min_rating=4",
+        'products.department': f"{base}?per_page={per_page}&department_id=1",
+        'products.sort_price_asc': f"{base}?per_page={per_page}&sort_by=sale_price&sort_order=asc",
+        'products.sort_rating_desc': f"{base}?per_page={per_page}&sort_by=rating&sort_order=desc",
+        'products.search_sorted_filtered': (
+            f"{base}?per_page={per_page}&search=Organic&category=Beauty%20%26%20Hygiene&sort_by=sale_price"
+        ),
+        'products.detail': f"{base}1",
+        'products.categories': f"{base}categories/list",
+        'products.brands': f"{base}brands/list",
+        'products.stats': f"{base}stats/summary"
+    }
+    for depth in (10, 100):
+        if depth < last_page:
+            cases[f'products.page_{depth}'] = f"{base}?per_page={per_page}&page={depth}"
+    cases['products.page_last'] = f"{base}?per_page={per_page}&page={last_page}"
+    return cases
+
+def department_cases(per_page: int) -> Dict[str, str]:
+    base = "/api/v1/departments/"
+    return {
+        'departments.list': f"{base}?per_page={per_page}",
+        'departments.detail': f"{base}1",
+        'departments.products': f"{base}1/products?per_page={per_page}",
+        'departments.stats': f"{base}stats/summary"
+    }
+
+def seed_database(size: int, seed: int, scratch_dir: str) -> Dict:
+    """Generate a catalogue of ``size`` rows and time loading it with DataLoader"""
+    from database.connection import create_tables, drop_tables
+    from database.seeds.load_csv_data import DataLoader
+    from scripts.generate_products_csv import ProductCSVGenerator
+
+    csv_path = os.path.join(scratch_dir, f"products_{size}.csv")
+    with open(csv_path, "w", encoding="utf-8", newline="") as output:
+        ProductCSVGenerator(rows=size, seed=seed).write(output)
+
+    drop_tables()
+    create_tables()
+    loader = DataLoader(csv_path)
+    start = time.perf_counter()
+    if not loader.load_products():
+        raise RuntimeError(f"DataLoader failed to load {csv_path}")
+    elapsed = time.perf_counter() - start
+    os.remove(csv_path)
+    return summarize('loader.load_products', size, [elapsed], rows_per_sec=round(size / elapsed, 1),
+                     stages=loader.report.stages)
+
+async def time_requests(client, url: str, iterations: int, warmup: int) -> List[float]:
+    """Time sequential GETs of one URL"""
+    for _ in range(warmup):
+        response = await client.get(url)
+        response.raise_for_status()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = await client.get(url)
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return timings
+
+async def run_endpoints(cases: Dict[str, str], size: int, iterations: int, warmup: int) -> List[Dict]:
+    """Drive each endpoint in-process through the ASGI app"""
+    import httpx
+    from api.app import app
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, url in cases.items():
+            timings = await time_requests(client, url, iterations, warmup)
+            results.append(summarize(name, size, timings, url=url))
+            logger.info(f"{name}: {results[-1]['p50_ms']} ms p50")
+    return results
+
+def time_call(fn: Callable, iterations: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def run_helpers(size: int, iterations: int, warmup: int, per_page: int) -> List[Dict]:
+    """Time calculate_product_stats and build_product_response directly"""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+    from database.connection import SessionLocal
+    from database.models import Product
+    from api.utils.helpers import build_product_response, calculate_product_stats
+
+    results = []
+    db = SessionLocal()
+    try:
+        timings = time_call(lambda: calculate_product_stats(db), iterations, warmup)
+        results.append(summarize('helpers.calculate_product_stats', size, timings))
+
+        products = db.execute(
+            select(Product).options(selectinload(Product.department)).limit(per_page)
+        ).scalars().all()
+        timings = time_call(lambda: [build_product_response(product) for product in products], iterations, warmup)
+        results.append(summarize('helpers.build_product_response', size, timings, batch=len(products)))
+    finally:
+        db.close()
+    return results
+
+def run_suite(sizes: List[int], iterations: int, warmup: int, per_page: int, seed: int,
+              name_filter: Optional[str], scratch_dir: str) -> List[Dict]:
+    from scripts.generate_products_csv import brand_names
+
+    # The generator's most popular brand, so the brand filter matches many rows
+    top_brand = brand_names(1, seed)[0]
+    results = []
+
+    def wanted(name: str) -> bool:
+        return name_filter is None or name_filter in name
+
+    for size in sizes:
+        logger.info(f"Seeding {size} products...")
+        load_result = seed_database(size, seed, scratch_dir)
+        if wanted(load_result['name']):
+            results.append(load_result)
+
+        cases = {**product_cases(size, per_page, top_brand), **department_cases(per_page)}
+        cases = {name: url for name, url in cases.items() if wanted(name)}
+        results.extend(asyncio.run(run_endpoints(cases, size, iterations, warmup)))
+
+        results.extend(
+            result for result in run_helpers(size, iterations, warmup, per_page) if wanted(result['name'])
+        )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints and helper hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Catalogue sizes to seed")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed runs per benchmark")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed runs before each benchmark")
+    parser.add_argument("--per-page", type=int, default=20, help="Listing page size")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the generated catalogue")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--save", action="store_true", help="Store the run (with environment metadata) under benchmarks/results/")
+    args = parser.parse_args()
+
+    # Point the engines at a scratch database before they are created, and
+    # keep request logging from dominating the timings
+    scratch_dir = tempfile.mkdtemp(prefix="ecommerce-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch_dir}/bench.db"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("LOG_FILE", f"{scratch_dir}/app.log")
+    os.environ.setdefault("TRACE_EXPORTER", "none")
+
+    results = run_suite(args.sizes, args.iterations, args.warmup, args.per_page, args.seed,
+                        args.filter, scratch_dir)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+        logger.info(f"Wrote {len(results)} results to {args.output}")
+
+    if args.save:
+        from benchmarks.results import save_run
+        run_path = save_run("suite", results, vars(args))
+        logger.info(f"Stored run as {run_path}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{'benchmark':<38} {'size':>8} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for result in results:
+        print(
+            f"{result['name']:<38} {result['size']:>8} {result['ops_per_sec']:>10} "
+            f"{result['p50_ms']:>9} {result['p95_ms']:>9} {result['p99_ms']:>9}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 """
 Database package for e-commerce application
 """
-from .connection import get_db, engine
+from .connection import get_db, get_async_db, engine, async_engine
 from .models import Base, Product, Department
+from .replicas import get_async_read_db
 
-__all__ = ["get_db", "engine", "Base", "Product", "Department"]
+__all__ = ["get_db", "get_async_db", "get_async_read_db", "engine", "async_engine", "Base", "Product", "Department"]
@@ -1,33 +1,158 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 import os
-from typing import Generator
+from typing import Generator, AsyncGenerator
 from dotenv import load_dotenv
 
+from api.config import settings
+from database.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine
+)
+
 load_dotenv()
 
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ecommerce.db")
 
+def is_sqlite_memory_url(database_url: str) -> bool:
+    """Whether a SQLite URL points at an in-memory database"""
+    path = database_url.split("://", 1)[-1].lstrip("/")
+    return path in ("", ":memory:") or "mode=memory" in database_url
+
+def use_sqlite_production_profile(database_url: str) -> bool:
+    """Whether the production SQLite profile applies to a URL"""
+    return (
+        database_url.startswith("sqlite")
+        and settings.sqlite_profile == "production"
+        and not is_sqlite_memory_url(database_url)
+    )
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the configured SQLite pragmas to a new connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA temp_store={settings.sqlite_temp_store}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+    finally:
+        cursor.close()
+
+def server_pool_options() -> dict:
+    """Queue pool sizing and connection health options from settings"""
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping
+    }
+
 # Create engine with appropriate settings
-if DATABASE_URL.startswith("sqlite"):
+if use_sqlite_production_profile(DATABASE_URL):
+    # A bounded pool of connections with WAL journaling and tuned pragmas,
+    # so readers don't serialize on a single shared connection
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.sqlite_pool_size,
+        max_overflow=0,
+        pool_timeout=settings.db_pool_timeout,
+        pool_logging_name="primary",
+        echo=os.getenv("DEBUG", "False").lower() == "true"
+    )
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+elif DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
+        pool_logging_name="primary",
         echo=os.getenv("DEBUG", "False").lower() == "true"
     )
 else:
     engine = create_engine(
         DATABASE_URL,
-        pool_size=10,
-        max_overflow=20,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="primary",
+        **server_pool_options(),
         echo=os.getenv("DEBUG", "False").lower() == "true"
     )
+instrument_engine(engine, "primary")
+
+def get_pool_capacity() -> int:
+    """Maximum number of connections the sync engine can hand out at once"""
+    if isinstance(engine.pool, StaticPool):
+        return 1
+    if use_sqlite_production_profile(DATABASE_URL):
+        return settings.sqlite_pool_size
+    return settings.db_pool_size + settings.db_max_overflow
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a database URL onto the matching asyncio driver"""
+    if database_url.startswith("sqlite+aiosqlite") or "+asyncpg" in database_url:
+        return database_url
+    if database_url.startswith("sqlite"):
+        return database_url.replace("sqlite", "sqlite+aiosqlite", 1).replace("+pysqlite", "", 1)
+    if database_url.startswith("postgres"):
+        return "postgresql+asyncpg://" + database_url.split("://", 1)[1]
+    return database_url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", get_async_database_url(DATABASE_URL))
+
+def create_async_engine_for_url(async_database_url: str, pool_name: str = None, **engine_kwargs):
+    """
+    Create an async engine with the same pool/pragma profile as the sync engine
+
+    Args:
+        async_database_url: Database URL using an asyncio driver
+        pool_name: Name to report pool metrics under (not instrumented if omitted)
+        **engine_kwargs: Extra ``create_async_engine`` arguments
+
+    Returns:
+        AsyncEngine: The configured engine
+    """
+    echo = os.getenv("DEBUG", "False").lower() == "true"
+    if pool_name:
+        engine_kwargs.setdefault("pool_logging_name", pool_name)
+    
+    if use_sqlite_production_profile(async_database_url):
+        async_db_engine = create_async_engine(
+            async_database_url,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=settings.sqlite_pool_size,
+            max_overflow=0,
+            echo=echo,
+            **engine_kwargs
+        )
+        event.listen(async_db_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    elif async_database_url.startswith("sqlite"):
+        async_db_engine = create_async_engine(async_database_url, echo=echo, **engine_kwargs)
+    else:
+        async_db_engine = create_async_engine(
+            async_database_url,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            echo=echo,
+            **{**server_pool_options(), **engine_kwargs}
+        )
+    
+    if pool_name:
+        instrument_engine(async_db_engine, pool_name)
+    return async_db_engine
+
+# Async engine used by the API routes so queries don't block the event loop
+async_engine = create_async_engine_for_url(ASYNC_DATABASE_URL, pool_name="primary_async")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 def get_db() -> Generator[Session, None, None]:
@@ -38,6 +163,11 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async database session dependency"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def create_tables():
     """Create all tables"""
     Base.metadata.create_all(bind=engine)
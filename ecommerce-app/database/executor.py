@@ -0,0 +1,136 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from api.config import settings
+from database.connection import get_pool_capacity
+
+logger = logging.getLogger(__name__)
+
+class DatabaseOverloadedError(Exception):
+    """Raised when the database executor has no free worker or queue slot"""
+
+    def __init__(self, retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__("Database executor is saturated")
+
+class DatabaseExecutor:
+    """
+    Bounded thread pool for blocking database work
+
+    At most ``max_workers`` calls run at once and at most ``max_queue_depth``
+    more wait for a worker. Anything beyond that is rejected immediately with
+    DatabaseOverloadedError instead of joining an unbounded queue.
+
+    ``wrap_call``, when set, is called as ``wrap_call(fn, *args, **kwargs)``
+    on the worker thread in place of ``fn`` for work submitted through
+    ``run``, so higher layers (e.g. the request profiler) can hook executor
+    calls without this module importing them.
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int, retry_after: int = 1,
+                 wrap_call: Optional[Callable] = None):
+        self.max_workers = max(max_workers, 1)
+        self.max_queue_depth = max(max_queue_depth, 0)
+        self.retry_after = retry_after
+        self.wrap_call = wrap_call
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="db-worker"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_last = 0.0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit blocking work to the pool
+
+        Raises:
+            DatabaseOverloadedError: If all workers are busy and the queue is full
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue_depth:
+                self._rejected += 1
+                raise DatabaseOverloadedError(self.retry_after)
+            self._pending += 1
+            self._submitted += 1
+
+        try:
+            return self._executor.submit(self._run, time.perf_counter(), fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run blocking work in the pool and await its result"""
+        # Carry the caller's context (e.g. per-request query stats) into the
+        # worker, where wrap_call can see it
+        context = contextvars.copy_context()
+        if self.wrap_call is not None:
+            return await asyncio.wrap_future(self.submit(context.run, self.wrap_call, fn, *args, **kwargs))
+        return await asyncio.wrap_future(self.submit(context.run, fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue and worker gauges"""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                'max_workers': self.max_workers,
+                'max_queue_depth': self.max_queue_depth,
+                'active_workers': self._active,
+                'queued': self._pending - self._active,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'queue_wait_ms': {
+                    'last': round(self._wait_last * 1000, 3),
+                    'avg': round(self._wait_total / finished * 1000, 3) if finished else 0.0,
+                    'max': round(self._wait_max * 1000, 3)
+                }
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and release the worker threads"""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, submitted_at: float, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        wait = time.perf_counter() - submitted_at
+        with self._lock:
+            self._active += 1
+            self._wait_last = wait
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+        succeeded = False
+        try:
+            result = fn(*args, **kwargs)
+            succeeded = True
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._pending -= 1
+                if succeeded:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+db_executor = DatabaseExecutor(
+    max_workers=settings.db_executor_workers or get_pool_capacity(),
+    max_queue_depth=settings.db_executor_queue_depth,
+    retry_after=settings.db_executor_retry_after
+)
@@ -3,6 +3,12 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .connection import Base
 
+def product_discount_percentage(market_price, sale_price):
+    """Discount percentage from raw column values, for ORM instances and plain rows alike"""
+    if market_price and sale_price and market_price > 0:
+        return round(((market_price - sale_price) / market_price) * 100, 2)
+    return 0
+
 class Department(Base):
     __tablename__ = "departments"
     
@@ -52,6 +58,4 @@ class Product(Base):
     @property
     def discount_percentage(self):
         """Calculate discount percentage"""
-        if self.market_price and self.sale_price and self.market_price > 0:
-            return round(((self.market_price - self.sale_price) / self.market_price) * 100, 2)
-        return 0
+        return product_discount_percentage(self.market_price, self.sale_price)
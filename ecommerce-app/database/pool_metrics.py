@@ -0,0 +1,139 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class PoolMetrics:
+    """
+    Connection pool counters and gauges for one engine
+
+    Fed by SQLAlchemy pool events (connect/close/invalidate for churn,
+    checkout/checkin for usage) and by the instrumented pool classes
+    below, which time how long each checkout waited for a connection.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def attach(self, engine):
+        """Listen to pool events on an engine (sync or async)"""
+        sync_engine = getattr(engine, "sync_engine", engine)
+        self.pool = sync_engine.pool
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine.pool, "close", self._on_close)
+        event.listen(sync_engine.pool, "close_detached", self._on_close)
+        event.listen(sync_engine.pool, "invalidate", self._on_invalidate)
+        event.listen(sync_engine.pool, "soft_invalidate", self._on_invalidate)
+        event.listen(sync_engine.pool, "checkout", self._on_checkout)
+        event.listen(sync_engine.pool, "checkin", self._on_checkin)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current pool gauges and cumulative counters"""
+        with self._lock:
+            data = {
+                'pool_class': type(self.pool).__name__ if self.pool is not None else None,
+                'checked_out': self.checked_out,
+                'peak_checked_out': self.peak_checked_out,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'connects': self.connects,
+                'closes': self.closes,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'checkout_wait_ms': {
+                    'avg': round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                    'max': round(self.wait_max * 1000, 3),
+                    'total': round(self.wait_total * 1000, 3)
+                }
+            }
+
+        if isinstance(self.pool, QueuePool):
+            data['size'] = self.pool.size()
+            data['overflow'] = max(self.pool.overflow(), 0)
+            data['max_overflow'] = self.pool._max_overflow
+            capacity = self.pool.size() + max(self.pool._max_overflow, 0)
+            data['saturation'] = round(self.pool.checkedout() / capacity, 3) if capacity > 0 else 0.0
+        return data
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_close(self, dbapi_connection, *args):
+        with self._lock:
+            self.closes += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(self.checked_out - 1, 0)
+
+# Metrics per engine, keyed by the engine's pool logging name
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """Register pool metrics for an engine under ``name``"""
+    metrics = PoolMetrics(name)
+    metrics.attach(engine)
+    pool_metrics[name] = metrics
+    return metrics
+
+class _TimedCheckoutMixin:
+    """Times each connection checkout; the pool's logging name selects the metrics"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            metrics = pool_metrics.get(self.logging_name)
+            if metrics is not None:
+                metrics.record_wait(time.perf_counter() - start, timed_out)
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that records checkout wait time"""
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time"""
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every instrumented pool"""
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
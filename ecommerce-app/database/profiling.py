@@ -0,0 +1,152 @@
+import contextvars
+import time
+from typing import Any, List, Optional
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT
+
+from api.config import settings
+
+logger = logging.getLogger(__name__)
+
+class QueryBudgetExceededError(Exception):
+    """Raised when a request runs more SQL statements than the configured budget"""
+
+    def __init__(self, label: str, count: int, budget: int):
+        self.label = label
+        self.count = count
+        self.budget = budget
+        super().__init__(f"{label} ran {count} SQL statements (budget {budget})")
+
+class QueryStats:
+    """Statements executed and time spent in the database for one unit of work"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.duration = 0.0
+        self.compiled = 0
+        self.compile_cache_hits = 0
+        self.compile_duration = 0.0
+
+    def record(self, elapsed: float):
+        self.count += 1
+        self.duration += elapsed
+
+    def record_compile(self, elapsed: float, cache_hit: bool):
+        """
+        Record the time from ``Connection.execute`` to the cursor call
+
+        That span covers the cache key, the compiled-cache lookup,
+        compilation on a miss and bind parameter processing.
+        """
+        self.compiled += 1
+        self.compile_cache_hits += int(cache_hit)
+        self.compile_duration += elapsed
+
+    def server_timing(self) -> str:
+        """Value for a ``Server-Timing`` header entry"""
+        return (
+            f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries", '
+            f'sqlcompile;dur={self.compile_duration * 1000:.2f};'
+            f'desc="{self.compiled - self.compile_cache_hits} compiled, {self.compile_cache_hits} cached"'
+        )
+
+# Stats of the request being served; SQLAlchemy's greenlet bridge and
+# DatabaseExecutor.run carry it into the code that executes queries
+current_query_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "current_query_stats", default=None
+)
+
+def start_query_profile(label: str = "") -> contextvars.Token:
+    """Begin counting statements for the current context"""
+    return current_query_stats.set(QueryStats(label))
+
+def finish_query_profile(token: contextvars.Token, check_budget: bool = True) -> Optional[QueryStats]:
+    """
+    Stop counting and enforce the query budget
+
+    Args:
+        token: Token returned by start_query_profile
+        check_budget: Whether to enforce the budget; callers pass False when
+            the unit of work failed, so the original error isn't replaced
+
+    Raises:
+        QueryBudgetExceededError: If over budget and sql_query_budget_mode is "raise"
+    """
+    stats = current_query_stats.get()
+    current_query_stats.reset(token)
+    if stats is not None and check_budget:
+        check_query_budget(stats)
+    return stats
+
+def check_query_budget(stats: QueryStats):
+    """Warn (or raise, in tests) when a unit of work exceeds the query budget"""
+    budget = settings.sql_query_budget
+    if not budget or stats.count <= budget:
+        return
+
+    if settings.sql_query_budget_mode == "raise":
+        raise QueryBudgetExceededError(stats.label, stats.count, budget)
+    logger.warning(f"Query budget exceeded: {stats.label} ran {stats.count} SQL statements (budget {budget})")
+
+def explain_statement(conn, statement: str, parameters: Any) -> Optional[List[str]]:
+    """Query plan for a slow SELECT, run on a separate cursor of the same connection"""
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [" | ".join(str(column) for column in row) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.debug(f"Could not explain slow query: {e}")
+        return None
+    finally:
+        cursor.close()
+
+@event.listens_for(Engine, "before_execute")
+def before_execute(conn, clauseelement, multiparams, params, execution_options):
+    conn.info["compile_start_time"] = time.perf_counter()
+
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    now = time.perf_counter()
+    # Popped so batched inserts, which reach the cursor several times per
+    # execute, only count compilation once
+    compile_start = conn.info.pop("compile_start_time", None)
+    stats = current_query_stats.get()
+    if stats is not None and compile_start is not None and context.compiled is not None:
+        stats.record_compile(now - compile_start, context.cache_hit is CACHE_HIT)
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(elapsed)
+
+    if elapsed * 1000 >= settings.sql_slow_query_ms:
+        plan = None
+        if settings.sql_explain_slow_queries and not executemany:
+            plan = explain_statement(conn, statement, parameters)
+        logger.warning(
+            "Slow query (%.1f ms): %s%s",
+            elapsed * 1000,
+            statement,
+            "\nQuery plan:\n  " + "\n  ".join(plan) if plan else ""
+        )
+
+@event.listens_for(Engine, "handle_error")
+def handle_error(exception_context):
+    # after_cursor_execute never fires for a failed statement
+    conn = exception_context.connection
+    if conn is not None:
+        conn.info.pop("compile_start_time", None)
+        if conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
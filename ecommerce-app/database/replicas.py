@@ -0,0 +1,130 @@
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
+import logging
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from api.config import settings
+from database.connection import (
+    AsyncSessionLocal,
+    create_async_engine_for_url,
+    get_async_database_url
+)
+
+logger = logging.getLogger(__name__)
+
+# Cookie set on successful writes; while it is valid the client reads from the primary
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+class ReplicaRouter:
+    """
+    Round-robin selection over read replicas with health-based failover
+
+    A replica whose connection attempt fails is skipped for
+    ``retry_interval`` seconds, after which it is tried again.
+    """
+
+    def __init__(self, replica_urls: List[str], retry_interval: float = 30.0):
+        self.retry_interval = retry_interval
+        self.replicas: List[Dict[str, Any]] = []
+        for index, url in enumerate(replica_urls):
+            # pre_ping validates pooled connections so a dead replica fails at checkout
+            replica_engine = create_async_engine_for_url(
+                get_async_database_url(url),
+                pool_name=f"replica_{index}",
+                pool_pre_ping=True
+            )
+            self.replicas.append({
+                'url': url,
+                'engine': replica_engine,
+                'sessionmaker': async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False),
+                'down_until': 0.0,
+                'failures': 0,
+                'served': 0
+            })
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        """Healthy replicas in round-robin order"""
+        if not self.replicas:
+            return []
+
+        now = time.monotonic()
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica['down_until'] <= now]
+
+    def mark_down(self, replica: Dict[str, Any], error: Exception):
+        """Take a replica out of rotation for ``retry_interval`` seconds"""
+        with self._lock:
+            replica['down_until'] = time.monotonic() + self.retry_interval
+            replica['failures'] += 1
+        logger.warning(f"Read replica {self.describe(replica)} unavailable, failing over: {error}")
+
+    def mark_served(self, replica: Dict[str, Any]):
+        with self._lock:
+            replica['served'] += 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-replica health and usage"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'replica': self.describe(replica),
+                    'healthy': replica['down_until'] <= now,
+                    'failures': replica['failures'],
+                    'served': replica['served']
+                }
+                for replica in self.replicas
+            ]
+
+    @staticmethod
+    def describe(replica: Dict[str, Any]) -> str:
+        """Replica URL without credentials"""
+        return replica['engine'].url.render_as_string(hide_password=True)
+
+replica_router = ReplicaRouter(settings.read_replica_urls, settings.replica_retry_interval)
+
+def is_pinned_to_primary(request: Optional[Request]) -> bool:
+    """Whether the client wrote recently and must read its own writes"""
+    if request is None:
+        return False
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency for read-only routes
+
+    Routes to a healthy replica when replicas are configured and the client
+    is not pinned to the primary; otherwise (or if every replica fails)
+    falls back to the primary.
+    """
+    if replica_router.replicas and not is_pinned_to_primary(request):
+        for replica in replica_router.candidates():
+            session = replica['sessionmaker']()
+            try:
+                await session.connection()
+            except Exception as e:
+                await session.close()
+                replica_router.mark_down(replica, e)
+                continue
+
+            replica_router.mark_served(replica)
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,186 @@
+import csv
+import io
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence
+
+import pandas as pd
+from sqlalchemy import Index, Table, insert
+from sqlalchemy.engine import Connection
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Product columns taken from the cleaned DataFrame, in insert order
+PRODUCT_COLUMNS = [
+    'product_id',
+    'product_name',
+    'category',
+    'sub_category',
+    'brand',
+    'sale_price',
+    'market_price',
+    'type',
+    'rating',
+    'description',
+    'department_id'
+]
+
+# Missing values become NULL in these columns and '' in the others
+NULLABLE_COLUMNS = {'sale_price', 'market_price', 'rating', 'department_id'}
+
+# Marker COPY reads as NULL, so empty strings stay empty strings
+COPY_NULL = r"\N"
+
+def build_columns(df: pd.DataFrame, columns: Sequence[str] = PRODUCT_COLUMNS) -> Dict[str, list]:
+    """
+    Build insert column arrays from a DataFrame without iterating its rows
+
+    Args:
+        df: Cleaned DataFrame
+        columns: Columns to take; ones missing from ``df`` are skipped
+
+    Returns:
+        Dict[str, list]: Column name to values, as Python scalars
+    """
+    arrays = {}
+    for column in columns:
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if column == 'department_id':
+            # Mapped ids are floats whenever a category had no department
+            series = series.astype("Int64")
+        values = series.astype(object).to_numpy(copy=True)
+        values[series.isna().to_numpy()] = None if column in NULLABLE_COLUMNS else ''
+        arrays[column] = values.tolist()
+    return arrays
+
+def row_batches(arrays: Dict[str, list], batch_size: int) -> Iterator[List[Dict]]:
+    """Yield executemany parameter lists of at most ``batch_size`` rows"""
+    names = list(arrays)
+    total = len(arrays[names[0]]) if names else 0
+    for start in range(0, total, batch_size):
+        columns = [arrays[name][start:start + batch_size] for name in names]
+        yield [dict(zip(names, row)) for row in zip(*columns)]
+
+def copy_buffer(arrays: Dict[str, list], start: int, stop: int) -> io.StringIO:
+    """CSV rows ``start:stop`` for ``COPY ... WITH (FORMAT csv, NULL '\\N')``"""
+    buffer = io.StringIO()
+    columns = [values[start:stop] for values in arrays.values()]
+    csv.writer(buffer).writerows(
+        [COPY_NULL if value is None else value for value in row] for row in zip(*columns)
+    )
+    buffer.seek(0)
+    return buffer
+
+class IngestReport:
+    """Timing and throughput of each load stage"""
+
+    def __init__(self):
+        self.stages: List[Dict] = []
+
+    @contextmanager
+    def stage(self, name: str, rows: int):
+        start = time.perf_counter()
+        yield
+        self.record(name, rows, time.perf_counter() - start)
+
+    def record(self, name: str, rows: int, seconds: float):
+        rows_per_sec = rows / seconds if seconds > 0 else 0.0
+        self.stages.append({
+            'stage': name,
+            'rows': rows,
+            'seconds': round(seconds, 4),
+            'rows_per_sec': round(rows_per_sec, 1)
+        })
+        logger.info(f"{name}: {rows} rows in {seconds:.3f}s ({rows_per_sec:,.0f} rows/s)")
+
+class BulkIngester:
+    """
+    Load column arrays into a table in large batches
+
+    PostgreSQL (psycopg2) streams each batch with ``COPY ... FROM STDIN``;
+    every other database gets a Core ``insert`` executemany per batch. The
+    load joins the connection's current transaction and leaves committing to
+    the caller.
+    """
+
+    def __init__(self, connection: Connection, table: Table, batch_size: int = 10000,
+                 drop_indexes: bool = False, report: IngestReport = None):
+        """
+        Args:
+            connection: Connection to load through
+            table: Target table
+            batch_size: Rows per executemany call or COPY
+            drop_indexes: Drop the table's non-unique indexes for the load and
+                rebuild them afterwards; unique indexes stay so duplicates
+                are still rejected
+            report: Report to record stages in (a new one if omitted)
+        """
+        self.connection = connection
+        self.table = table
+        self.batch_size = max(batch_size, 1)
+        self.drop_indexes = drop_indexes
+        self.report = report or IngestReport()
+
+    @property
+    def method(self) -> str:
+        dialect = self.connection.dialect
+        if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+            return "copy"
+        return "executemany"
+
+    def ingest(self, arrays: Dict[str, list]) -> int:
+        """
+        Insert the rows and return how many were loaded
+
+        Raises:
+            Exception: Whatever the database raises; the caller rolls back,
+                which also restores any dropped indexes
+        """
+        rows = len(next(iter(arrays.values()), []))
+        if not rows:
+            return 0
+
+        dropped: List[Index] = []
+        if self.drop_indexes:
+            with self.report.stage("drop_indexes", rows):
+                dropped = self._drop_indexes()
+
+        with self.report.stage(self.method, rows):
+            if self.method == "copy":
+                self._copy(arrays, rows)
+            else:
+                self._insert(arrays)
+
+        if dropped:
+            with self.report.stage("rebuild_indexes", rows):
+                for index in dropped:
+                    index.create(bind=self.connection)
+        return rows
+
+    def _drop_indexes(self) -> List[Index]:
+        dropped = [index for index in self.table.indexes if not index.unique]
+        for index in dropped:
+            index.drop(bind=self.connection, checkfirst=True)
+        return dropped
+
+    def _insert(self, arrays: Dict[str, list]):
+        statement = insert(self.table)
+        for batch in row_batches(arrays, self.batch_size):
+            self.connection.execute(statement, batch)
+
+    def _copy(self, arrays: Dict[str, list], rows: int):
+        preparer = self.connection.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(name) for name in arrays)
+        statement = (
+            f"COPY {preparer.format_table(self.table)} ({columns}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+        cursor = self.connection.connection.dbapi_connection.cursor()
+        try:
+            for start in range(0, rows, self.batch_size):
+                cursor.copy_expert(statement, copy_buffer(arrays, start, start + self.batch_size))
+        finally:
+            cursor.close()
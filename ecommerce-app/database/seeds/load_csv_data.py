@@ -1,18 +1,34 @@
 import pandas as pd
 import numpy as np
+import time
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 from database.models import Product, Department
 from database.connection import SessionLocal
+from database.seeds.bulk_ingest import BulkIngester, IngestReport, build_columns, row_batches
 import os
-from typing import Dict, List
+from typing import Dict
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DataLoader:
-    def __init__(self, csv_path: str = "data/products.csv"):
+    def __init__(self, csv_path: str = "data/products.csv", writer=None, drop_indexes: bool = False):
+        """
+        Args:
+            csv_path: Path to the products CSV
+            writer: Optional DatabaseWriter; when given, product batches are
+                submitted as write units instead of committed directly, so
+                in-process loads share the single-writer queue with the API
+            drop_indexes: Drop the products table's non-unique indexes during
+                a direct load and rebuild them afterwards (ignored with a writer,
+                since the API is serving from the table)
+        """
         self.csv_path = csv_path
+        self.writer = writer
+        self.drop_indexes = drop_indexes
+        self.report = IngestReport()
         self.db = SessionLocal()
     
     def analyze_csv(self) -> Dict:
@@ -96,68 +112,59 @@ class DataLoader:
         
         return df
     
-    def load_products(self, batch_size: int = 1000) -> bool:
-        """Load products from CSV in batches"""
+    def load_products(self, batch_size: int = 10000) -> bool:
+        """
+        Load products from CSV in bulk
+
+        Column arrays are built from the DataFrame in one pass and inserted in
+        batches of ``batch_size`` (see BulkIngester). Each stage's rows/sec is
+        logged and kept in ``self.report``.
+        """
         try:
             if not os.path.exists(self.csv_path):
                 logger.error(f"CSV file not found: {self.csv_path}")
                 return False
             
             # Read and analyze CSV
+            start = time.perf_counter()
             df = pd.read_csv(self.csv_path)
+            self.report.record("read_csv", len(df), time.perf_counter() - start)
             logger.info(f"Loading {len(df)} products from CSV")
             
             # Clean and transform data
-            df = self.clean_and_transform_data(df)
+            with self.report.stage("transform", len(df)):
+                df = self.clean_and_transform_data(df)
             
             # Create departments from categories
-            department_mapping = self.create_departments_from_categories(df)
+            with self.report.stage("departments", len(df)):
+                department_mapping = self.create_departments_from_categories(df)
             
             # Add department_id to dataframe
             df['department_id'] = df['category'].map(department_mapping)
             
-            # Column mapping from CSV to database
-            column_mapping = {
-                'product_id': 'product_id',
-                'product_name': 'product_name',
-                'category': 'category',
-                'sub_category': 'sub_category',
-                'brand': 'brand',
-                'sale_price': 'sale_price',
-                'market_price': 'market_price',
-                'type': 'type',
-                'rating': 'rating',
-                'description': 'description',
-                'department_id': 'department_id'
-            }
-            
-            # Prepare data for insertion
-            products_data = []
-            for _, row in df.iterrows():
-                product_data = {}
-                for csv_col, db_col in column_mapping.items():
-                    if csv_col in df.columns:
-                        value = row[csv_col]
-                        # Handle NaN values
-                        if pd.isna(value):
-                            value = None if db_col in ['sale_price', 'market_price', 'rating', 'department_id'] else ''
-                        product_data[db_col] = value
-                
-                products_data.append(product_data)
+            with self.report.stage("build_columns", len(df)):
+                columns = build_columns(df)
             
-            # Insert in batches
-            for i in range(0, len(products_data), batch_size):
-                batch = products_data[i:i + batch_size]
-                
-                # Convert to Product objects
-                products = [Product(**product_data) for product_data in batch]
-                
-                self.db.add_all(products)
-                self.db.commit()
-                
-                logger.info(f"Inserted batch {i//batch_size + 1}/{(len(products_data)-1)//batch_size + 1}")
+            if self.writer is not None:
+                statement = insert(Product.__table__)
+                with self.report.stage("writer_executemany", len(df)):
+                    for batch in row_batches(columns, batch_size):
+                        self.writer.execute(
+                            lambda session, batch=batch: session.execute(statement, batch)
+                        )
+            else:
+                ingester = BulkIngester(
+                    self.db.connection(),
+                    Product.__table__,
+                    batch_size=batch_size,
+                    drop_indexes=self.drop_indexes,
+                    report=self.report
+                )
+                ingester.ingest(columns)
+                with self.report.stage("commit", len(df)):
+                    self.db.commit()
             
-            logger.info(f"Successfully loaded {len(products_data)} products")
+            logger.info(f"Successfully loaded {len(df)} products")
             return True
             
         except Exception as e:
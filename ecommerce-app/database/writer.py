@@ -0,0 +1,254 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+import logging
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.config import settings
+from database.connection import (
+    DATABASE_URL,
+    SessionLocal,
+    apply_sqlite_pragmas,
+    is_sqlite_memory_url,
+    use_sqlite_production_profile
+)
+from database.executor import db_executor, DatabaseOverloadedError
+
+logger = logging.getLogger(__name__)
+
+# A write unit receives the writer's session, performs its changes and
+# returns plain data (not ORM instances) for the waiting caller.
+WriteUnit = Callable[[Session], Any]
+
+def create_writer_engine(database_url: str):
+    """
+    Create the dedicated SQLite engine owned by the writer thread
+
+    pysqlite's implicit transaction handling is disabled so SQLAlchemy
+    controls BEGIN itself; transactions start with BEGIN IMMEDIATE to take
+    the write lock up front, and SAVEPOINTs inside a batch behave correctly.
+    """
+    writer_engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    @event.listens_for(writer_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        if use_sqlite_production_profile(database_url):
+            apply_sqlite_pragmas(dbapi_connection, connection_record)
+
+    @event.listens_for(writer_engine, "begin")
+    def on_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return writer_engine
+
+class DatabaseWriter:
+    """
+    Single-writer queue with group commit
+
+    One background thread owns the write connection. Callers submit write
+    units; the thread drains whatever is queued (up to ``max_batch_size``,
+    waiting at most ``batch_wait`` seconds for stragglers) and runs the
+    batch in one transaction. Each unit gets its own SAVEPOINT, so a failing
+    unit is rolled back and reported to its caller without affecting the
+    rest of the batch, and the whole batch costs a single commit.
+
+    When disabled (non-SQLite or in-memory databases), units run on the
+    database executor with their own session and commit.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None, enabled: bool = True,
+                 max_batch_size: int = 100, batch_wait: float = 0.002, max_queue_size: int = 1000):
+        self.session_factory = session_factory
+        self.enabled = enabled and session_factory is not None
+        self.max_batch_size = max(max_batch_size, 1)
+        self.batch_wait = batch_wait
+        self._queue: "queue.Queue[Optional[Tuple[WriteUnit, Future]]]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._units = 0
+        self._failed_units = 0
+
+    def submit(self, unit: WriteUnit) -> Future:
+        """
+        Queue a write unit for the writer thread
+
+        Raises:
+            DatabaseOverloadedError: If the write queue is full
+        """
+        if not self.enabled:
+            return db_executor.submit(self._run_inline, unit)
+
+        self._ensure_started()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((unit, future))
+        except queue.Full:
+            raise DatabaseOverloadedError(settings.db_executor_retry_after)
+        return future
+
+    async def run(self, unit: WriteUnit) -> Any:
+        """Submit a write unit and await its result"""
+        return await asyncio.wrap_future(self.submit(unit))
+
+    def execute(self, unit: WriteUnit) -> Any:
+        """
+        Run a write unit and block until it is committed
+
+        For callers already off the event loop (e.g. executor jobs). When
+        the queue is disabled the unit runs on the calling thread.
+        """
+        if not self.enabled:
+            return self._run_inline(unit)
+        return self.submit(unit).result()
+
+    def stats(self) -> dict:
+        """Snapshot of writer activity"""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'queued': self._queue.qsize(),
+                'batches': self._batches,
+                'units': self._units,
+                'failed_units': self._failed_units,
+                'average_batch_size': round(self._units / self._batches, 2) if self._batches else 0.0
+            }
+
+    def stop(self, timeout: float = 5.0):
+        """Drain the queue and stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def _run_inline(self, unit: WriteUnit) -> Any:
+        db = SessionLocal()
+        try:
+            result = unit(db)
+            db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _next_batch(self) -> Tuple[List[Tuple[WriteUnit, Future]], bool]:
+        """Block for one unit, then collect more for the group commit"""
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.perf_counter() + self.batch_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _worker(self):
+        session = self.session_factory()
+        try:
+            while True:
+                batch, stopping = self._next_batch()
+                if batch:
+                    self._commit_batch(session, batch)
+                if stopping:
+                    break
+        finally:
+            session.close()
+
+    def _commit_batch(self, session: Session, batch: List[Tuple[WriteUnit, Future]]):
+        succeeded = []
+        failed = 0
+
+        for unit, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            savepoint = session.begin_nested()
+            try:
+                result = unit(session)
+                session.flush()
+                savepoint.commit()
+                succeeded.append((future, result))
+            except Exception as e:
+                savepoint.rollback()
+                future.set_exception(e)
+                failed += 1
+
+        try:
+            session.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(succeeded)} write units failed: {e}")
+            session.rollback()
+            for future, _ in succeeded:
+                future.set_exception(e)
+            failed += len(succeeded)
+            succeeded = []
+
+        # The session outlives the batch; drop its identity map so later
+        # units never see rows cached from an earlier transaction
+        session.expunge_all()
+
+        for future, result in succeeded:
+            future.set_result(result)
+
+        with self._lock:
+            self._batches += 1
+            self._units += len(batch)
+            self._failed_units += failed
+
+def create_db_writer() -> DatabaseWriter:
+    """Build the process-wide writer for the configured database"""
+    enabled = (
+        settings.db_write_queue_enabled
+        and DATABASE_URL.startswith("sqlite")
+        and not is_sqlite_memory_url(DATABASE_URL)
+    )
+    session_factory = None
+    if enabled:
+        session_factory = sessionmaker(
+            bind=create_writer_engine(DATABASE_URL),
+            autoflush=False,
+            expire_on_commit=False
+        )
+
+    return DatabaseWriter(
+        session_factory=session_factory,
+        enabled=enabled,
+        max_batch_size=settings.db_write_batch_size,
+        batch_wait=settings.db_write_batch_wait_ms / 1000,
+        max_queue_size=settings.db_write_queue_size
+    )
+
+db_writer = create_db_writer()
+
+def get_db_writer() -> DatabaseWriter:
+    """Database writer dependency"""
+    return db_writer
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic product CSVs in the DataLoader input schema
+
+Writes ``uniq_id,product_name,category,sub_category,brand,sale_price,
+market_price,type,rating,description`` rows with prices formatted as in the
+source catalogue (``₹1,299.00``). Brand and category popularity follow a
+Zipf distribution, market prices are log-normal with a beta-distributed
+discount, and every optional column can be left empty at a configurable
+rate.
+
+Rows are produced in fixed-size chunks, each from its own generator seeded
+with (seed, chunk index), so memory stays bounded at any row count and the
+same arguments always produce a byte-identical file.
+
+Usage:
+    python scripts/generate_products_csv.py --rows 100000 --output data/products_100k.csv
+    python scripts/generate_products_csv.py --rows 10000000 --brand-skew 1.3 --null-rate 0.05 --output -
+"""
+
+import sys
+import argparse
+import csv
+import hashlib
+import time
+from pathlib import Path
+from typing import Iterator, List, Sequence, TextIO
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    'uniq_id', 'product_name', 'category', 'sub_category', 'brand',
+    'sale_price', 'market_price', 'type', 'rating', 'description'
+]
+
+# Rows generated per chunk. Part of the output's identity: changing it
+# changes every file generated from a given seed.
+CHUNK_ROWS = 10000
+
+CATEGORIES = [
+    "Beauty & Hygiene", "Kitchen, Garden & Pets", "Cleaning & Household",
+    "Gourmet & World Food", "Foodgrains, Oil & Masala", "Snacks & Branded Foods",
+    "Bakery, Cakes & Dairy", "Beverages", "Fruits & Vegetables", "Baby Care",
+    "Eggs, Meat & Fish", "Electronics", "Home & Furniture", "Fashion",
+    "Sports & Fitness", "Books & Stationery", "Toys & Games", "Health & Wellness"
+]
+
+ADJECTIVES = [
+    "Organic", "Premium", "Classic", "Fresh", "Natural", "Instant", "Herbal",
+    "Deluxe", "Ultra", "Smart", "Pure", "Crispy", "Soft", "Compact", "Gentle",
+    "Spicy", "Roasted", "Advanced", "Eco", "Lite"
+]
+
+NOUNS = [
+    "Shampoo", "Soap", "Rice", "Atta", "Oil", "Masala", "Biscuits", "Tea",
+    "Coffee", "Juice", "Cleaner", "Detergent", "Bottle", "Container", "Cookies",
+    "Noodles", "Chips", "Cream", "Lotion", "Toothpaste", "Headphones", "Charger",
+    "Cushion", "Notebook", "Shirt", "Shoes", "Ball", "Puzzle", "Vitamins", "Honey"
+]
+
+SIZES = ["50 g", "100 g", "200 g", "500 g", "1 kg", "5 kg", "100 ml", "250 ml", "500 ml", "1 l", "Pack of 2", "Pack of 6"]
+
+TYPES = [
+    "Hair Care", "Bath & Body", "Rice & Rice Products", "Edible Oils & Ghee",
+    "Spices & Seasoning", "Cookies & Biscuits", "Tea", "Coffee", "Fruit Juices",
+    "All Purpose Cleaners", "Storage & Accessories", "Snacks", "Skin Care",
+    "Oral Care", "Audio", "Mobile Accessories", "Decor", "Stationery", "Menswear", "Supplements"
+]
+
+DESCRIPTION_WORDS = (
+    "made from carefully selected ingredients with no added preservatives and a rich "
+    "natural taste suitable for everyday use in every household this product is "
+    "packed hygienically to retain freshness and quality for longer it is gentle "
+    "durable lightweight easy to use and store offers great value for money and is "
+    "loved by families across the country for its consistent performance"
+).split()
+
+BRAND_SYLLABLES = ["ka", "ro", "mi", "zen", "tro", "vel", "su", "ra", "no", "bi", "lux", "ta", "ve", "org", "dia", "pri"]
+
+def zipf_weights(count: int, skew: float) -> np.ndarray:
+    """Zipf popularity over ``count`` ranks: weight of rank k is 1 / k**skew"""
+    weights = 1.0 / np.arange(1, count + 1, dtype=np.float64) ** skew
+    return weights / weights.sum()
+
+def brand_names(count: int, seed: int) -> List[str]:
+    """Deterministic, pronounceable, unique brand names"""
+    rng = np.random.default_rng([seed, 0xB8A9D])
+    names, seen = [], set()
+    while len(names) < count:
+        syllables = rng.choice(BRAND_SYLLABLES, size=int(rng.integers(2, 4)))
+        name = "".join(syllables).capitalize()
+        if name in seen:
+            name = f"{name} {len(names)}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+def category_names(count: int) -> List[str]:
+    """The catalogue's categories, padded with numbered ones when more are asked for"""
+    return [CATEGORIES[i] if i < len(CATEGORIES) else f"Category {i + 1}" for i in range(count)]
+
+def format_price(value: float) -> str:
+    """Price as written in the source catalogue, e.g. ₹1,299.00"""
+    return f"₹{value:,.2f}"
+
+class ProductCSVGenerator:
+    """
+    Stream synthetic product rows
+
+    Args:
+        rows: Number of rows to generate
+        seed: Seed for all random choices
+        brands: Number of distinct brands
+        categories: Number of distinct categories (departments)
+        sub_categories: Sub-categories per category
+        brand_skew: Zipf exponent for brand popularity (0 = uniform)
+        category_skew: Zipf exponent for category popularity
+        price_median: Median market price in rupees
+        price_sigma: Log-normal sigma of market prices (spread)
+        null_rate: Fraction of empty values in each optional column
+        rating_null_rate: Fraction of unrated products
+        description_words: Mean description length in words (0 = no descriptions)
+    """
+
+    def __init__(self, rows: int, seed: int = 42, brands: int = 2000, categories: int = 11,
+                 sub_categories: int = 8, brand_skew: float = 1.1, category_skew: float = 0.8,
+                 price_median: float = 250.0, price_sigma: float = 1.0, null_rate: float = 0.01,
+                 rating_null_rate: float = 0.3, description_words: int = 40):
+        self.rows = rows
+        self.seed = seed
+        self.null_rate = null_rate
+        self.rating_null_rate = rating_null_rate
+        self.price_median = price_median
+        self.price_sigma = price_sigma
+        self.description_words = description_words
+        self.sub_categories = sub_categories
+
+        self.brands = np.array(brand_names(brands, seed), dtype=object)
+        self.categories = np.array(category_names(categories), dtype=object)
+        self.brand_weights = zipf_weights(brands, brand_skew)
+        self.category_weights = zipf_weights(categories, category_skew)
+        self.words = np.array(DESCRIPTION_WORDS, dtype=object)
+
+    def chunks(self) -> Iterator[List[Sequence[str]]]:
+        """Yield the rows in chunks of at most CHUNK_ROWS"""
+        for chunk_index, start in enumerate(range(0, self.rows, CHUNK_ROWS)):
+            yield self._chunk(chunk_index, start, min(CHUNK_ROWS, self.rows - start))
+
+    def _empty(self, rng: np.random.Generator, size: int, rate: float) -> np.ndarray:
+        return rng.random(size) < rate if rate > 0 else np.zeros(size, dtype=bool)
+
+    def _chunk(self, chunk_index: int, start: int, size: int) -> List[Sequence[str]]:
+        rng = np.random.default_rng([self.seed, chunk_index])
+
+        category_index = rng.choice(len(self.categories), size=size, p=self.category_weights)
+        brand_index = rng.choice(len(self.brands), size=size, p=self.brand_weights)
+        sub_index = rng.integers(0, self.sub_categories, size=size)
+        adjectives = rng.integers(0, len(ADJECTIVES), size=size)
+        nouns = rng.integers(0, len(NOUNS), size=size)
+        sizes = rng.integers(0, len(SIZES), size=size)
+        types = rng.integers(0, len(TYPES), size=size)
+
+        market = np.maximum(np.round(rng.lognormal(np.log(self.price_median), self.price_sigma, size), 2), 5.0)
+        discount = rng.beta(2.0, 8.0, size)
+        sale = np.round(market * (1.0 - discount), 2)
+        ratings = np.round(np.clip(rng.normal(4.0, 0.6, size), 1.0, 5.0), 1)
+
+        if self.description_words > 0:
+            lengths = np.maximum(rng.poisson(self.description_words, size), 1)
+            word_index = rng.integers(0, len(self.words), size=int(lengths.sum()))
+            offsets = np.concatenate(([0], np.cumsum(lengths)))
+        empty_sub = self._empty(rng, size, self.null_rate)
+        empty_brand = self._empty(rng, size, self.null_rate)
+        empty_market = self._empty(rng, size, self.null_rate)
+        empty_type = self._empty(rng, size, self.null_rate)
+        empty_description = self._empty(rng, size, self.null_rate)
+        empty_rating = self._empty(rng, size, self.rating_null_rate)
+
+        rows = []
+        for i in range(size):
+            brand = self.brands[brand_index[i]]
+            category = self.categories[category_index[i]]
+            if self.description_words > 0 and not empty_description[i]:
+                words = self.words[word_index[offsets[i]:offsets[i + 1]]]
+                description = " ".join(words).capitalize() + "."
+            else:
+                description = ""
+            rows.append((
+                hashlib.blake2b(f"{self.seed}:{start + i}".encode(), digest_size=16).hexdigest(),
+                f"{brand} {ADJECTIVES[adjectives[i]]} {NOUNS[nouns[i]]} {SIZES[sizes[i]]}",
+                category,
+                "" if empty_sub[i] else f"{category.split()[0].rstrip(',')} {NOUNS[(category_index[i] + sub_index[i]) % len(NOUNS)]}",
+                "" if empty_brand[i] else brand,
+                format_price(sale[i]),
+                "" if empty_market[i] else format_price(market[i]),
+                "" if empty_type[i] else TYPES[types[i]],
+                "" if empty_rating[i] else f"{ratings[i]:.1f}",
+                description
+            ))
+        return rows
+
+    def write(self, output: TextIO) -> int:
+        """
+        Write the header and all rows as CSV
+
+        Returns:
+            int: Number of rows written
+        """
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        written = 0
+        for chunk in self.chunks():
+            writer.writerows(chunk)
+            written += len(chunk)
+        return written
+
+def main(args) -> bool:
+    generator = ProductCSVGenerator(
+        rows=args.rows,
+        seed=args.seed,
+        brands=args.brands,
+        categories=args.categories,
+        sub_categories=args.sub_categories,
+        brand_skew=args.brand_skew,
+        category_skew=args.category_skew,
+        price_median=args.price_median,
+        price_sigma=args.price_sigma,
+        null_rate=args.null_rate,
+        rating_null_rate=args.rating_null_rate,
+        description_words=args.description_words
+    )
+
+    start = time.perf_counter()
+    if args.output == "-":
+        written = generator.write(sys.stdout)
+    else:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8", newline="") as output:
+            written = generator.write(output)
+    elapsed = time.perf_counter() - start
+
+    logger.info(f"Wrote {written} rows to {args.output} in {elapsed:.1f}s ({written / elapsed:,.0f} rows/s)")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic products CSV for DataLoader")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows to generate")
+    parser.add_argument("--output", default="data/products_generated.csv", help="Output path, or - for stdout")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--brands", type=int, default=2000, help="Distinct brands")
+    parser.add_argument("--categories", type=int, default=11, help="Distinct categories (departments)")
+    parser.add_argument("--sub-categories", type=int, default=8, help="Sub-categories per category")
+    parser.add_argument("--brand-skew", type=float, default=1.1, help="Zipf exponent of brand popularity")
+    parser.add_argument("--category-skew", type=float, default=0.8, help="Zipf exponent of category popularity")
+    parser.add_argument("--price-median", type=float, default=250.0, help="Median market price")
+    parser.add_argument("--price-sigma", type=float, default=1.0, help="Log-normal spread of market prices")
+    parser.add_argument("--null-rate", type=float, default=0.01, help="Empty fraction of each optional column")
+    parser.add_argument("--rating-null-rate", type=float, default=0.3, help="Fraction of unrated products")
+    parser.add_argument("--description-words", type=int, default=40, help="Mean description length in words")
+
+    args = parser.parse_args()
+    if args.rows < 1 or args.brands < 1 or args.categories < 1 or args.sub_categories < 1:
+        parser.error("--rows, --brands, --categories and --sub-categories must be positive")
+
+    if not main(args):
+        sys.exit(1)
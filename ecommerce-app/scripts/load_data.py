@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import sys
-import os
 from pathlib import Path
 
 # Add the parent directory to the path
@@ -16,14 +15,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
+def main(csv_path: str = "data/products.csv", batch_size: int = 10000, drop_indexes: bool = False):
     """Load data from CSV into the database"""
     
     logger.info("🚀 Starting data loading process...")
     
     try:
         # Initialize data loader
-        loader = DataLoader()
+        loader = DataLoader(csv_path, drop_indexes=drop_indexes)
         
         # Analyze CSV structure
         logger.info("📊 Analyzing CSV structure...")
@@ -37,7 +36,7 @@ def main():
         
         # Load products
         logger.info("📦 Loading products from CSV...")
-        success = loader.load_products()
+        success = loader.load_products(batch_size=batch_size)
         
         if not success:
             logger.error("❌ Failed to load products")
@@ -65,14 +64,13 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Load data from CSV into database")
     parser.add_argument("--csv-path", help="Path to CSV file", default="data/products.csv")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows per insert batch")
+    parser.add_argument("--drop-indexes", action="store_true",
+                        help="Drop secondary indexes during the load and rebuild them afterwards")
     
     args = parser.parse_args()
     
-    # Update CSV path if provided
-    if args.csv_path:
-        os.environ["CSV_PATH"] = args.csv_path
-    
-    success = main()
+    success = main(args.csv_path, args.batch_size, args.drop_indexes)
     
     if not success:
         sys.exit(1)
@@ -0,0 +1,199 @@
+"""
+Shared database harness for the test suite
+
+Every test worker (each pytest-xdist process, or the single process when run
+serially) gets its own SQLite database file, created with the schema once per
+session. Each test then runs inside a transaction that is rolled back
+afterwards, so nothing a test writes outlives it.
+
+The worker holds one SQLite connection to its file, shared by a sync engine
+(``get_db`` and ``SessionLocal``, used by the stats loader, the inline writer
+and the CSV loader) and a real ``sqlite+aiosqlite`` engine built with
+``create_async_engine_for_url`` (``get_async_db``/``get_async_read_db``, so
+the read routes run through aiosqlite as in production). Both see the test's
+uncommitted writes because they drive the same connection.
+
+Usage:
+    python -m pytest -q            # serially
+    python -m pytest -q -n auto    # across all cores with pytest-xdist
+"""
+
+import asyncio
+import atexit
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Configure the app for the worker's database before anything creates the
+# engines; per-worker log and trace files keep workers from rotating the
+# same file
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TEST_DIR = tempfile.mkdtemp(prefix=f"ecommerce-test-{WORKER_ID}-")
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DIR}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["DB_WRITE_QUEUE_ENABLED"] = "false"
+os.environ["SQL_QUERY_BUDGET_MODE"] = "raise"
+os.environ["LOG_FILE"] = f"{TEST_DIR}/app.log"
+os.environ["TRACE_FILE"] = f"{TEST_DIR}/traces.jsonl"
+
+import aiosqlite
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from api.app import app
+from api.config import settings
+from database.connection import (
+    SessionLocal,
+    create_async_engine_for_url,
+    create_tables,
+    engine,
+    get_async_db,
+    get_db
+)
+from database.replicas import get_async_read_db
+
+def connect_shared(database_path: str) -> sqlite3.Connection:
+    """
+    The worker's SQLite connection, shared by the sync and async test engines
+
+    pysqlite's own transaction handling defers BEGIN and commits on its own,
+    which breaks SAVEPOINTs; it is switched off so SQLAlchemy emits BEGIN
+    itself and the rolled-back outer transaction really contains every write.
+    """
+    return sqlite3.connect(database_path, check_same_thread=False, isolation_level=None)
+
+def create_test_engine(shared_connection: sqlite3.Connection):
+    """Sync engine for the per-test connections"""
+    test_engine = create_engine(
+        "sqlite://",
+        creator=lambda: shared_connection,
+        poolclass=StaticPool
+    )
+
+    @event.listens_for(test_engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    return test_engine
+
+def create_async_test_engine(shared_connection: sqlite3.Connection):
+    """aiosqlite engine over the same connection, so it joins the test's transaction"""
+    async def connect():
+        return await aiosqlite.Connection(lambda: shared_connection, iter_chunk_size=64)
+
+    return create_async_engine_for_url(f"sqlite+aiosqlite:///{TEST_DIR}/test.db", async_creator=connect)
+
+@pytest.fixture(scope="session")
+def test_engine():
+    """Create the worker's schema once and yield the engines tests connect with"""
+    create_tables()
+    shared_connection = connect_shared(f"{TEST_DIR}/test.db")
+    test_db_engine = create_test_engine(shared_connection)
+    async_test_engine = create_async_test_engine(shared_connection)
+
+    async def open_async_connection():
+        # Check the driver connection into the pool outside any test
+        # transaction; connect listeners set pragmas that refuse to run in one
+        async with async_test_engine.connect():
+            pass
+
+    asyncio.run(open_async_connection())
+    yield test_db_engine, async_test_engine
+    asyncio.run(async_test_engine.dispose())
+    test_db_engine.dispose()
+    engine.dispose()
+
+@pytest.fixture
+def db_connection(test_engine):
+    """Connection holding the test's transaction, rolled back afterwards"""
+    connection = test_engine[0].connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture
+def async_db_connection(test_engine, db_connection):
+    """aiosqlite connection joined to the test's transaction"""
+    connection = asyncio.run(test_engine[1].connect().start())
+    asyncio.run(connection.begin().start())
+    yield connection
+    asyncio.run(connection.rollback())
+    asyncio.run(connection.close())
+
+@pytest.fixture(autouse=True)
+def database(db_connection, async_db_connection):
+    """
+    Run the app's sessions inside the test's transaction
+
+    Request sessions only read (writes go through the DatabaseWriter), so
+    they join the transaction without touching it on close; SessionLocal
+    sessions (the writer's inline units, loaders and test fixtures) each get
+    a SAVEPOINT, so a failed write rolls back only itself.
+    """
+    def request_session(**kwargs) -> Session:
+        return Session(bind=db_connection, join_transaction_mode="rollback_only", autoflush=False)
+
+    def override_get_db():
+        db = request_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSession(
+            bind=async_db_connection,
+            join_transaction_mode="rollback_only",
+            autoflush=False,
+            expire_on_commit=False
+        ) as db:
+            yield db
+
+    session_options = dict(SessionLocal.kw)
+    SessionLocal.configure(bind=db_connection, join_transaction_mode="create_savepoint")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    try:
+        yield db_connection
+    finally:
+        for dependency in (get_db, get_async_db, get_async_read_db):
+            app.dependency_overrides.pop(dependency, None)
+        SessionLocal.kw.clear()
+        SessionLocal.kw.update(session_options)
+
+@pytest.fixture
+def db_session(database):
+    """Session for arranging and checking test data; commits stay in the test's transaction"""
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    """Configure the admin token for the test and return headers presenting it"""
+    monkeypatch.setattr(settings, "admin_token", "test-admin-token")
+    return {"X-Admin-Token": "test-admin-token"}
+
+@pytest.fixture(scope="session")
+def started_client(test_engine):
+    """
+    Test client that has run the startup handlers
+
+    Started once per session: shutdown stops process-wide workers (such as
+    the database executor) that later tests still use.
+    """
+    with TestClient(app) as client:
+        yield client
@@ -1,33 +1,25 @@
 import pytest
 import sys
+import threading
+import time
 from pathlib import Path
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
 # Add the parent directory to the path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from api.app import app
-from database.connection import SessionLocal, create_tables, drop_tables
+from api.routes import departments as departments_routes
+from api.routes.departments import stats_cache, DEPARTMENT_STATS_CACHE_KEY
+from api.utils.cache import StaleWhileRevalidateCache, CACHE_MISS
 from database.models import Product, Department
 from decimal import Decimal
 
 # Create test client
 client = TestClient(app)
 
-@pytest.fixture(scope="module")
-def setup_test_db():
-    """Setup test database"""
-    create_tables()
-    yield
-    drop_tables()
-
-@pytest.fixture
-def db_session():
-    """Create database session for tests"""
-    session = SessionLocal()
-    yield session
-    session.close()
-
 @pytest.fixture
 def sample_departments(db_session):
     """Create sample departments"""
@@ -87,7 +79,7 @@ def departments_with_products(db_session, sample_departments):
 class TestDepartmentsAPI:
     """Test Departments API endpoints"""
     
-    def test_get_departments_empty(self, setup_test_db):
+    def test_get_departments_empty(self):
         """Test getting departments when database is empty"""
         response = client.get("/api/v1/departments/")
         assert response.status_code == 200
@@ -98,7 +90,7 @@ class TestDepartmentsAPI:
         assert data["page"] == 1
         assert data["per_page"] == 20
     
-    def test_get_departments_with_data(self, setup_test_db, sample_departments):
+    def test_get_departments_with_data(self, sample_departments):
         """Test getting departments with data"""
         response = client.get("/api/v1/departments/")
         assert response.status_code == 200
@@ -117,7 +109,7 @@ class TestDepartmentsAPI:
         assert "product_count" in department
         assert "created_at" in department
     
-    def test_get_departments_pagination(self, setup_test_db, sample_departments):
+    def test_get_departments_pagination(self, sample_departments):
         """Test departments pagination"""
         # Get first page with 2 items per page
         response = client.get("/api/v1/departments/?page=1&per_page=2")
@@ -138,7 +130,7 @@ class TestDepartmentsAPI:
         assert len(data["departments"]) == 1
         assert data["page"] == 2
     
-    def test_get_departments_search(self, setup_test_db, sample_departments):
+    def test_get_departments_search(self, sample_departments):
         """Test department search"""
         response = client.get("/api/v1/departments/?search=Electronics")
         assert response.status_code == 200
@@ -148,7 +140,7 @@ class TestDepartmentsAPI:
         assert len(data["departments"]) == 1
         assert "Electronics" in data["departments"][0]["name"]
     
-    def test_get_department_by_id(self, setup_test_db, sample_departments):
+    def test_get_department_by_id(self, sample_departments):
         """Test getting a specific department by ID"""
         department_id = sample_departments[0].id
         response = client.get(f"/api/v1/departments/{department_id}")
@@ -159,15 +151,15 @@ class TestDepartmentsAPI:
         assert data["name"] == "Electronics"
         assert "product_count" in data
     
-    def test_get_department_not_found(self, setup_test_db):
+    def test_get_department_not_found(self):
         """Test getting non-existent department"""
         response = client.get("/api/v1/departments/99999")
         assert response.status_code == 404
         
         data = response.json()
-        assert "not found" in data["detail"].lower()
+        assert "not found" in data["error"].lower()
     
-    def test_get_department_products(self, setup_test_db, departments_with_products):
+    def test_get_department_products(self, departments_with_products):
         """Test getting products in a department"""
         electronics_dept = departments_with_products[0]  # Electronics
         response = client.get(f"/api/v1/departments/{electronics_dept.id}/products")
@@ -184,7 +176,7 @@ class TestDepartmentsAPI:
         assert "product_name" in product
         assert "sale_price" in product
     
-    def test_get_department_products_pagination(self, setup_test_db, departments_with_products):
+    def test_get_department_products_pagination(self, departments_with_products):
         """Test pagination for department products"""
         electronics_dept = departments_with_products[0]
         response = client.get(f"/api/v1/departments/{electronics_dept.id}/products?per_page=1")
@@ -195,12 +187,12 @@ class TestDepartmentsAPI:
         assert len(data["products"]) == 1
         assert data["total_pages"] == 2
     
-    def test_get_department_products_not_found(self, setup_test_db):
+    def test_get_department_products_not_found(self):
         """Test getting products for non-existent department"""
         response = client.get("/api/v1/departments/99999/products")
         assert response.status_code == 404
     
-    def test_create_department(self, setup_test_db):
+    def test_create_department(self):
         """Test creating a new department"""
         department_data = {
             "name": "Sports",
@@ -215,7 +207,7 @@ class TestDepartmentsAPI:
         assert data["description"] == "Sports and outdoor equipment"
         assert data["product_count"] == 0
     
-    def test_create_department_duplicate_name(self, setup_test_db, sample_departments):
+    def test_create_department_duplicate_name(self, sample_departments):
         """Test creating department with duplicate name"""
         department_data = {
             "name": "Electronics",  # Same as existing department
@@ -226,9 +218,9 @@ class TestDepartmentsAPI:
         assert response.status_code == 400
         
         data = response.json()
-        assert "already exists" in data["detail"].lower()
+        assert "already exists" in data["error"].lower()
     
-    def test_create_department_missing_name(self, setup_test_db):
+    def test_create_department_missing_name(self):
         """Test creating department without name"""
         department_data = {
             "description": "Department without name"
@@ -237,7 +229,7 @@ class TestDepartmentsAPI:
         response = client.post("/api/v1/departments/", json=department_data)
         assert response.status_code == 422  # Validation error
     
-    def test_update_department(self, setup_test_db, sample_departments):
+    def test_update_department(self, sample_departments):
         """Test updating a department"""
         department_id = sample_departments[0].id
         update_data = {
@@ -252,7 +244,7 @@ class TestDepartmentsAPI:
         assert data["name"] == "Consumer Electronics"
         assert data["description"] == "Updated description for electronics"
     
-    def test_update_department_duplicate_name(self, setup_test_db, sample_departments):
+    def test_update_department_duplicate_name(self, sample_departments):
         """Test updating department with duplicate name"""
         department_id = sample_departments[0].id
         update_data = {
@@ -263,9 +255,9 @@ class TestDepartmentsAPI:
         assert response.status_code == 400
         
         data = response.json()
-        assert "already exists" in data["detail"].lower()
+        assert "already exists" in data["error"].lower()
     
-    def test_update_department_not_found(self, setup_test_db):
+    def test_update_department_not_found(self):
         """Test updating non-existent department"""
         update_data = {
             "name": "Non-existent Department"
@@ -274,7 +266,7 @@ class TestDepartmentsAPI:
         response = client.put("/api/v1/departments/99999", json=update_data)
         assert response.status_code == 404
     
-    def test_delete_department_empty(self, setup_test_db, sample_departments):
+    def test_delete_department_empty(self, sample_departments):
         """Test deleting department without products"""
         # Books department should have no products initially
         books_dept = sample_departments[1]
@@ -289,7 +281,7 @@ class TestDepartmentsAPI:
         response = client.get(f"/api/v1/departments/{books_dept.id}")
         assert response.status_code == 404
     
-    def test_delete_department_with_products_no_force(self, setup_test_db, departments_with_products):
+    def test_delete_department_with_products_no_force(self, departments_with_products):
         """Test deleting department with products without force flag"""
         electronics_dept = departments_with_products[0]  # Has products
         
@@ -297,10 +289,10 @@ class TestDepartmentsAPI:
         assert response.status_code == 400
         
         data = response.json()
-        assert "cannot delete" in data["detail"].lower()
-        assert "force=true" in data["detail"].lower()
+        assert "cannot delete" in data["error"].lower()
+        assert "force=true" in data["error"].lower()
     
-    def test_delete_department_with_products_force(self, setup_test_db, departments_with_products):
+    def test_delete_department_with_products_force(self, departments_with_products):
         """Test force deleting department with products"""
         electronics_dept = departments_with_products[0]  # Has products
         
@@ -314,7 +306,49 @@ class TestDepartmentsAPI:
         response = client.get(f"/api/v1/departments/{electronics_dept.id}")
         assert response.status_code == 404
     
-    def test_delete_department_not_found(self, setup_test_db):
+    def test_delete_department_with_products_background(self, departments_with_products):
+        """Test force deleting department with products in a background job"""
+        electronics_dept = departments_with_products[0]  # Has products
+        
+        response = client.delete(f"/api/v1/departments/{electronics_dept.id}?force=true&background=true")
+        assert response.status_code == 202
+        
+        data = response.json()
+        assert "job_id" in data
+        
+        # Wait for the database executor to finish the job
+        for _ in range(50):
+            job = client.get(data["status_url"]).json()
+            if job["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.1)
+        
+        assert job["status"] == "completed"
+        assert job["total"] == 2
+        assert job["processed"] == 2
+        assert job["progress"] == 100.0
+        
+        # Verify department is deleted
+        response = client.get(f"/api/v1/departments/{electronics_dept.id}")
+        assert response.status_code == 404
+    
+    def test_delete_department_background_without_products(self, sample_departments):
+        """Test a background force delete of an empty department deletes it right away"""
+        books_dept = sample_departments[1]
+        
+        response = client.delete(f"/api/v1/departments/{books_dept.id}?force=true&background=true")
+        assert response.status_code == 200
+        assert client.get(f"/api/v1/departments/{books_dept.id}").status_code == 404
+        
+        response = client.delete(f"/api/v1/departments/{books_dept.id}?force=true&background=true")
+        assert response.status_code == 404
+    
+    def test_get_department_job_not_found(self):
+        """Test getting a non-existent background job"""
+        response = client.get("/api/v1/departments/jobs/does-not-exist")
+        assert response.status_code == 404
+    
+    def test_delete_department_not_found(self):
         """Test deleting non-existent department"""
         response = client.delete("/api/v1/departments/99999")
         assert response.status_code == 404
@@ -322,7 +356,7 @@ class TestDepartmentsAPI:
 class TestDepartmentStats:
     """Test department statistics endpoint"""
     
-    def test_get_department_stats(self, setup_test_db, departments_with_products):
+    def test_get_department_stats(self, departments_with_products):
         """Test getting department statistics"""
         response = client.get("/api/v1/departments/stats/summary")
         assert response.status_code == 200
@@ -343,7 +377,7 @@ class TestDepartmentStats:
         books_breakdown = next(d for d in breakdown if d["name"] == "Books")
         assert books_breakdown["product_count"] == 1
     
-    def test_get_department_stats_empty(self, setup_test_db):
+    def test_get_department_stats_empty(self):
         """Test getting department stats when no departments exist"""
         response = client.get("/api/v1/departments/stats/summary")
         assert response.status_code == 200
@@ -352,3 +386,77 @@ class TestDepartmentStats:
         assert data["total_departments"] == 0
         assert data["average_products_per_department"] == 0
         assert data["department_breakdown"] == []
+    
+    def test_get_department_stats_detailed(self, departments_with_products):
+        """Test getting cached detailed department statistics"""
+        stats_cache.invalidate(DEPARTMENT_STATS_CACHE_KEY)
+        
+        response = client.get("/api/v1/departments/stats/detailed")
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "MISS"
+        
+        data = response.json()
+        assert data["total_departments"] == 3
+        assert data["departments_with_products"] == 2
+        assert data["departments_without_products"] == 1
+        
+        electronics_breakdown = next(d for d in data["department_breakdown"] if d["name"] == "Electronics")
+        assert electronics_breakdown["product_count"] == 2
+        assert electronics_breakdown["average_price"] > 0
+        
+        # Second request is served from the cache
+        response = client.get("/api/v1/departments/stats/detailed")
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "HIT"
+        assert response.json() == data
+    
+    def test_get_department_stats_detailed_refresh_failure(self, departments_with_products, monkeypatch):
+        """Test a failing refresh keeps serving the stale statistics"""
+        stats_cache.invalidate(DEPARTMENT_STATS_CACHE_KEY)
+        data = client.get("/api/v1/departments/stats/detailed").json()
+        
+        # Expire the entry and make the loader's queries fail
+        broken_engine = create_engine("sqlite:////nonexistent/stats.db")
+        monkeypatch.setattr(departments_routes, "SessionLocal", sessionmaker(bind=broken_engine))
+        monkeypatch.setattr(stats_cache, "ttl", 0)
+        
+        response = client.get("/api/v1/departments/stats/detailed")
+        assert response.headers["X-Cache"] == "STALE"
+        assert response.json() == data
+        
+        deadline = time.monotonic() + 5
+        while DEPARTMENT_STATS_CACHE_KEY in stats_cache._refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        response = client.get("/api/v1/departments/stats/detailed")
+        assert response.headers["X-Cache"] == "STALE"
+        assert response.json() == data
+        broken_engine.dispose()
+        stats_cache.invalidate(DEPARTMENT_STATS_CACHE_KEY)
+    
+    def test_stats_cache_cold_miss_loads_once(self):
+        """Test concurrent reads of a cold key share a single load"""
+        cache = StaleWhileRevalidateCache(ttl=60)
+        release = threading.Event()
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            release.wait(5)
+            return {"total_departments": 3}
+        
+        results = []
+        readers = [
+            threading.Thread(target=lambda: results.append(cache.get("stats", loader)))
+            for _ in range(4)
+        ]
+        for reader in readers:
+            reader.start()
+        time.sleep(0.05)
+        release.set()
+        for reader in readers:
+            reader.join(5)
+        
+        assert len(calls) == 1
+        assert [value for value, _, _ in results] == [{"total_departments": 3}] * 4
+        assert ({"total_departments": 3}, CACHE_MISS, 0.0) in results
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine
+from api.utils.health import HealthMonitor
+
+class TestHealthEndpoints:
+    """Test health, liveness and readiness probes"""
+
+    def test_health(self, started_client):
+        """Test the legacy health check reaches the database"""
+        response = started_client.get("/health")
+        assert response.status_code == 200
+        assert response.json()["database"] == "connected"
+
+    def test_liveness(self, started_client):
+        """Test liveness answers without dependencies"""
+        response = started_client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_readiness(self, started_client):
+        """Test readiness reports the background check and its extras"""
+        response = started_client.get("/health/ready")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["database"]["database"] is True
+        assert data["search_index_ready"] is True
+        assert "saturation" in data["pool"]
+        assert "department_stats_warm" in data["caches"]
+
+class TestHealthMonitor:
+    """Test the background health monitor"""
+
+    def test_no_check_yet_is_not_ready(self):
+        """Test a monitor that never ran reports a stale failure"""
+        monitor = HealthMonitor(create_engine("sqlite://"), interval=60)
+        status = monitor.status()
+        assert status["database"] is False
+        assert status["stale"] is True
+
+    def test_missing_search_index(self, tmp_path):
+        """Test a reachable database without the search index"""
+        monitor = HealthMonitor(create_engine(f"sqlite:///{tmp_path / 'empty.db'}"), interval=60)
+        result = monitor.check()
+        assert result["database"] is True
+        assert result["search_index"] is False
+
+    def test_unreachable_database(self, tmp_path):
+        """Test a failing check is recorded instead of raised"""
+        monitor = HealthMonitor(create_engine(f"sqlite:///{tmp_path / 'missing' / 'db.sqlite'}"), interval=60)
+        result = monitor.check()
+        assert result["database"] is False
+        assert result["error"]
@@ -0,0 +1,33 @@
+import pytest
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.app import app
+from api.routes import internal
+
+# Create test client
+client = TestClient(app)
+
+# Every GET diagnostics route without path parameters
+DIAGNOSTICS_ROUTES = [
+    f"/internal{route.path}" for route in internal.router.routes
+    if "GET" in route.methods and "{" not in route.path
+]
+
+class TestInternalRoutes:
+    """Test the internal diagnostics router"""
+
+    @pytest.mark.parametrize("path", DIAGNOSTICS_ROUTES)
+    def test_requires_admin(self, path, admin_headers):
+        """Test every diagnostics route refuses callers without the admin token"""
+        assert client.get(path).status_code == 403
+        assert client.get(path, headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    def test_admin_allowed(self, admin_headers):
+        """Test callers presenting the token are served"""
+        response = client.get("/internal/db-executor", headers=admin_headers)
+        assert response.status_code == 200
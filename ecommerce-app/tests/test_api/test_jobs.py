@@ -0,0 +1,61 @@
+import pytest
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.app import app
+from api.routes import departments as departments_routes
+from api.utils.jobs import JOB_COMPLETED, JobRegistry, JobRegistryFullError
+from database.models import Department, Product
+
+# Create test client
+client = TestClient(app)
+
+class TestJobRegistry:
+    """Test the bounded in-process job registry"""
+
+    def test_evicts_oldest_finished(self):
+        """Test finished jobs make room for new ones, oldest first"""
+        registry = JobRegistry(max_jobs=2)
+        first = registry.create("test")
+        second = registry.create("test")
+        registry.complete(first['id'])
+        registry.complete(second['id'])
+
+        third = registry.create("test")
+        assert registry.get(first['id']) is None
+        assert registry.get(second['id'])['status'] == JOB_COMPLETED
+        assert registry.get(third['id']) is not None
+
+    def test_rejects_when_full_of_unfinished_jobs(self):
+        """Test new jobs are rejected while every slot holds a pending or running job"""
+        registry = JobRegistry(max_jobs=2)
+        running = registry.create("test")
+        registry.start(running['id'])
+        registry.create("test")
+
+        with pytest.raises(JobRegistryFullError):
+            registry.create("test")
+
+        # Finishing a job frees its slot
+        registry.fail(running['id'], "boom")
+        assert registry.create("test") is not None
+
+    def test_force_delete_rejected_when_full(self, db_session, monkeypatch):
+        """Test a background force delete fails fast instead of growing the registry"""
+        department = Department(name="Full registry", description="Job registry test")
+        db_session.add(department)
+        db_session.flush()
+        db_session.add(Product(product_id="JOBS001", product_name="Job product", department_id=department.id))
+        db_session.commit()
+
+        registry = JobRegistry(max_jobs=1)
+        registry.create("test")
+        monkeypatch.setattr(departments_routes, "job_registry", registry)
+
+        response = client.delete(f"/api/v1/departments/{department.id}?force=true&background=true")
+        assert response.status_code == 503
+        assert client.get(f"/api/v1/departments/{department.id}").status_code == 200
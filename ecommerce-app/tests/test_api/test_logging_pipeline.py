@@ -0,0 +1,54 @@
+import sys
+import logging
+import queue
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.utils.logging_pipeline import SamplingFilter, DeferredQueueHandler
+
+def make_record(name: str, level: int, msg: str = "message %s", args=("value",)) -> logging.LogRecord:
+    """Build a log record without going through a logger"""
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+class TestSamplingFilter:
+    """Test per-logger log sampling"""
+
+    def test_unsampled_logger_kept(self):
+        """Test loggers without a rate keep every record"""
+        sampling = SamplingFilter({"api.routes.products": 0.0})
+        assert sampling.filter(make_record("api.routes.departments", logging.INFO))
+
+    def test_sampled_logger_dropped(self):
+        """Test a zero rate drops INFO records, including child loggers"""
+        sampling = SamplingFilter({"api.routes.products": 0.0})
+        assert not sampling.filter(make_record("api.routes.products", logging.INFO))
+        assert not sampling.filter(make_record("api.routes.products.search", logging.DEBUG))
+
+    def test_warnings_never_sampled(self):
+        """Test WARNING and above bypass sampling"""
+        sampling = SamplingFilter({"api.routes.products": 0.0})
+        assert sampling.filter(make_record("api.routes.products", logging.WARNING))
+        assert sampling.filter(make_record("api.routes.products", logging.ERROR))
+
+class TestDeferredQueueHandler:
+    """Test the non-formatting queue handler"""
+
+    def test_message_left_unformatted(self):
+        """Test message arguments are merged by the listener, not the caller"""
+        log_queue = queue.Queue()
+        handler = DeferredQueueHandler(log_queue)
+        handler.handle(make_record("test", logging.INFO))
+
+        queued = log_queue.get_nowait()
+        assert queued.msg == "message %s"
+        assert queued.args == ("value",)
+        assert queued.getMessage() == "message value"
+
+    def test_full_queue_drops(self):
+        """Test records are shed instead of blocking when the queue is full"""
+        handler = DeferredQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(make_record("test", logging.INFO))
+        handler.handle(make_record("test", logging.INFO))
+        assert handler.dropped == 1
@@ -0,0 +1,59 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.utils.loop_monitor import LoopMonitor
+
+def blocking_handler():
+    time.sleep(0.3)
+
+async def run_monitored(monitor: LoopMonitor, label: str):
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        task = monitor.track(label)
+        blocking_handler()
+        monitor.untrack(task)
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+
+class TestLoopMonitor:
+    """Test event loop lag measurement and stall capture"""
+
+    def test_stall_captured_with_request(self):
+        """Test a blocking call is reported with its stack and request"""
+        monitor = LoopMonitor(interval=0.01, threshold=0.1)
+        asyncio.run(run_monitored(monitor, "GET /api/v1/products/"))
+
+        assert len(monitor.stalls) == 1
+        stall = monitor.stalls[0]
+        assert stall['request'] == "GET /api/v1/products/"
+        assert stall['blocked_ms'] >= 100
+        assert any("blocking_handler" in line for line in stall['stack'])
+        assert monitor.max_lag >= 0.2
+        assert not monitor.running
+
+    def test_no_stall_when_idle(self):
+        """Test an idle loop records lag but no stalls"""
+        async def idle(monitor):
+            monitor.start()
+            await asyncio.sleep(0.1)
+            monitor.stop()
+
+        monitor = LoopMonitor(interval=0.01, threshold=0.2)
+        asyncio.run(idle(monitor))
+        assert list(monitor.stalls) == []
+        assert monitor.max_lag < 0.2
+
+    def test_stats_endpoint(self, started_client, admin_headers):
+        """Test the monitor runs with the app and reports its lag"""
+        response = started_client.get("/internal/event-loop", headers=admin_headers)
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats['running'] is True
+        assert "max_lag_ms" in stats
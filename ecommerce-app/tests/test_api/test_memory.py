@@ -0,0 +1,106 @@
+import pytest
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.app import app
+from api.config import settings
+from api.utils.memory import MemoryDiagnostics, memory_diagnostics
+
+# Create test client
+client = TestClient(app)
+
+ADMIN = {"X-Admin-Token": "test-admin-token"}
+
+# Kept alive between snapshots so the diff has something to find
+retained = []
+
+@pytest.fixture
+def tracing(monkeypatch):
+    """Admin access with tracemalloc running for the duration of a test"""
+    monkeypatch.setattr(settings, "admin_token", ADMIN["X-Admin-Token"])
+    response = client.post("/internal/memory/tracemalloc/start", headers=ADMIN)
+    assert response.status_code == 200
+    yield
+    client.post("/internal/memory/tracemalloc/stop", headers=ADMIN)
+    retained.clear()
+
+class TestMemoryDiagnostics:
+    """Test the admin memory diagnostics endpoints"""
+
+    def test_requires_admin(self, monkeypatch):
+        """Test memory endpoints refuse callers without the token"""
+        monkeypatch.setattr(settings, "admin_token", ADMIN["X-Admin-Token"])
+        assert client.get("/internal/memory").status_code == 403
+        assert client.get("/internal/memory", headers=ADMIN).status_code == 200
+
+    def test_snapshot_diff(self, tracing):
+        """Test a diff attributes retained memory to its allocation site"""
+        base = client.post("/internal/memory/snapshots?label=before", headers=ADMIN).json()
+        retained.extend(bytearray(1024) for _ in range(2000))
+        target = client.post("/internal/memory/snapshots?label=after", headers=ADMIN).json()
+
+        response = client.get(
+            f"/internal/memory/diff?base={base['id']}&target={target['id']}", headers=ADMIN
+        )
+        assert response.status_code == 200
+        top = response.json()["diff"][0]
+        assert top["site"][0].startswith(__file__)
+        assert top["size_diff_kb"] >= 2000
+
+        top_sites = client.get(f"/internal/memory/snapshots/{target['id']}", headers=ADMIN).json()["top"]
+        assert top_sites[0]["size_kb"] > 0
+
+    def test_snapshot_requires_tracing(self, monkeypatch):
+        """Test snapshots fail cleanly while tracemalloc is off"""
+        monkeypatch.setattr(settings, "admin_token", ADMIN["X-Admin-Token"])
+        memory_diagnostics.stop()
+        assert client.post("/internal/memory/snapshots", headers=ADMIN).status_code == 409
+
+    def test_unknown_snapshot(self, tracing):
+        """Test looking up a missing snapshot"""
+        assert client.get("/internal/memory/snapshots/missing", headers=ADMIN).status_code == 404
+
+    def test_object_counts(self, tracing):
+        """Test live objects are counted by type"""
+        objects = client.get("/internal/memory/objects?limit=5", headers=ADMIN).json()["objects"]
+        assert len(objects) == 5
+        assert objects[0]["count"] >= objects[-1]["count"]
+
+    def test_request_peaks(self, tracing, monkeypatch):
+        """Test sampled requests record their peak allocation by route template"""
+        monkeypatch.setattr(memory_diagnostics, "sample_rate", 1.0)
+        assert client.get("/api/v1/products/?page_size=50").status_code == 200
+
+        routes = client.get("/internal/memory/requests", headers=ADMIN).json()["routes"]
+        assert routes["GET /api/v1/products/"]["count"] >= 1
+        assert routes["GET /api/v1/products/"]["max_peak_kb"] > 0
+
+    def test_concurrent_requests_not_measured(self, tracing):
+        """Test peaks are only recorded for sampled requests that ran alone"""
+        diagnostics = MemoryDiagnostics(sample_rate=1.0)
+
+        # A request arriving during a measurement discards it
+        measured = diagnostics.begin_request()
+        assert measured is not None
+        assert diagnostics.begin_request() is None
+        diagnostics.end_request("GET /b", None)
+        diagnostics.end_request("GET /a", measured)
+        assert diagnostics.request_peaks() == {}
+        assert diagnostics.overlapped_requests == 1
+
+        # A request starting while another is in flight is not measured
+        diagnostics.sample_rate = 0.0
+        unsampled = diagnostics.begin_request()
+        diagnostics.sample_rate = 1.0
+        assert diagnostics.begin_request() is None
+        diagnostics.end_request("GET /a", None)
+        diagnostics.end_request("GET /b", unsampled)
+        assert diagnostics.request_peaks() == {}
+
+        # Alone again, the next sampled request is recorded
+        diagnostics.end_request("GET /a", diagnostics.begin_request())
+        assert diagnostics.request_peaks()["GET /a"]["count"] == 1
@@ -0,0 +1,113 @@
+import pytest
+import sys
+from pathlib import Path
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from starlette.routing import Mount, Route, Router
+
+from api.app import app
+from api.middleware import metrics as metrics_middleware
+from api.middleware.metrics import UNMATCHED_ROUTE, route_template
+from api.utils.metrics import bucket_quantile
+
+# Create test client
+client = TestClient(app)
+
+class TestMetricsEndpoints:
+    """Test request metrics collection and export"""
+
+    def test_prometheus_exposition(self):
+        """Test /metrics exports counters and histograms for the route template"""
+        client.get("/health/live")
+        client.get("/api/v1/products/123456")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+        body = response.text
+        assert 'http_requests_total{method="GET",route="/health/live",status="200"}' in body
+        assert 'route="/api/v1/products/{product_id}"' in body
+        assert "http_request_duration_seconds_bucket" in body
+        assert "http_response_size_bytes_bucket" in body
+        assert "http_requests_in_progress" in body
+
+    def test_unmatched_routes_grouped(self):
+        """Test unknown paths share one label instead of one per path"""
+        client.get("/no/such/path/1")
+        client.get("/no/such/path/2")
+
+        body = client.get("/metrics").text
+        assert 'route="<unmatched>",status="404"' in body
+        assert "/no/such/path" not in body
+
+    def test_summary_quantiles(self):
+        """Test the JSON summary reports p50/p95/p99 per route"""
+        for _ in range(5):
+            client.get("/health/live")
+
+        summary = client.get("/metrics/summary").json()["routes"]["GET /health/live"]
+        assert summary["count"] >= 5
+        assert 0 <= summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+
+class TestRouteTemplate:
+    """Test requests are labelled with the matched route's template"""
+
+    @pytest.mark.parametrize("template,path,params", [
+        ("/files/{file_path}", "/files/a/b", {"file_path": "a/b"}),
+        ("/products/{product_id}", "/products/products", {"product_id": "products"}),
+        ("/departments/{department_id}/products/{limit}", "/departments/5/products/5",
+         {"department_id": 5, "limit": 5})
+    ])
+    def test_uses_route_path(self, template, path, params):
+        """Test the template comes from the route, not from matching parameter values"""
+        route = Route(template.replace("{file_path}", "{file_path:path}"), lambda request: None)
+        scope = {"path": path, "path_params": params, "route": route, "app": Router(routes=[route])}
+        assert route_template(scope) == template
+
+    def test_included_router_prefix(self):
+        """Test routes of an included router keep the include prefix"""
+        router = APIRouter()
+
+        @router.get("/{item_id}")
+        def read_item(item_id: str):
+            return {"item_id": item_id}
+
+        included = FastAPI()
+        included.include_router(router, prefix="/items")
+        scope = {"path": "/items/items", "route": router.routes[0], "app": included}
+        assert route_template(scope) == "/items/{item_id}"
+
+    def test_mounted_routes_without_route_contexts(self, monkeypatch):
+        """Test FastAPI versions without iter_route_contexts walk the routes and mounts"""
+        monkeypatch.setattr(metrics_middleware, "iter_route_contexts", None)
+        item = Route("/items/{item_id:int}", lambda request: None)
+        root = Router(routes=[Mount("/v2", routes=[item])])
+        scope = {"path": "/v2/items/5", "route": item, "app": root}
+        assert route_template(scope) == "/v2/items/{item_id}"
+
+    def test_unmatched(self):
+        """Test requests no route handled share the unmatched label"""
+        assert route_template({"path": "/no/such/path", "path_params": {}}) == UNMATCHED_ROUTE
+
+class TestBucketQuantile:
+    """Test quantile estimation from histogram buckets"""
+
+    def test_interpolates_within_bucket(self):
+        """Test linear interpolation inside the bucket holding the rank"""
+        buckets = [(0.1, 50.0), (0.2, 100.0), (float("inf"), 100.0)]
+        assert bucket_quantile(0.5, buckets) == pytest.approx(0.1)
+        assert bucket_quantile(0.75, buckets) == pytest.approx(0.15)
+
+    def test_overflow_bucket_uses_largest_bound(self):
+        """Test a rank in the +Inf bucket reports the largest finite bound"""
+        buckets = [(0.1, 1.0), (float("inf"), 10.0)]
+        assert bucket_quantile(0.99, buckets) == 0.1
+
+    def test_empty_histogram(self):
+        """Test an empty histogram reports zero"""
+        assert bucket_quantile(0.5, [(0.1, 0.0), (float("inf"), 0.0)]) == 0.0
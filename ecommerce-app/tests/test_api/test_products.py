@@ -8,25 +8,15 @@ from decimal import Decimal
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from api.app import app
-from database.connection import SessionLocal, create_tables, drop_tables
 from database.models import Product, Department
 
 # Create test client
 client = TestClient(app)
 
-@pytest.fixture(scope="module")
-def setup_test_db():
-    """Setup test database"""
-    create_tables()
-    yield
-    drop_tables()
-
-@pytest.fixture
-def db_session():
-    """Create database session for tests"""
-    session = SessionLocal()
-    yield session
-    session.close()
+# The products API only serves reads; catalogue changes go through the CSV loader
+READ_ONLY_PRODUCTS = pytest.mark.xfail(
+    reason="no POST/PUT/DELETE routes on /api/v1/products (responds 405)", strict=True
+)
 
 @pytest.fixture
 def sample_department(db_session):
@@ -87,7 +77,7 @@ def sample_products(db_session, sample_department):
 class TestProductsAPI:
     """Test Products API endpoints"""
     
-    def test_get_products_empty(self, setup_test_db):
+    def test_get_products_empty(self):
         """Test getting products when database is empty"""
         response = client.get("/api/v1/products/")
         assert response.status_code == 200
@@ -98,7 +88,7 @@ class TestProductsAPI:
         assert data["page"] == 1
         assert data["per_page"] == 20
     
-    def test_get_products_with_data(self, setup_test_db, sample_products):
+    def test_get_products_with_data(self, sample_products):
         """Test getting products with data"""
         response = client.get("/api/v1/products/")
         assert response.status_code == 200
@@ -116,7 +106,7 @@ class TestProductsAPI:
         assert "sale_price" in product
         assert "discount_percentage" in product
     
-    def test_get_products_pagination(self, setup_test_db, sample_products):
+    def test_get_products_pagination(self, sample_products):
         """Test products pagination"""
         # Get first page with 2 items per page
         response = client.get("/api/v1/products/?page=1&per_page=2")
@@ -137,7 +127,7 @@ class TestProductsAPI:
         assert len(data["products"]) == 1
         assert data["page"] == 2
     
-    def test_get_products_search(self, setup_test_db, sample_products):
+    def test_get_products_search(self, sample_products):
         """Test product search"""
         response = client.get("/api/v1/products/?search=laptop")
         assert response.status_code == 200
@@ -147,7 +137,7 @@ class TestProductsAPI:
         assert len(data["products"]) == 1
         assert "laptop" in data["products"][0]["product_name"].lower()
     
-    def test_get_products_filter_by_category(self, setup_test_db, sample_products):
+    def test_get_products_filter_by_category(self, sample_products):
         """Test filtering products by category"""
         response = client.get("/api/v1/products/?category=Electronics")
         assert response.status_code == 200
@@ -156,7 +146,7 @@ class TestProductsAPI:
         assert data["total"] == 2  # Phone and Tablet
         assert all("Electronics" in p["category"] for p in data["products"])
     
-    def test_get_products_filter_by_brand(self, setup_test_db, sample_products):
+    def test_get_products_filter_by_brand(self, sample_products):
         """Test filtering products by brand"""
         response = client.get("/api/v1/products/?brand=TestBrand")
         assert response.status_code == 200
@@ -165,7 +155,7 @@ class TestProductsAPI:
         assert data["total"] == 1
         assert data["products"][0]["brand"] == "TestBrand"
     
-    def test_get_products_filter_by_price_range(self, setup_test_db, sample_products):
+    def test_get_products_filter_by_price_range(self, sample_products):
         """Test filtering products by price range"""
         response = client.get("/api/v1/products/?min_price=400&max_price=800")
         assert response.status_code == 200
@@ -175,7 +165,7 @@ class TestProductsAPI:
         product = data["products"][0]
         assert 400 <= float(product["sale_price"]) <= 800
     
-    def test_get_products_filter_by_rating(self, setup_test_db, sample_products):
+    def test_get_products_filter_by_rating(self, sample_products):
         """Test filtering products by minimum rating"""
         response = client.get("/api/v1/products/?min_rating=4.0")
         assert response.status_code == 200
@@ -184,7 +174,7 @@ class TestProductsAPI:
         assert data["total"] == 2  # Laptop and phone
         assert all(p["rating"] >= 4.0 for p in data["products"] if p["rating"])
     
-    def test_get_products_sorting(self, setup_test_db, sample_products):
+    def test_get_products_sorting(self, sample_products):
         """Test product sorting"""
         # Sort by price ascending
         response = client.get("/api/v1/products/?sort_by=sale_price&sort_order=asc")
@@ -202,7 +192,40 @@ class TestProductsAPI:
         prices = [float(p["sale_price"]) for p in data["products"]]
         assert prices == sorted(prices, reverse=True)
     
-    def test_get_product_by_id(self, setup_test_db, sample_products):
+    def test_get_products_statement_cache(self, sample_products, admin_headers):
+        """Test listings with the same filter shape reuse the cached statement"""
+        first = client.get("/api/v1/products/?brand=TestBrand&min_rating=1&sort_by=rating")
+        assert first.status_code == 200
+        assert first.json()["total"] == 1
+        
+        # Same shape, different values: cached statement, fresh bind values
+        second = client.get("/api/v1/products/?brand=PhoneBrand&min_rating=2&sort_by=rating")
+        assert second.status_code == 200
+        assert second.headers["X-Statement-Cache"] == "HIT"
+        assert "X-Statement-Build-Ms" in second.headers
+        # SQLAlchemy's compiled cache also resolves the reused statements
+        assert 'desc="0 compiled' in second.headers["Server-Timing"]
+        data = second.json()
+        assert data["total"] == 1
+        assert data["products"][0]["brand"] == "PhoneBrand"
+        
+        stats = client.get("/internal/statement-cache", headers=admin_headers).json()
+        assert stats["hits"] >= 1
+        assert 0 < stats["hit_rate"] <= 1
+    
+    def test_get_products_row_mode_matches_orm(self, sample_products, monkeypatch):
+        """Test the plain-row listing returns the same products as ORM mode"""
+        from api.config import settings
+        
+        monkeypatch.setattr(settings, "listing_row_mode", False)
+        orm_data = client.get("/api/v1/products/?sort_by=id&sort_order=asc").json()
+        monkeypatch.setattr(settings, "listing_row_mode", True)
+        row_data = client.get("/api/v1/products/?sort_by=id&sort_order=asc").json()
+        
+        assert row_data == orm_data
+        assert row_data["products"][0]["department_name"] == "Test Electronics"
+    
+    def test_get_product_by_id(self, sample_products):
         """Test getting a specific product by ID"""
         product_id = sample_products[0].id
         response = client.get(f"/api/v1/products/{product_id}")
@@ -214,15 +237,16 @@ class TestProductsAPI:
         assert "discount_percentage" in data
         assert "department_name" in data
     
-    def test_get_product_not_found(self, setup_test_db):
+    def test_get_product_not_found(self):
         """Test getting non-existent product"""
         response = client.get("/api/v1/products/99999")
         assert response.status_code == 404
         
         data = response.json()
-        assert "not found" in data["detail"].lower()
+        assert "not found" in data["error"].lower()
     
-    def test_create_product(self, setup_test_db, sample_department):
+    @READ_ONLY_PRODUCTS
+    def test_create_product(self, sample_department):
         """Test creating a new product"""
         product_data = {
             "product_id": "NEW001",
@@ -244,7 +268,8 @@ class TestProductsAPI:
         assert data["product_name"] == "New Test Product"
         assert data["department_name"] == sample_department.name
     
-    def test_create_product_duplicate_id(self, setup_test_db, sample_products):
+    @READ_ONLY_PRODUCTS
+    def test_create_product_duplicate_id(self, sample_products):
         """Test creating product with duplicate product_id"""
         product_data = {
             "product_id": "TEST001",  # Same as existing product
@@ -256,9 +281,10 @@ class TestProductsAPI:
         assert response.status_code == 400
         
         data = response.json()
-        assert "already exists" in data["detail"].lower()
+        assert "already exists" in data["error"].lower()
     
-    def test_create_product_invalid_department(self, setup_test_db):
+    @READ_ONLY_PRODUCTS
+    def test_create_product_invalid_department(self):
         """Test creating product with invalid department"""
         product_data = {
             "product_id": "INVALID001",
@@ -271,9 +297,10 @@ class TestProductsAPI:
         assert response.status_code == 400
         
         data = response.json()
-        assert "not found" in data["detail"].lower()
+        assert "not found" in data["error"].lower()
     
-    def test_update_product(self, setup_test_db, sample_products):
+    @READ_ONLY_PRODUCTS
+    def test_update_product(self, sample_products):
         """Test updating a product"""
         product_id = sample_products[0].id
         update_data = {
@@ -288,7 +315,8 @@ class TestProductsAPI:
         assert data["product_name"] == "Updated Laptop"
         assert float(data["sale_price"]) == 1099.99
     
-    def test_update_product_not_found(self, setup_test_db):
+    @READ_ONLY_PRODUCTS
+    def test_update_product_not_found(self):
         """Test updating non-existent product"""
         update_data = {
             "product_name": "Non-existent Product"
@@ -297,7 +325,8 @@ class TestProductsAPI:
         response = client.put("/api/v1/products/99999", json=update_data)
         assert response.status_code == 404
     
-    def test_delete_product(self, setup_test_db, sample_products):
+    @READ_ONLY_PRODUCTS
+    def test_delete_product(self, sample_products):
         """Test deleting a product"""
         product_id = sample_products[0].id
         
@@ -311,7 +340,8 @@ class TestProductsAPI:
         response = client.get(f"/api/v1/products/{product_id}")
         assert response.status_code == 404
     
-    def test_delete_product_not_found(self, setup_test_db):
+    @READ_ONLY_PRODUCTS
+    def test_delete_product_not_found(self):
         """Test deleting non-existent product"""
         response = client.delete("/api/v1/products/99999")
         assert response.status_code == 404
@@ -319,7 +349,7 @@ class TestProductsAPI:
 class TestProductsUtilityEndpoints:
     """Test utility endpoints for products"""
     
-    def test_get_categories(self, setup_test_db, sample_products):
+    def test_get_categories(self, sample_products):
         """Test getting list of categories"""
         response = client.get("/api/v1/products/categories/list")
         assert response.status_code == 200
@@ -329,7 +359,7 @@ class TestProductsUtilityEndpoints:
         assert "Computers" in data
         assert "Electronics" in data
     
-    def test_get_brands(self, setup_test_db, sample_products):
+    def test_get_brands(self, sample_products):
         """Test getting list of brands"""
         response = client.get("/api/v1/products/brands/list")
         assert response.status_code == 200
@@ -339,7 +369,7 @@ class TestProductsUtilityEndpoints:
         assert "TestBrand" in data
         assert "PhoneBrand" in data
     
-    def test_get_product_stats(self, setup_test_db, sample_products):
+    def test_get_product_stats(self, sample_products):
         """Test getting product statistics"""
         response = client.get("/api/v1/products/stats/summary")
         assert response.status_code == 200
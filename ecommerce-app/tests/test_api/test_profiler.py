@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.app import app
+from api.config import settings
+from api.utils.profiler import ContinuousProfiler, ProfileStore, RequestProfile, StackSampler, run_profiled
+from database.executor import db_executor
+
+# Create test client
+client = TestClient(app)
+
+ADMIN = {"X-Admin-Token": "test-admin-token"}
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    """Configure the admin token for the duration of a test"""
+    monkeypatch.setattr(settings, "admin_token", ADMIN["X-Admin-Token"])
+
+def busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(100))
+
+def request_work():
+    sum(range(1000))
+
+def other_request_work():
+    sum(range(1000))
+
+def executor_work():
+    time.sleep(0.02)
+
+async def profile_concurrently(mode: str) -> str:
+    """Profile one coroutine while another runs on the same loop"""
+    async def profiled():
+        for _ in range(3):
+            request_work()
+            await asyncio.sleep(0.01)
+        await db_executor.run(executor_work)
+
+    async def other():
+        for _ in range(6):
+            other_request_work()
+            await asyncio.sleep(0.005)
+
+    profile = RequestProfile(mode, 0.001)
+    profile.start()
+    other_task = asyncio.create_task(other())
+    await profile.run(profiled())
+    report = profile.stop("test")['report']
+    await other_task
+    return report
+
+class TestRequestProfiling:
+    """Test admin-triggered per-request profiling"""
+
+    @pytest.mark.parametrize("mode", ["sampling", "cprofile"])
+    def test_profile_request(self, admin_token, mode):
+        """Test a flagged request is profiled and its report stored"""
+        response = client.get("/api/v1/products/", headers={"X-Profile": mode, **ADMIN})
+        assert response.status_code == 200
+        profile_id = response.headers["X-Profile-Id"]
+
+        report = client.get(f"/internal/profiles/{profile_id}", headers=ADMIN)
+        assert report.status_code == 200
+        assert report.headers["X-Profile-Mode"] == mode
+        assert report.text
+
+    def test_fast_request_sampled(self, admin_token):
+        """Test a request shorter than the default interval still gets samples, and only its own"""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,))
+        worker.start()
+        try:
+            response = client.get("/api/v1/products/categories/list", headers={"X-Profile": "sampling", **ADMIN})
+        finally:
+            stop.set()
+            worker.join()
+
+        report = client.get(f"/internal/profiles/{response.headers['X-Profile-Id']}", headers=ADMIN).text
+        assert "__call__ (profiling.py:" in report
+        assert "busy_loop" not in report
+
+    @pytest.mark.parametrize("mode", ["sampling", "cprofile"])
+    def test_other_coroutines_excluded(self, mode, monkeypatch):
+        """Test work of other coroutines on the loop is not attributed to the request"""
+        # Registered by the app's startup hook, which this test doesn't run
+        monkeypatch.setattr(db_executor, "wrap_call", run_profiled)
+        report = asyncio.run(profile_concurrently(mode))
+        assert "other_request_work" not in report
+        if mode == "cprofile":
+            assert "request_work" in report
+        else:
+            # Executor threads running the request's units are sampled
+            assert "executor_work" in report
+
+    def test_query_flag(self, admin_token):
+        """Test the profile can be requested with a query parameter"""
+        response = client.get("/api/v1/products/?profile=sampling", headers=ADMIN)
+        assert "X-Profile-Id" in response.headers
+
+    def test_flag_ignored_without_admin(self, admin_token):
+        """Test non-admin requests are served without profiling"""
+        response = client.get("/api/v1/products/", headers={"X-Profile": "cprofile", "X-Admin-Token": "wrong"})
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
+
+    def test_profiles_require_admin(self, monkeypatch):
+        """Test profile endpoints refuse callers without the token"""
+        monkeypatch.setattr(settings, "admin_token", None)
+        assert client.get("/internal/profiles").status_code == 403
+        assert client.get("/internal/profiles", headers=ADMIN).status_code == 403
+
+    def test_unknown_profile(self, admin_token):
+        """Test fetching a missing profile"""
+        assert client.get("/internal/profiles/missing", headers=ADMIN).status_code == 404
+
+class TestSampling:
+    """Test the stack sampler and continuous profiler"""
+
+    def test_sampler_collapses_stacks(self):
+        """Test samples of a busy thread show its frames root-first"""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,))
+        worker.start()
+        sampler = StackSampler(0.001, thread_ids=[worker.ident])
+        sampler.start()
+        time.sleep(0.1)
+        stacks = sampler.stop()
+        stop.set()
+        worker.join()
+
+        assert sampler.samples > 0
+        assert any("busy_loop (test_profiler.py" in stack for stack in stacks)
+        assert all(stack.startswith("_bootstrap") for stack in stacks)
+
+    def test_continuous_report_and_reset(self):
+        """Test continuous profiling aggregates samples until reset"""
+        profiler = ContinuousProfiler(0.001)
+        assert profiler.report()['running'] is False
+
+        profiler.start()
+        try:
+            time.sleep(0.05)
+            first = profiler.report(reset=True)
+            assert first['samples'] > 0
+            assert first['report']
+            assert profiler.report()['samples'] <= first['samples']
+        finally:
+            profiler.stop()
+        assert not profiler.running
+
+    def test_store_keeps_recent(self):
+        """Test the profile store evicts the oldest reports"""
+        store = ProfileStore(max_reports=2)
+        for profile_id in ("a", "b", "c"):
+            store.add({'id': profile_id, 'report': ""})
+        assert store.get("a") is None
+        assert [report['id'] for report in store.list()] == ["c", "b"]
@@ -0,0 +1,145 @@
+import pytest
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from api.app import app
+from api.config import settings
+from api.routes.departments import stats_cache, DEPARTMENT_STATS_CACHE_KEY
+from database.models import Product, Department
+from decimal import Decimal
+
+# Create test client
+client = TestClient(app)
+
+PAGE_SIZES = [1, 20, 100]
+
+# More departments, products and products in the tested department than the
+# largest page, so a per-row query (N+1) changes the count between page sizes
+DEPARTMENT_COUNT = 120
+PRODUCT_COUNT = 250
+TESTED_DEPARTMENT_PRODUCTS = 120
+
+TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT", "BEGIN", "COMMIT", "ROLLBACK")
+
+@contextmanager
+def capture_statements():
+    """Collect every SQL statement executed on any engine inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # The test harness wraps each session in a SAVEPOINT, and the started
+        # client's health monitor keeps polling in the background; neither
+        # are the route's queries
+        if statement.startswith(TRANSACTION_CONTROL) or threading.current_thread().name == "health-monitor":
+            return
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+def assert_statement_count(url: str, expected: int) -> Response:
+    """Request ``url`` and assert exactly ``expected`` SQL statements ran"""
+    with capture_statements() as statements:
+        response = client.get(url)
+    assert response.status_code == 200, response.text
+    assert len(statements) == expected, (
+        f"{url} ran {len(statements)} statements, expected {expected}:\n" + "\n---\n".join(statements)
+    )
+    return response
+
+def department_for(departments, index: int) -> int:
+    """The first TESTED_DEPARTMENT_PRODUCTS products go to the tested department"""
+    if index < TESTED_DEPARTMENT_PRODUCTS:
+        return departments[0].id
+    return departments[1 + index % (DEPARTMENT_COUNT - 1)].id
+
+@pytest.fixture
+def catalogue(db_session):
+    """Departments with a full page of products in the first and the rest spread across the others"""
+    departments = [
+        Department(name=f"Query count department {index}", description="Query count test")
+        for index in range(DEPARTMENT_COUNT)
+    ]
+    db_session.add_all(departments)
+    db_session.flush()
+    products = [
+        Product(
+            product_id=f"QC{index:05d}",
+            product_name=f"Query count product {index}",
+            category=f"Category {index % 5}",
+            brand=f"Brand {index % 7}",
+            sale_price=Decimal("19.99"),
+            market_price=Decimal("24.99"),
+            rating=4.0,
+            department_id=department_for(departments, index)
+        )
+        for index in range(PRODUCT_COUNT)
+    ]
+    db_session.add_all(products)
+    db_session.commit()
+    return {'department_id': departments[0].id, 'product_id': products[0].id}
+
+class TestQueryCounts:
+    """Test each route runs a fixed number of SQL statements regardless of page size"""
+
+    @pytest.mark.parametrize("per_page", PAGE_SIZES)
+    @pytest.mark.parametrize("row_mode", [True, False])
+    def test_get_products(self, catalogue, monkeypatch, per_page, row_mode):
+        """Test a listing page is one count and one page query"""
+        monkeypatch.setattr(settings, "listing_row_mode", row_mode)
+        assert_statement_count(f"/api/v1/products/?per_page={per_page}", 2)
+        assert_statement_count(f"/api/v1/products/?per_page={per_page}&search=product&sort_by=sale_price", 2)
+
+    def test_get_product(self, catalogue):
+        """Test a product and its department load in one query"""
+        assert_statement_count(f"/api/v1/products/{catalogue['product_id']}", 1)
+
+    @pytest.mark.parametrize("per_page", PAGE_SIZES)
+    def test_get_departments(self, catalogue, per_page):
+        """Test department counts are fetched for the whole page at once"""
+        assert_statement_count(f"/api/v1/departments/?per_page={per_page}", 3)
+
+    def test_get_department(self, catalogue):
+        """Test a department and its product count"""
+        assert_statement_count(f"/api/v1/departments/{catalogue['department_id']}", 2)
+
+    @pytest.mark.parametrize("per_page", PAGE_SIZES)
+    @pytest.mark.parametrize("row_mode", [True, False])
+    def test_get_department_products(self, catalogue, monkeypatch, per_page, row_mode):
+        """Test a department page is the department, a count and one page query"""
+        monkeypatch.setattr(settings, "listing_row_mode", row_mode)
+        response = assert_statement_count(
+            f"/api/v1/departments/{catalogue['department_id']}/products?per_page={per_page}", 3
+        )
+        assert len(response.json()["products"]) == per_page
+
+    def test_product_stats(self, catalogue):
+        """Test the product statistics summary"""
+        assert_statement_count("/api/v1/products/stats/summary", 11)
+
+    def test_department_stats(self, catalogue):
+        """Test the department statistics summary"""
+        assert_statement_count("/api/v1/departments/stats/summary", 2)
+
+    def test_department_stats_detailed(self, catalogue):
+        """Test detailed stats query once when cold and not at all when cached"""
+        stats_cache.invalidate(DEPARTMENT_STATS_CACHE_KEY)
+        assert_statement_count("/api/v1/departments/stats/detailed", 1)
+        assert_statement_count("/api/v1/departments/stats/detailed", 0)
+
+    def test_facet_lists(self, catalogue):
+        """Test category and brand lists are one query each"""
+        assert_statement_count("/api/v1/products/categories/list", 1)
+        assert_statement_count("/api/v1/products/brands/list", 1)
@@ -0,0 +1,92 @@
+import pytest
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import api.middleware.tracing as tracing_middleware
+from api.app import app
+from api.config import settings
+from api.utils.tracing import SpanProcessor, Trace, current_trace, should_sample, span
+
+# Create test client
+client = TestClient(app)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+class ListExporter:
+    """Collect exported spans in memory"""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Route finished traces to an in-memory exporter"""
+    list_exporter = ListExporter()
+    processor = SpanProcessor(list_exporter)
+    monkeypatch.setattr(tracing_middleware, "span_processor", processor)
+    yield list_exporter
+    processor.stop()
+
+class TestTracing:
+    """Test sampled request tracing"""
+
+    def test_sampled_request_spans(self, exporter):
+        """Test a sampled listing records nested helper, DB and encoding spans"""
+        response = client.get(
+            "/api/v1/products/?search=phone",
+            headers={"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"}
+        )
+        assert response.status_code == 200
+        assert response.headers["X-Trace-Id"] == TRACE_ID
+
+        tracing_middleware.span_processor.flush()
+        spans = {finished.name: finished for finished in exporter.spans}
+        root = spans["GET /api/v1/products/"]
+        assert root.parent_id == "00f067aa0ba902b7"
+        assert root.attributes["http.status_code"] == 200
+        assert spans["paginate_query_async"].parent_id == root.span_id
+        assert spans["db.query"].parent_id == spans["paginate_query_async"].span_id
+        assert "response.encode" in spans
+        assert all(finished.trace_id == TRACE_ID for finished in exporter.spans)
+
+    def test_unsampled_request(self, exporter, monkeypatch):
+        """Test unsampled requests record nothing"""
+        monkeypatch.setattr(settings, "trace_sample_rate", 0.0)
+        response = client.get("/health/live")
+        assert "X-Trace-Id" not in response.headers
+
+        tracing_middleware.span_processor.flush()
+        assert exporter.spans == []
+
+    @pytest.mark.parametrize("flags, sampled", [("01", True), ("03", True), ("00", False), ("02", False)])
+    def test_traceparent_sampled_flag(self, flags, sampled, monkeypatch):
+        """Test only the sampled bit of the trace flags decides sampling"""
+        monkeypatch.setattr(settings, "trace_sample_rate", 0.0)
+        assert should_sample(f"00-{TRACE_ID}-00f067aa0ba902b7-{flags}") is sampled
+
+    def test_span_outside_trace_is_noop(self):
+        """Test spans outside a sampled trace do nothing"""
+        with span("work") as opened:
+            assert opened is None
+
+    def test_nested_spans(self):
+        """Test spans nest under the innermost open span"""
+        trace = Trace()
+        token = current_trace.set(trace)
+        try:
+            with span("outer") as outer:
+                with span("inner") as inner:
+                    pass
+        finally:
+            current_trace.reset(token)
+
+        assert inner.parent_id == outer.span_id
+        assert outer.end_ns >= inner.end_ns
+        assert len(trace.spans) == 2
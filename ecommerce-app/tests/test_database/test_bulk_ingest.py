@@ -0,0 +1,95 @@
+import csv
+import pytest
+import sys
+from pathlib import Path
+import pandas as pd
+from sqlalchemy import func, select, text
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from database.models import Product
+from database.seeds.bulk_ingest import build_columns, copy_buffer, row_batches
+from database.seeds.load_csv_data import DataLoader
+from scripts.generate_products_csv import ProductCSVGenerator
+
+ROWS = 500
+
+@pytest.fixture
+def products_csv(tmp_path):
+    """Synthetic catalogue with some empty optional values"""
+    csv_path = tmp_path / "products.csv"
+    with open(csv_path, "w", encoding="utf-8", newline="") as output:
+        ProductCSVGenerator(rows=ROWS, seed=7, null_rate=0.05, rating_null_rate=0.2).write(output)
+    return str(csv_path)
+
+def index_names(connection) -> set:
+    return {row[1] for row in connection.execute(text("PRAGMA index_list(products)"))}
+
+class TestBuildColumns:
+    """Test column arrays are built from the DataFrame without row iteration"""
+
+    def test_missing_values(self):
+        """Test missing values are NULL in nullable columns and empty elsewhere"""
+        df = pd.DataFrame({
+            'product_id': ["a", "b"],
+            'sub_category': ["Tea", None],
+            'sale_price': [10.5, None],
+            'department_id': [1.0, None]
+        })
+        columns = build_columns(df)
+
+        assert list(columns) == ['product_id', 'sub_category', 'sale_price', 'department_id']
+        assert columns['sub_category'] == ["Tea", '']
+        assert columns['sale_price'] == [10.5, None]
+        assert columns['department_id'] == [1, None]
+        assert type(columns['department_id'][0]) is int
+
+    def test_row_batches(self):
+        """Test rows are split into executemany batches"""
+        columns = {'product_id': ["a", "b", "c"], 'rating': [1.0, None, 3.0]}
+        batches = list(row_batches(columns, 2))
+        assert batches == [
+            [{'product_id': "a", 'rating': 1.0}, {'product_id': "b", 'rating': None}],
+            [{'product_id': "c", 'rating': 3.0}]
+        ]
+
+    def test_copy_buffer(self):
+        """Test COPY rows mark NULLs and keep empty strings and quoting intact"""
+        columns = {'product_name': ['Rice, basmati', ''], 'rating': [4.5, None]}
+        rows = list(csv.reader(copy_buffer(columns, 0, 2)))
+        assert rows == [['Rice, basmati', '4.5'], ['', '\\N']]
+
+class TestDataLoaderBulkIngest:
+    """Test DataLoader loads products through the bulk ingest path"""
+
+    @pytest.mark.parametrize("drop_indexes", [False, True])
+    def test_load_products(self, database, db_session, products_csv, drop_indexes):
+        """Test every row is inserted, stages are reported and indexes survive"""
+        indexes = index_names(database)
+        loader = DataLoader(products_csv, drop_indexes=drop_indexes)
+        assert loader.load_products(batch_size=128)
+
+        assert db_session.scalar(select(func.count(Product.id))) == ROWS
+        assert db_session.scalar(select(func.count(Product.id)).where(Product.department_id.is_(None))) == 0
+        assert db_session.scalar(select(func.count(Product.id)).where(Product.sub_category == '')) > 0
+        assert index_names(database) == indexes
+
+        stages = [stage['stage'] for stage in loader.report.stages]
+        expected = ['read_csv', 'transform', 'departments', 'build_columns', 'executemany', 'commit']
+        if drop_indexes:
+            expected[4:5] = ['drop_indexes', 'executemany', 'rebuild_indexes']
+        assert stages == expected
+        assert all(stage['rows'] == ROWS for stage in loader.report.stages)
+
+    def test_failed_load_restores_indexes(self, database, products_csv):
+        """Test a failing insert rolls back the rows and the dropped indexes"""
+        indexes = index_names(database)
+        assert DataLoader(products_csv).load_products()
+
+        # Loading the same product ids again violates the unique index
+        loader = DataLoader(products_csv, drop_indexes=True)
+        assert not loader.load_products()
+        assert index_names(database) == indexes
+        assert database.scalar(select(func.count(Product.id))) == ROWS
+
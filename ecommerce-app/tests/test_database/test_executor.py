@@ -0,0 +1,85 @@
+import pytest
+import sys
+import threading
+import asyncio
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from database.executor import DatabaseExecutor, DatabaseOverloadedError
+
+@pytest.fixture
+def executor():
+    """Create a small executor: one worker and one queue slot"""
+    executor = DatabaseExecutor(max_workers=1, max_queue_depth=1, retry_after=3)
+    yield executor
+    executor.shutdown()
+
+class TestDatabaseExecutor:
+    """Test cases for the bounded database executor"""
+    
+    def test_run_returns_result(self, executor):
+        """Test awaiting work submitted to the executor"""
+        result = asyncio.run(executor.run(lambda a, b: a + b, 2, 3))
+        assert result == 5
+        
+        stats = executor.stats()
+        assert stats["completed"] == 1
+        assert stats["active_workers"] == 0
+        assert stats["queued"] == 0
+    
+    def test_rejects_when_saturated(self, executor):
+        """Test fail-fast rejection once workers and queue are full"""
+        started = threading.Event()
+        release = threading.Event()
+        
+        def hold():
+            started.set()
+            release.wait()
+        
+        running = executor.submit(hold)
+        # The worker picks the first job up asynchronously
+        assert started.wait(timeout=5)
+        queued = executor.submit(release.wait)
+        
+        with pytest.raises(DatabaseOverloadedError) as exc_info:
+            executor.submit(release.wait)
+        assert exc_info.value.retry_after == 3
+        
+        stats = executor.stats()
+        assert stats["active_workers"] == 1
+        assert stats["queued"] == 1
+        assert stats["rejected"] == 1
+        
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        
+        # Capacity is available again
+        assert executor.submit(lambda: "ok").result(timeout=5) == "ok"
+    
+    def test_failed_work_is_counted(self, executor):
+        """Test that exceptions propagate and are counted as failures"""
+        def boom():
+            raise ValueError("boom")
+        
+        with pytest.raises(ValueError):
+            executor.submit(boom).result(timeout=5)
+        
+        assert executor.stats()["failed"] == 1
+    
+    def test_wrap_call_wraps_run(self, executor):
+        """Test run hands each call to the registered wrap_call hook"""
+        calls = []
+        
+        def wrap_call(fn, *args, **kwargs):
+            calls.append(fn)
+            return fn(*args, **kwargs) * 10
+        
+        def add(a, b):
+            return a + b
+        
+        executor.wrap_call = wrap_call
+        assert asyncio.run(executor.run(add, 2, 3)) == 50
+        assert calls == [add]
@@ -0,0 +1,110 @@
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from api.config import settings
+from database.connection import engine, get_pool_capacity
+from database.pool_metrics import InstrumentedQueuePool, instrument_engine, pool_metrics
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    """File-backed engine on a tiny instrumented queue pool"""
+    test_engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+        pool_logging_name="test_pool"
+    )
+    metrics = instrument_engine(test_engine, "test_pool")
+    yield test_engine, metrics
+    pool_metrics.pop("test_pool", None)
+    test_engine.dispose()
+
+class TestPoolMetrics:
+    """Test connection pool instrumentation"""
+
+    def test_checkout_and_checkin_counted(self, pooled_engine):
+        """Test checkouts, checkins and connects are counted"""
+        test_engine, metrics = pooled_engine
+
+        for _ in range(3):
+            with test_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        snapshot = metrics.snapshot()
+        assert snapshot["checkouts"] == 3
+        assert snapshot["checkins"] == 3
+        assert snapshot["connects"] == 1
+        assert snapshot["checked_out"] == 0
+        assert snapshot["peak_checked_out"] == 1
+        assert snapshot["size"] == 1
+
+    def test_saturation_while_checked_out(self, pooled_engine):
+        """Test saturation reflects connections in use"""
+        test_engine, metrics = pooled_engine
+
+        with test_engine.connect():
+            assert metrics.snapshot()["saturation"] == 1.0
+        assert metrics.snapshot()["saturation"] == 0.0
+
+    def test_timeout_and_wait_recorded(self, pooled_engine):
+        """Test an exhausted pool records the wait and the timeout"""
+        test_engine, metrics = pooled_engine
+
+        with test_engine.connect():
+            errors = []
+
+            def checkout():
+                try:
+                    test_engine.connect()
+                except PoolTimeoutError as e:
+                    errors.append(e)
+
+            thread = threading.Thread(target=checkout)
+            thread.start()
+            thread.join()
+
+        snapshot = metrics.snapshot()
+        assert len(errors) == 1
+        assert snapshot["timeouts"] == 1
+        assert snapshot["checkout_wait_ms"]["max"] >= 100
+
+class TestSQLiteProductionPool:
+    """Test the production SQLite profile's connection pool"""
+
+    def test_bounded_queue_pool_with_pragmas(self):
+        """Test the primary engine uses a bounded queue pool with the pragmas applied"""
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+        assert get_pool_capacity() == settings.sqlite_pool_size
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+    def test_more_threads_than_connections(self):
+        """Test connections held by busy threads are never closed under them"""
+        errors = []
+
+        def query():
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                    time.sleep(0.01)
+                    assert connection.execute(text("SELECT 1")).scalar() == 1
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=query) for _ in range(4 * settings.sqlite_pool_size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
@@ -0,0 +1,123 @@
+import pytest
+import sys
+import logging
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import create_engine, literal_column, select, text
+from api.app import app
+from api.config import settings
+from api.middleware.query_profiling import QueryProfilingMiddleware
+from database.profiling import (
+    QueryBudgetExceededError,
+    current_query_stats,
+    finish_query_profile,
+    start_query_profile
+)
+
+# Create test client
+client = TestClient(app)
+
+@pytest.fixture
+def scratch_engine():
+    """Standalone in-memory engine; the listeners are registered on every Engine"""
+    test_engine = create_engine("sqlite://")
+    yield test_engine
+    test_engine.dispose()
+
+class TestQueryProfiling:
+    """Test per-request SQL statement counting"""
+
+    def test_statements_counted(self, scratch_engine):
+        """Test statements inside a profile are counted and timed"""
+        token = start_query_profile("test")
+        with scratch_engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text("SELECT 1"))
+        stats = finish_query_profile(token)
+
+        assert stats.count == 3
+        assert stats.duration > 0
+        assert current_query_stats.get() is None
+
+    def test_compilation_timed(self, scratch_engine):
+        """Test compilation is timed and compiled-cache hits are counted"""
+        statement = select(literal_column("1"))
+        token = start_query_profile("test")
+        with scratch_engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(statement)
+            connection.exec_driver_sql("SELECT 1")
+        stats = finish_query_profile(token)
+
+        assert stats.count == 4
+        assert stats.compiled == 3
+        assert stats.compile_cache_hits == 2
+        assert stats.compile_duration > 0
+        assert 'sqlcompile;dur=' in stats.server_timing()
+        assert 'desc="1 compiled, 2 cached"' in stats.server_timing()
+
+    def test_budget_raises(self, scratch_engine, monkeypatch):
+        """Test exceeding the budget fails in raise mode"""
+        monkeypatch.setattr(settings, "sql_query_budget", 2)
+        monkeypatch.setattr(settings, "sql_query_budget_mode", "raise")
+
+        token = start_query_profile("test")
+        with scratch_engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text("SELECT 1"))
+
+        with pytest.raises(QueryBudgetExceededError):
+            finish_query_profile(token)
+
+    def test_budget_keeps_original_error(self, scratch_engine, monkeypatch):
+        """Test a failing request over budget surfaces its own error, not the budget's"""
+        monkeypatch.setattr(settings, "sql_query_budget", 2)
+        monkeypatch.setattr(settings, "sql_query_budget_mode", "raise")
+
+        async def failing_app(scope, receive, send):
+            with scratch_engine.connect() as connection:
+                for _ in range(3):
+                    connection.execute(text("SELECT 1"))
+            raise ValueError("boom")
+
+        middleware_client = TestClient(QueryProfilingMiddleware(failing_app))
+        with pytest.raises(ValueError, match="boom"):
+            middleware_client.get("/")
+
+    def test_budget_warns(self, scratch_engine, monkeypatch, caplog):
+        """Test exceeding the budget only logs in warn mode"""
+        monkeypatch.setattr(settings, "sql_query_budget", 1)
+        monkeypatch.setattr(settings, "sql_query_budget_mode", "warn")
+
+        token = start_query_profile("test")
+        with scratch_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+        with caplog.at_level(logging.WARNING, logger="database.profiling"):
+            stats = finish_query_profile(token)
+        assert stats.count == 2
+        assert "Query budget exceeded" in caplog.text
+
+    def test_slow_query_explained(self, scratch_engine, monkeypatch, caplog):
+        """Test slow SELECTs are logged with their query plan"""
+        monkeypatch.setattr(settings, "sql_slow_query_ms", 0)
+
+        with scratch_engine.connect() as connection:
+            connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            with caplog.at_level(logging.WARNING, logger="database.profiling"):
+                connection.execute(text("SELECT name FROM items WHERE id = :id"), {"id": 1})
+
+        assert "Slow query" in caplog.text
+        assert "Query plan" in caplog.text
+
+    def test_server_timing_header(self):
+        """Test API responses report database time and statement count"""
+        response = client.get("/api/v1/products/")
+        assert response.status_code == 200
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert "queries" in response.headers["Server-Timing"]
@@ -0,0 +1,90 @@
+import pytest
+import sys
+import time
+import asyncio
+import sqlite3
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import text
+from starlette.requests import Request
+import database.replicas as replicas
+from database.replicas import ReplicaRouter, PRIMARY_PIN_COOKIE, get_async_read_db
+
+def make_replica(path: Path) -> str:
+    """Create a SQLite replica file carrying a marker table"""
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE replica_marker (name TEXT)")
+    connection.execute("INSERT INTO replica_marker VALUES (?)", (path.stem,))
+    connection.commit()
+    connection.close()
+    return f"sqlite:///{path}"
+
+def make_request(cookie: str = "") -> Request:
+    """Build a bare request, optionally carrying cookies"""
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+async def read_source(request: Request) -> str:
+    """Return which database the read dependency routed to"""
+    dependency = get_async_read_db(request)
+    session = await dependency.__anext__()
+    try:
+        result = await session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'replica_marker'"
+        ))
+        if result.scalar() is None:
+            return "primary"
+        return (await session.execute(text("SELECT name FROM replica_marker"))).scalar()
+    finally:
+        await dependency.aclose()
+
+@pytest.fixture
+def use_router(monkeypatch):
+    """Install a replica router for the duration of a test"""
+    def install(urls):
+        router = ReplicaRouter(urls, retry_interval=60)
+        monkeypatch.setattr(replicas, "replica_router", router)
+        return router
+    return install
+
+class TestReplicaRouting:
+    """Test cases for read replica routing"""
+    
+    def test_round_robin(self, tmp_path, use_router):
+        """Test that reads alternate between healthy replicas"""
+        use_router([make_replica(tmp_path / "replica_a.db"), make_replica(tmp_path / "replica_b.db")])
+        
+        sources = [asyncio.run(read_source(make_request())) for _ in range(4)]
+        assert sources == ["replica_a", "replica_b", "replica_a", "replica_b"]
+    
+    def test_pinned_client_reads_primary(self, tmp_path, use_router):
+        """Test that a client that just wrote reads from the primary"""
+        use_router([make_replica(tmp_path / "replica_a.db")])
+        
+        cookie = f"{PRIMARY_PIN_COOKIE}={time.time() + 30}"
+        assert asyncio.run(read_source(make_request(cookie))) == "primary"
+        
+        expired = f"{PRIMARY_PIN_COOKIE}={time.time() - 1}"
+        assert asyncio.run(read_source(make_request(expired))) == "replica_a"
+    
+    def test_failover_skips_dead_replica(self, tmp_path, use_router):
+        """Test that an unreachable replica is taken out of rotation"""
+        dead_url = f"sqlite:///{tmp_path}/missing/dir/replica.db"
+        router = use_router([dead_url, make_replica(tmp_path / "replica_b.db")])
+        
+        sources = [asyncio.run(read_source(make_request())) for _ in range(3)]
+        assert sources == ["replica_b", "replica_b", "replica_b"]
+        
+        stats = router.stats()
+        assert stats[0]["healthy"] is False
+        assert stats[0]["failures"] == 1
+        assert stats[1]["served"] == 3
+    
+    def test_no_healthy_replicas_falls_back_to_primary(self, tmp_path, use_router):
+        """Test that reads fall back to the primary when every replica fails"""
+        use_router([f"sqlite:///{tmp_path}/missing/dir/replica.db"])
+        
+        assert asyncio.run(read_source(make_request())) == "primary"
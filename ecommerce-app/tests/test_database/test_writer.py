@@ -0,0 +1,73 @@
+import pytest
+import sys
+import asyncio
+from pathlib import Path
+
+# Add the parent directory to the path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy.orm import sessionmaker
+from database.models import Base, Department
+from database.writer import DatabaseWriter, create_writer_engine
+
+@pytest.fixture
+def writer(tmp_path):
+    """Create a writer over a scratch SQLite database"""
+    writer_engine = create_writer_engine(f"sqlite:///{tmp_path}/writer.db")
+    Base.metadata.create_all(bind=writer_engine)
+    
+    writer = DatabaseWriter(
+        session_factory=sessionmaker(bind=writer_engine, expire_on_commit=False),
+        batch_wait=0.05
+    )
+    yield writer
+    writer.stop()
+    writer_engine.dispose()
+
+def add_department(name):
+    """Build a write unit that creates a department"""
+    def unit(session):
+        session.add(Department(name=name))
+        session.flush()
+        return name
+    return unit
+
+def count_departments(session):
+    """Write unit returning the number of departments"""
+    return session.query(Department).count()
+
+class TestDatabaseWriter:
+    """Test cases for the single-writer queue"""
+    
+    def test_concurrent_units_are_group_committed(self, writer):
+        """Test that concurrently submitted units share a transaction"""
+        async def submit_all():
+            return await asyncio.gather(*[writer.run(add_department(f"Dept {i}")) for i in range(20)])
+        
+        results = asyncio.run(submit_all())
+        assert results == [f"Dept {i}" for i in range(20)]
+        assert writer.execute(count_departments) == 20
+        
+        stats = writer.stats()
+        assert stats["units"] == 21
+        assert stats["batches"] < stats["units"]
+    
+    def test_failing_unit_is_isolated(self, writer):
+        """Test that a failing unit is rolled back without affecting its batch"""
+        def failing_unit(session):
+            session.add(Department(name="Doomed"))
+            session.flush()
+            raise ValueError("boom")
+        
+        ok = writer.submit(add_department("Kept"))
+        failed = writer.submit(failing_unit)
+        
+        assert ok.result(timeout=5) == "Kept"
+        with pytest.raises(ValueError):
+            failed.result(timeout=5)
+        
+        def names(session):
+            return sorted(dept.name for dept in session.query(Department).all())
+        
+        assert writer.execute(names) == ["Kept"]
+        assert writer.stats()["failed_units"] == 1